@@ -14,11 +14,26 @@ bl_info = {
     "tracker_url": "https://github.com/distinctive-mark/batch-bone-constraints/issues",
 }
 
+import time
+
 import bpy
-from bpy.types import Operator, Menu
-from bpy.props import EnumProperty
+from bpy.types import Operator, Menu, Panel, UIList, AddonPreferences, PropertyGroup
+from bpy.props import (BoolProperty, CollectionProperty, EnumProperty, FloatProperty, IntProperty,
+                       PointerProperty, StringProperty)
+from bpy.app.handlers import persistent
 from bpy.app.translations import pgettext_iface as iface_
 from bpy.app.translations import pgettext_tip as _
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+
+from . import api
+from .metrics import COUNTER_NAMES, recorder
+from .naming import NameRules
+from .scope import BoneScope, split_names
+from .core import (
+    DEFAULT_MATCH_TOLERANCE,
+    available_constraint_types,
+    get_layout_stamp,
+)
 
 # Constraint type definitions
 IMITATE_CONSTRAINTS = [
@@ -65,173 +80,316 @@ ALL_CONSTRAINTS = [
 
 def get_available_constraint_types(context, mode):
     """获取可用约束类型"""
-    available_types = set()
-    
     active_obj = context.active_object
     selected_objs = [obj for obj in context.selected_objects if obj.type == 'ARMATURE']
-    
-    if not selected_objs:
-        return available_types
-    
-    if mode == 'IMITATE':
-        # Imitate mode: Check if active and selected items have bones/vertex groups with same names
-        if active_obj:
-            for target_obj in selected_objs:
-                if target_obj == active_obj:
-                    continue
-                if active_obj.type == 'ARMATURE':
-                    # Active object is armature: Check for bones with same names
-                    active_bone_names = {bone.name for bone in active_obj.pose.bones}
-                    target_bone_names = {bone.name for bone in target_obj.pose.bones}
-                    if active_bone_names & target_bone_names:  # 有交集 Has intersection
-                        # Always show 4 transform constraints
-                        available_types.update(['COPY_LOCATION', 'COPY_ROTATION', 'COPY_SCALE', 'COPY_TRANSFORMS'])
-                        break
-                elif active_obj.type == 'MESH':
-                    # Active object is mesh: Check for vertex groups with same names
-                    active_vgroup_names = {vg.name for vg in active_obj.vertex_groups}
-                    target_bone_names = {bone.name for bone in target_obj.pose.bones}
-                    if active_vgroup_names & target_bone_names:  # Has intersection
-                        # Always show 4 transform constraints
-                        available_types.update(['COPY_LOCATION', 'COPY_ROTATION', 'COPY_SCALE', 'COPY_TRANSFORMS'])
-                        break
-    
-    elif mode == 'REMOVE_IMITATE':
-        # Remove imitate mode: Check for existing constraints targeting active object in selected items
-        if active_obj:
-            for target_obj in selected_objs:
-                if target_obj == active_obj:
-                    continue
-                for bone in target_obj.pose.bones:
-                    for constraint in bone.constraints:
-                        # Only check four transform constraints
-                        if constraint.type in ['COPY_LOCATION', 'COPY_ROTATION', 'COPY_SCALE', 'COPY_TRANSFORMS']:
-                            # Check if there are bones/vertex groups with same names
-                            name_match = False
-                            if active_obj.type == 'ARMATURE':
-                                if bone.name in active_obj.pose.bones:
-                                    name_match = True
-                            elif active_obj.type == 'MESH':
-                                if bone.name in active_obj.vertex_groups:
-                                    name_match = True
-                            
-                            if name_match:
-                                # Check if constraint targets active object and subtarget is current bone name
-                                if (hasattr(constraint, 'target') and constraint.target == active_obj and
-                                    hasattr(constraint, 'subtarget') and constraint.subtarget == bone.name):
-                                    available_types.add(constraint.type)
-    
-    elif mode == 'COPY':
-        # Copy mode: Check for constraints in active object that are missing in selected objects (for bones with same names)
-        if active_obj and active_obj.type == 'ARMATURE':
-            for target_obj in selected_objs:
-                if target_obj == active_obj:
-                    continue
-                for active_bone in active_obj.pose.bones:
-                    if active_bone.name in target_obj.pose.bones:
-                        target_bone = target_obj.pose.bones[active_bone.name]
-                        for constraint in active_bone.constraints:
-                            # Check if target bone doesn't have the same constraint yet
-                            constraint_exists = False
-                            
-                            for target_constraint in target_bone.constraints:
-                                if target_constraint.type == constraint.type:
-                                    # Check if all properties match
-                                    properties_match = True
-                                    
-                                    # Check all properties (exclude some unimportant ones)
-                                    exclude_props = {'rna_type', 'type', 'name', 'is_valid', 'error_message'}
-                                    
-                                    for prop in dir(constraint):
-                                        if (not prop.startswith('_') and 
-                                            not prop.startswith('bl_') and
-                                            prop not in exclude_props and
-                                            not callable(getattr(constraint, prop))):
-                                            
-                                            try:
-                                                constraint_val = getattr(constraint, prop)
-                                                target_val = getattr(target_constraint, prop)
-                                                
-                                                # Special treatment: None and empty strings are considered equal
-                                                if constraint_val is None and target_val is None:
-                                                    continue
-                                                if constraint_val == '' and target_val == '':
-                                                    continue
-                                                if constraint_val == target_val:
-                                                    continue
-                                                    
-                                                # Values ​​do not match
-                                                properties_match = False
-                                                break
-                                                
-                                            except (AttributeError, TypeError):
-                                                # If an attribute exists in one constraint but not in another, it is not considered a mismatch
-                                                pass
-                                    
-                                    if properties_match:
-                                        constraint_exists = True
-                                        break
-                            
-                            if not constraint_exists:
-                                available_types.add(constraint.type)
-    
-    elif mode == 'REMOVE_COPY':
-        # Remove copy mode: Check for same constraints in both active and selected objects (for bones with same names)
-        if active_obj and active_obj.type == 'ARMATURE':
-            for target_obj in selected_objs:
-                if target_obj == active_obj:
-                    continue
-                for active_bone in active_obj.pose.bones:
-                    if active_bone.name in target_obj.pose.bones:
-                        target_bone = target_obj.pose.bones[active_bone.name]
-                        for constraint in active_bone.constraints:
-                            # Check if target bone has the same constraint
-                            for target_constraint in target_bone.constraints:
-                                if target_constraint.type == constraint.type:
-                                    match = True
-                                    
-                                    # Check all properties (exclude some unimportant ones)
-                                    exclude_props = {'rna_type', 'type', 'name', 'is_valid', 'error_message'}
-                                    
-                                    for prop in dir(constraint):
-                                        if (not prop.startswith('_') and 
-                                            not prop.startswith('bl_') and
-                                            prop not in exclude_props and
-                                            not callable(getattr(constraint, prop))):
-                                            
-                                            try:
-                                                constraint_val = getattr(constraint, prop)
-                                                target_val = getattr(target_constraint, prop)
-                                                
-                                                # Special treatment: None and empty strings are considered equal
-                                                if constraint_val is None and target_val is None:
-                                                    continue
-                                                if constraint_val == '' and target_val == '':
-                                                    continue
-                                                if constraint_val == target_val:
-                                                    continue
-                                                    
-                                                # Values ​​do not match
-                                                match = False
-                                                break
-                                                
-                                            except (AttributeError, TypeError):
-                                                # If an attribute exists in one constraint but not in another, it is not considered a mismatch
-                                                pass
-                                    
-                                    if match:
-                                        available_types.add(constraint.type)
-                                        break  # When a match is found, break out of the inner loop
-    
-    elif mode == 'DELETE':
-        # Delete mode: Check constraints in all selected armatures (including active object)
-        for obj in selected_objs:
-            for bone in obj.pose.bones:
-                for constraint in bone.constraints:
-                    available_types.add(constraint.type)
-    
+    name_map = api.get_name_map_function(api.get_name_rules(api.get_scene_name_rules(context.scene)))
+    return available_constraint_types(active_obj, selected_objs, mode, api.get_match_scale(), name_map)
+
+
+# Menu availability cache: (mode, active object name, selected armature names) -> types
+_availability_cache = {}
+# Layout stamp (core.get_layout_stamp) of each object an entry was computed from
+_availability_stamps = {}
+# Objects of each entry that updated since, compared with their stamps on the next lookup
+_availability_updated = {}
+_AVAILABILITY_CACHE_SIZE = 64
+
+# Owner of message bus subscriptions
+_msgbus_owner = object()
+
+
+def get_cached_constraint_types(context, mode):
+    """Get available constraint types, reusing the last result until the involved objects change
+
+    The key comes from the cached selection facts of poll_state, and an entry whose
+    objects updated since is only recomputed when their layout stamps changed: posing
+    and playback update the armatures every frame without touching their constraints.
+    Constraint property edits drop the cache through the message bus.
+    """
+    state = poll_state.get(context)
+    key = (mode, state.active_name, state.armature_names)
+
+    available_types = _availability_cache.get(key)
+    if available_types is not None and _availability_updated[key]:
+        if layout_changed(context, key):
+            del _availability_cache[key], _availability_stamps[key], _availability_updated[key]
+            available_types = None
+        else:
+            _availability_updated[key].clear()
+    if available_types is None:
+        if len(_availability_cache) >= _AVAILABILITY_CACHE_SIZE:
+            clear_availability_cache()
+        with recorder.operation('SCAN_' + mode), recorder.phase('scan'):
+            available_types = frozenset(get_available_constraint_types(context, mode))
+        _availability_cache[key] = available_types
+        _availability_stamps[key] = {obj.name_full: get_layout_stamp(obj) for obj in get_scanned_objects(context)}
+        _availability_updated[key] = set()
     return available_types
 
+
+def get_scanned_objects(context):
+    """Get the objects an availability scan reads: the active object and the selected armatures"""
+    objects = [obj for obj in context.selected_objects if obj.type == 'ARMATURE']
+    active_obj = context.active_object
+    if active_obj is not None and active_obj not in objects:
+        objects.append(active_obj)
+    return objects
+
+
+def layout_changed(context, key):
+    """Whether an updated object of a cache entry has a different layout stamp now"""
+    stamps = _availability_stamps[key]
+    objects = {obj.name_full: obj for obj in get_scanned_objects(context)}
+    for name in _availability_updated[key]:
+        obj = objects.get(name)
+        if obj is None or get_layout_stamp(obj) != stamps[name]:
+            return True
+    return False
+
+
+def clear_availability_cache():
+    _availability_cache.clear()
+    _availability_stamps.clear()
+    _availability_updated.clear()
+
+
+def mark_availability_updated(object_names=None):
+    """Note updates of the given objects (all of them for None) for the cache entries they were part of"""
+    for key, stamps in _availability_stamps.items():
+        if object_names is None:
+            _availability_updated[key].update(stamps)
+        else:
+            _availability_updated[key].update(name for name in object_names if name in stamps)
+
+
+class SyncScheduler:
+    """Debounced live sync of linked constraints (see api.sync_links)
+
+    Depsgraph updates of linked source armatures only collect their names; the sync runs
+    from a timer once the sources were quiet for SYNC_DELAY seconds (at the latest
+    SYNC_MAX_DELAY after the first request), so dragging a slider doesn't sync per step.
+    """
+    SYNC_DELAY = 0.2
+    SYNC_MAX_DELAY = 1.0
+
+    def __init__(self):
+        self.pending = set()
+        self.first_request = 0.0
+        self.deadline = 0.0
+        # The same bound method object, for bpy.app.timers.is_registered()
+        self.timer = self.run
+
+    def request(self, source_names):
+        now = time.monotonic()
+        if not self.pending:
+            self.first_request = now
+        self.pending |= source_names
+        self.deadline = min(now + self.SYNC_DELAY, self.first_request + self.SYNC_MAX_DELAY)
+        if not bpy.app.timers.is_registered(self.timer):
+            bpy.app.timers.register(self.timer, first_interval=self.SYNC_DELAY)
+
+    def run(self):
+        remaining = self.deadline - time.monotonic()
+        if remaining > 0.0:
+            return remaining
+        source_names = self.pending
+        self.pending = set()
+        with recorder.operation('SYNC'):
+            api.sync_links(source_names)
+        return None
+
+    def cancel(self):
+        self.pending.clear()
+        if bpy.app.timers.is_registered(self.timer):
+            bpy.app.timers.unregister(self.timer)
+
+
+sync_scheduler = SyncScheduler()
+
+
+@persistent
+def _on_depsgraph_update_post(scene, depsgraph):
+    # Selection changes tag the scene, template collection membership the collection
+    if depsgraph.id_type_updated('SCENE') or depsgraph.id_type_updated('COLLECTION'):
+        poll_state.dirty = True
+    if scene.batch_bone_constraints.use_live_sync and depsgraph.id_type_updated('OBJECT'):
+        linked = api.get_linked_sources()
+        if linked:
+            updated_sources = {update.id.original.name_full for update in depsgraph.updates
+                               if isinstance(update.id, bpy.types.Object) and
+                               update.id.original.name_full in linked}
+            if updated_sources:
+                sync_scheduler.request(updated_sources)
+    if not _availability_cache and not poll_state.constrained:
+        return
+    updated_names = set()
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Object):
+            # Pose bone constraints live on armature objects, vertex groups on mesh objects
+            if id_data.type in {'ARMATURE', 'MESH'}:
+                updated_names.add(id_data.original.name_full)
+        elif isinstance(id_data, bpy.types.Armature):
+            # Bone renames change name matching for every armature using the data
+            mark_availability_updated()
+    for name in updated_names:
+        poll_state.constrained.pop(name, None)
+    if updated_names and _availability_cache:
+        mark_availability_updated(updated_names)
+
+
+def _on_rna_changed():
+    clear_availability_cache()
+    poll_state.constrained.clear()
+
+
+def _on_active_changed():
+    poll_state.dirty = True
+
+
+def subscribe_rna_changes():
+    """Drop cached availability and poll state when constraints, bones, vertex groups or the active object change"""
+    for key in (bpy.types.Constraint, (bpy.types.Bone, "name"), (bpy.types.VertexGroup, "name")):
+        bpy.msgbus.subscribe_rna(key=key, owner=_msgbus_owner, args=(), notify=_on_rna_changed)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.LayerObjects, "active"), owner=_msgbus_owner, args=(),
+                             notify=_on_active_changed)
+
+
+class PollState:
+    """Selection facts the operator polls need, kept between redraws
+
+    Recomputed only after the selection or active object changed (depsgraph update and
+    message bus notifications), so most polls are a few attribute reads. Whether an
+    armature has bone constraints is remembered per object until that object updates.
+    """
+
+    def __init__(self):
+        self.dirty = True
+        # Whether the last get() recomputed the selection facts
+        self.fresh = False
+        self.view_layer = 0
+        self.active = 0
+        self.selected_count = 0
+        self.armature_count = 0
+        self.active_is_selected_armature = False
+        # Names keying the availability cache
+        self.active_name = None
+        self.armature_names = frozenset()
+        self.templates = 0
+        # Selected armatures in the Template Rigs collection
+        self.template_count = 0
+        # Armature name -> whether any of its pose bones has constraints
+        self.constrained = {}
+
+    def get(self, context, refresh=False):
+        view_layer = context.view_layer.as_pointer()
+        active_obj = context.active_object
+        active = active_obj.as_pointer() if active_obj else 0
+        template_collection = context.scene.batch_bone_constraints.template_collection
+        templates = template_collection.as_pointer() if template_collection else 0
+        # Background scripts change the selection without depsgraph updates in between
+        if (refresh or self.dirty or bpy.app.background or
+                view_layer != self.view_layer or active != self.active or templates != self.templates):
+            selected = context.selected_objects
+            self.selected_count = len(selected)
+            self.armature_names = frozenset(obj.name_full for obj in selected if obj.type == 'ARMATURE')
+            self.armature_count = len(self.armature_names)
+            self.active_name = active_obj.name_full if active_obj else None
+            self.active_is_selected_armature = (active_obj is not None and active_obj.type == 'ARMATURE' and
+                                                active_obj in selected)
+            template_objects = set(template_collection.all_objects) if template_collection else ()
+            self.template_count = sum(1 for obj in selected if obj.type == 'ARMATURE' and obj in template_objects)
+            self.view_layer = view_layer
+            self.active = active
+            self.templates = templates
+            self.dirty = False
+            self.fresh = True
+        else:
+            self.fresh = False
+        return self
+
+    @property
+    def target_count(self):
+        """Number of selected armatures besides the active object"""
+        return self.armature_count - self.active_is_selected_armature
+
+    def has_constraints(self, armature):
+        constrained = self.constrained.get(armature.name_full)
+        if constrained is None:
+            constrained = self.constrained[armature.name_full] = any(
+                bone.constraints for bone in armature.pose.bones)
+        return constrained
+
+    def clear(self):
+        self.dirty = True
+        self.constrained.clear()
+
+
+poll_state = PollState()
+
+
+def cached_poll(poll):
+    """Run a poll on the cached PollState, confirming a failure on freshly computed state
+
+    A stale state (e.g. a script changed the selection since the last update) can then
+    only let a poll pass, and execute copes with that by finding nothing to do.
+    """
+    def wrapper(cls, context):
+        state = poll_state.get(context)
+        if poll(cls, context, state):
+            return True
+        if state.fresh and not state.constrained:
+            return False
+        # The constrained flags outlive a refresh (always on in background mode), recheck them too
+        state.constrained.clear()
+        return poll(cls, context, state if state.fresh else poll_state.get(context, refresh=True))
+    return wrapper
+
+
+def time_depsgraph_update(context, record):
+    """Time the evaluation of the changes into record, only while profiling
+
+    Timing means evaluating right away instead of when Blender gets to it, so a plain
+    recorded run leaves the update deferred and has no 'depsgraph' phase.
+    """
+    if record is not None and recorder.profile:
+        with recorder.phase('depsgraph'):
+            context.view_layer.update()
+
+def recorded(operation=None):
+    """Record an operator's execute in metrics.recorder (with the depsgraph update when profiling)
+
+    Without operation, the operator's batch_operation names the record.
+    """
+    def decorator(execute):
+        def wrapper(self, context):
+            with recorder.operation(operation or self.batch_operation) as record:
+                result = execute(self, context)
+                if not getattr(self, "dry_run", False):
+                    time_depsgraph_update(context, record)
+            return result
+        return wrapper
+    return decorator
+
+
+@persistent
+def _on_load_post(*args):
+    global _last_audit
+    # Cached names refer to the previous file and subscriptions are dropped on load
+    clear_availability_cache()
+    poll_state.clear()
+    api.clear_plan_cache()
+    api.clear_name_maps()
+    api.clear_link_index()
+    sync_scheduler.cancel()
+    _last_audit = None
+    subscribe_rna_changes()
+
+@persistent
+def _on_undo_redo_post(*args):
+    # Undo can bring back or drop links
+    api.clear_link_index()
+
 # Constraint type icon mapping
 CONSTRAINT_ICONS = {
     'COPY_LOCATION': 'CON_LOCLIKE',
@@ -271,21 +429,209 @@ def get_constraint_icon(constraint_type):
     """Get constraint type icon"""
     return CONSTRAINT_ICONS.get(constraint_type, 'CONSTRAINT')
 
-class ANIM_OT_batch_imitate(Operator):
+def format_counts(counts, limit=5):
+    """Format per-armature counts for an operator report, e.g. ' (Rig: 12, Rig.001: 8)'"""
+    items = [f"{name}: {count}" for name, count in counts.items() if count]
+    if not items:
+        return ""
+    if len(items) > limit:
+        items = items[:limit] + [f"+{len(items) - limit} more"]
+    return " (" + ", ".join(items) + ")"
+
+def format_names(names, limit=5):
+    """Format a list of names for a label, e.g. 'Rig, Rig.001 +3 more'"""
+    text = ", ".join(names[:limit])
+    if len(names) > limit:
+        text += f" +{len(names) - limit} more"
+    return text
+
+def is_repeat(operator):
+    """Whether the operator runs again from the redo panel, so kept plans may be reused
+
+    Redo undoes the previous run first, so nothing can have been edited in between.
+    Repeat Last may follow any edits, which the layout stamps don't see, so it plans afresh.
+    """
+    return operator.options.is_repeat
+
+def report_dry_run(operator, batch_plan):
+    """Report the planned counts in the status bar instead of applying the plan"""
+    operator.report({'INFO'}, f"Dry run: {len(batch_plan)} constraints would change{format_counts(batch_plan.counts())}")
+
+BONE_SCOPES = [
+    ('ALL', _("All Bones"), _("Every bone of each armature")),
+    ('SELECTED', _("Selected Bones"), _("Bones selected in pose mode")),
+    ('COLLECTIONS', _("Bone Collections"), _("Bones in the named bone collections")),
+    ('PATTERN', _("Name Pattern"), _("Bones whose name matches a wildcard pattern")),
+]
+
+# Plans with more entries than this are applied time-sliced when run from the UI
+MODAL_THRESHOLD = 2000
+# Seconds of work per timer event, leaving the rest of each interval to the viewport
+MODAL_TIME_BUDGET = 0.05
+MODAL_TIMER_INTERVAL = 0.01
+
+class BoneScopeOptions:
+    """Mixin of the operators that can be limited to some bones of each armature"""
+    
+    scope: EnumProperty(
+        name="Bones",
+        description="Which bones of each target armature to change",
+        items=BONE_SCOPES,
+        default='ALL'
+    )
+    bone_collections: StringProperty(
+        name="Bone Collections",
+        description="Comma-separated names of the bone collections in scope"
+    )
+    bone_pattern: StringProperty(
+        name="Name Pattern",
+        description="Comma-separated wildcard patterns of the bone names in scope, e.g. DEF-*, *.L"
+    )
+    
+    def get_scope(self):
+        """Get the BoneScope of the operator's settings, resolved once per armature while planning"""
+        return BoneScope(self.scope, split_names(self.bone_collections), split_names(self.bone_pattern))
+
+class BatchOperator(BoneScopeOptions):
+    """Mixin of the plan-based operators: plan_batch() makes the plan, report_result() reports it
+
+    By default batch_operation is planned from the active armature to the other selected
+    armatures, and the result is reported as a plain count; operators with other sources
+    or targets override plan_batch(), and most override report_result() for a better message.
+
+    execute (scripts, redo, Repeat Last) applies the plan at once. invoke (menus, buttons)
+    applies a large plan in time-budgeted slices on a timer instead, with progress in the
+    window manager and the status bar; Esc stops it, keeping what was applied so far as
+    one undo step.
+    """
+    batch_operation = None
+    
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only report how many constraints would change, without changing anything",
+        default=False
+    )
+    
+    def plan_batch(self, context):
+        active_obj = context.active_object
+        target_armatures = [obj for obj in context.selected_objects 
+                          if obj.type == 'ARMATURE' and obj != active_obj]
+        
+        return api.plan(self.batch_operation, active_obj, target_armatures, self.constraint_type,
+                        use_cache=is_repeat(self), name_rules=api.get_scene_name_rules(context.scene),
+                        scope=self.get_scope())
+    
+    def report_result(self, result):
+        self.report({'INFO'}, f"Changed {result.total} constraints{format_counts(result.counts)}")
+    
+    @recorded()
+    def execute(self, context):
+        batch_plan = self.plan_batch(context)
+        if self.dry_run:
+            report_dry_run(self, batch_plan)
+            return {'FINISHED'}
+        self.report_result(api.apply_plan(batch_plan, self.links_copies()))
+        return {'FINISHED'}
+    
+    def links_copies(self):
+        """Whether copied constraints are linked to their source for live sync"""
+        return False
+    
+    def invoke(self, context, event):
+        if self.dry_run or context.window is None:
+            return self.execute(context)
+        with recorder.operation(self.batch_operation) as record:
+            batch_plan = self.plan_batch(context)
+            if len(batch_plan.entries) <= MODAL_THRESHOLD:
+                self.report_result(api.apply_plan(batch_plan, self.links_copies()))
+                time_depsgraph_update(context, record)
+                return {'FINISHED'}
+        
+        # Every later step is added to the record in a block of its own, so an aborted
+        # run leaves no record open
+        self._record = record
+        self._applier = api.PlanApplier(batch_plan, self.links_copies())
+        window_manager = context.window_manager
+        window_manager.progress_begin(0, self._applier.total)
+        self._timer = window_manager.event_timer_add(MODAL_TIMER_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self.finish_modal(context, cancelled=True)
+        if event.type == 'TIMER' and event.timer == self._timer:
+            with recorder.resume(self._record):
+                done = self._applier.step(MODAL_TIME_BUDGET)
+            context.window_manager.progress_update(self._applier.position)
+            context.workspace.status_text_set(
+                f"{iface_(self.bl_label)}: {self._applier.position} / {self._applier.total} (Esc to stop)")
+            if done:
+                return self.finish_modal(context)
+        return {'PASS_THROUGH'}
+    
+    def end_modal(self, context):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._timer)
+        window_manager.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+    
+    def finish_modal(self, context, cancelled=False):
+        self.end_modal(context)
+        with recorder.resume(self._record):
+            result = self._applier.finish()
+            time_depsgraph_update(context, self._record)
+        self.report_result(result)
+        if cancelled:
+            self.report({'WARNING'}, f"Stopped after {self._applier.position} of {self._applier.total} planned changes")
+        # Finished either way, so the constraints changed so far are one undo step
+        return {'FINISHED'}
+    
+    def cancel(self, context):
+        # Aborted by Blender (window closed, file loaded): the data may be gone, only clean up
+        self.end_modal(context)
+
+class LinkOptions:
+    """Mixin of the copying operators: optionally link the copies for live sync"""
+    link: BoolProperty(
+        name="Link for Sync",
+        description="Keep the copies in sync with the source constraints while Live Sync is on",
+        default=False
+    )
+    
+    def links_copies(self):
+        return self.link
+
+class ANIM_OT_batch_imitate(BatchOperator, Operator):
     """Batch create constraints for selected armatures targeting bones with same name in active armature"""
     bl_idname = "anim.batch_imitate"
     bl_label = "Batch Imitate"
     bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'IMITATE'
     
     constraint_type: EnumProperty(
         name="Constraint Type",
         items=IMITATE_CONSTRAINTS,
         default='COPY_ROTATION'
     )
+    skip_unweighted: BoolProperty(
+        name="Skip Unweighted Groups",
+        description="With a mesh as active object, skip bones whose vertex group has no vertex weighted at least the threshold",
+        default=False
+    )
+    min_weight: FloatProperty(
+        name="Weight Threshold",
+        description="Lowest vertex weight a vertex group needs to be imitated",
+        default=0.0,
+        min=0.0,
+        max=1.0
+    )
     
     @classmethod
-    def poll(cls, context):
-        if not context.selected_objects:
+    @cached_poll
+    def poll(cls, context, state):
+        if not state.selected_count:
             return False
         active_obj = context.active_object
         if not active_obj:
@@ -296,42 +642,30 @@ class ANIM_OT_batch_imitate(Operator):
             cls.poll_message_set("Active object must be armature or mesh")
             return False
         # At least one selected armature
-        selected_armatures = [obj for obj in context.selected_objects 
-                            if obj.type == 'ARMATURE' and obj != active_obj]
-        if not selected_armatures:
+        if not state.target_count:
             cls.poll_message_set("Select at least one target armature")
             return False
         return True
     
-    def execute(self, context):
+    def plan_batch(self, context):
         active_obj = context.active_object
         target_armatures = [obj for obj in context.selected_objects 
                           if obj.type == 'ARMATURE' and obj != active_obj]
         
-        total_added = 0
-        
-        for target_armature in target_armatures:
-            for target_bone in target_armature.pose.bones:
-                # Check if same constraint already exists
-                existing = any(c.type == self.constraint_type and 
-                             c.target == active_obj and 
-                             c.subtarget == target_bone.name 
-                             for c in target_bone.constraints)
-                if not existing:
-                    # Use Blender's built-in method to create constraints
-                    constraint = target_bone.constraints.new(type=self.constraint_type)
-                    constraint.target = active_obj
-                    constraint.subtarget = target_bone.name
-                    total_added += 1
-        
-        self.report({'INFO'}, f"Added {total_added} imitate constraints")
-        return {'FINISHED'}
+        min_weight = self.min_weight if self.skip_unweighted and active_obj.type == 'MESH' else None
+        return api.plan('IMITATE', active_obj, target_armatures, self.constraint_type,
+                        use_cache=is_repeat(self), name_rules=api.get_scene_name_rules(context.scene),
+                        min_weight=min_weight, scope=self.get_scope())
+    
+    def report_result(self, result):
+        self.report({'INFO'}, f"Added {result.total} imitate constraints")
 
-class ANIM_OT_remove_imitate(Operator):
+class ANIM_OT_remove_imitate(BatchOperator, Operator):
     """Batch remove constraints from selected armatures targeting bones with same name in active armature"""
     bl_idname = "anim.remove_imitate"
     bl_label = "Remove Imitate Constraints"
     bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'REMOVE_IMITATE'
     
     constraint_type: EnumProperty(
         name="Constraint Type",
@@ -340,44 +674,28 @@ class ANIM_OT_remove_imitate(Operator):
     )
     
     @classmethod
-    def poll(cls, context):
-        if not context.selected_objects:
+    @cached_poll
+    def poll(cls, context, state):
+        if not state.selected_count:
             return False
         active_obj = context.active_object
         if not active_obj or active_obj.type not in {'ARMATURE', 'MESH'}:
             cls.poll_message_set("Active object must be armature or mesh")
             return False
-        selected_armatures = [obj for obj in context.selected_objects 
-                            if obj.type == 'ARMATURE' and obj != active_obj]
-        if not selected_armatures:
+        if not state.target_count:
             cls.poll_message_set("Select at least one target armature")
             return False
         return True
     
-    def execute(self, context):
-        active_obj = context.active_object
-        target_armatures = [obj for obj in context.selected_objects 
-                          if obj.type == 'ARMATURE' and obj != active_obj]
-        
-        total_removed = 0
-        
-        for target_armature in target_armatures:
-            for target_bone in target_armature.pose.bones:
-                for constraint in list(target_bone.constraints):
-                    if (constraint.target == active_obj and 
-                        constraint.subtarget == target_bone.name and
-                        (self.constraint_type == 'ALL' or constraint.type == self.constraint_type)):
-                        target_bone.constraints.remove(constraint)
-                        total_removed += 1
-        
-        self.report({'INFO'}, f"Removed {total_removed} imitate constraints")
-        return {'FINISHED'}
+    def report_result(self, result):
+        self.report({'INFO'}, f"Removed {result.total} imitate constraints{format_counts(result.counts)}")
 
-class ANIM_OT_batch_copy(Operator):
+class ANIM_OT_batch_copy(LinkOptions, BatchOperator, Operator):
     """Copy constraints from bones with same name in active armature to selected armatures"""
     bl_idname = "anim.batch_copy"
     bl_label = "Batch Copy Constraints"
     bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'COPY'
     
     constraint_type: EnumProperty(
         name="Constraint Type",
@@ -386,90 +704,89 @@ class ANIM_OT_batch_copy(Operator):
     )
     
     @classmethod
-    def poll(cls, context):
+    @cached_poll
+    def poll(cls, context, state):
         active_obj = context.active_object
         if not active_obj or active_obj.type != 'ARMATURE':
             cls.poll_message_set("Active object must be an armature")
             return False
         
         # Check if active armature has constraints
-        has_constraints = any(len(bone.constraints) > 0 
-                            for bone in active_obj.pose.bones)
-        if not has_constraints:
+        if not state.has_constraints(active_obj):
             cls.poll_message_set("Active armature has no bone constraints")
             return False
         
-        selected_armatures = [obj for obj in context.selected_objects 
-                            if obj.type == 'ARMATURE' and obj != active_obj]
-        if not selected_armatures:
+        if not state.target_count:
             cls.poll_message_set("Select at least one target armature")
             return False
             
         return True
     
-    def execute(self, context):
-        active_obj = context.active_object
-        target_armatures = [obj for obj in context.selected_objects 
-                          if obj.type == 'ARMATURE' and obj != active_obj]
+    def report_result(self, result):
+        self.report({'INFO'}, f"Copied {result.total} constraints")
+
+def get_template_split(context):
+    """Split the selected armatures into template sources, in precedence order, and targets
+
+    Templates are the selected armatures in the scene's Template Rigs collection: the
+    active one first, then by name.
+    """
+    templates = context.scene.batch_bone_constraints.template_collection
+    template_objects = set(templates.all_objects) if templates else set()
+    active_obj = context.active_object
+    sources = []
+    targets = []
+    for obj in context.selected_objects:
+        if obj.type == 'ARMATURE':
+            (sources if obj in template_objects else targets).append(obj)
+    sources.sort(key=lambda obj: (obj != active_obj, obj.name))
+    return sources, targets
+
+class ANIM_OT_batch_copy_merged(LinkOptions, BatchOperator, Operator):
+    """Copy constraints from all selected template armatures to the other selected armatures in one pass"""
+    bl_idname = "anim.batch_copy_merged"
+    bl_label = "Copy from Templates"
+    bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'COPY_MERGED'
+    
+    constraint_type: EnumProperty(
+        name="Constraint Type",
+        items=[('ALL', "All", "")] + ALL_CONSTRAINTS,
+        default='ALL'
+    )
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        if state.armature_count < 2:
+            cls.poll_message_set("Select template armatures and target armatures")
+            return False
+        if not state.templates:
+            cls.poll_message_set("Set the Template Rigs collection in the sidebar")
+            return False
+        if not state.template_count:
+            cls.poll_message_set("Select at least one armature of the Template Rigs collection")
+            return False
+        if state.template_count == state.armature_count:
+            cls.poll_message_set("Select at least one target armature")
+            return False
+        return True
+    
+    def plan_batch(self, context):
+        sources, targets = get_template_split(context)
         
-        total_copied = 0
-        
-        for target_armature in target_armatures:
-            for target_bone in target_armature.pose.bones:
-                if target_bone.name in active_obj.pose.bones:
-                    source_bone = active_obj.pose.bones[target_bone.name]
-                    
-                    for source_constraint in source_bone.constraints:
-                        if (self.constraint_type == 'ALL' or 
-                            source_constraint.type == self.constraint_type):
-                            
-                            # Check if the same constraint already exists
-                            constraint_exists = False
-                            for target_constraint in target_bone.constraints:
-                                if target_constraint.type == source_constraint.type:
-                                    # Simple check if key attributes match
-                                    properties_match = True
-                                    if hasattr(source_constraint, 'target') and hasattr(target_constraint, 'target'):
-                                        if source_constraint.target != target_constraint.target:
-                                            properties_match = False
-                                    if hasattr(source_constraint, 'subtarget') and hasattr(target_constraint, 'subtarget'):
-                                        if source_constraint.subtarget != target_constraint.subtarget:
-                                            properties_match = False
-                                    if properties_match:
-                                        constraint_exists = True
-                                        break
-                            
-                            if not constraint_exists:
-                                # Copy constraints using blender built-in methods
-                                new_constraint = target_bone.constraints.new(
-                                    type=source_constraint.type
-                                )
-                                
-                                # Copy all properties
-                                exclude_props = {'rna_type', 'type', 'name', 'is_valid', 'error_message'}
-                                
-                                for prop in dir(source_constraint):
-                                    if (not prop.startswith('_') and 
-                                        not prop.startswith('bl_') and
-                                        prop not in exclude_props and
-                                        not callable(getattr(source_constraint, prop))):
-                                        try:
-                                            setattr(new_constraint, prop, 
-                                                   getattr(source_constraint, prop))
-                                        except (AttributeError, TypeError):
-                                            # Ignore properties that cannot be set
-                                            pass
-                                
-                                total_copied += 1
-        
-        self.report({'INFO'}, f"Copied {total_copied} constraints")
-        return {'FINISHED'}
+        return api.plan_merged(sources, targets, self.constraint_type,
+                               name_rules=api.get_scene_name_rules(context.scene), scope=self.get_scope())
+    
+    def report_result(self, result):
+        self.report({'INFO'}, f"Copied {result.total} constraints from templates{format_counts(result.counts)}")
 
-class ANIM_OT_remove_copy(Operator):
+class ANIM_OT_remove_copy(BatchOperator, Operator):
     """Remove constraints from selected armatures that match constraints on bones with same name in active armature"""
     bl_idname = "anim.remove_copy"
     bl_label = "Remove Copied Constraints"
     bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'REMOVE_COPY'
     
     constraint_type: EnumProperty(
         name="Constraint Type",
@@ -478,87 +795,28 @@ class ANIM_OT_remove_copy(Operator):
     )
     
     @classmethod
-    def poll(cls, context):
+    @cached_poll
+    def poll(cls, context, state):
         active_obj = context.active_object
         if not active_obj or active_obj.type != 'ARMATURE':
             cls.poll_message_set("Active object must be an armature")
             return False
             
-        selected_armatures = [obj for obj in context.selected_objects 
-                            if obj.type == 'ARMATURE' and obj != active_obj]
-        if not selected_armatures:
+        if not state.target_count:
             cls.poll_message_set("Select at least one target armature")
             return False
             
         return True
     
-    def execute(self, context):
-        active_obj = context.active_object
-        target_armatures = [obj for obj in context.selected_objects 
-                          if obj.type == 'ARMATURE' and obj != active_obj]
-        
-        total_removed = 0
-        
-        for target_armature in target_armatures:
-            for target_bone in target_armature.pose.bones:
-                if target_bone.name in active_obj.pose.bones:
-                    source_bone = active_obj.pose.bones[target_bone.name]
-                    
-                    # Check each constraint of the target bone
-                    for target_constraint in list(target_bone.constraints):
-                        # If a constraint type is specified, checks for a match
-                        if (self.constraint_type != 'ALL' and 
-                            target_constraint.type != self.constraint_type):
-                            continue
-                            
-                        # Find constraints of the same type with matching properties in the source skeleton
-                        for source_constraint in source_bone.constraints:
-                            if source_constraint.type == target_constraint.type:
-                                # Check if all properties match
-                                properties_match = True
-                                exclude_props = {'rna_type', 'type', 'name', 'is_valid', 'error_message'}
-                                
-                                for prop in dir(source_constraint):
-                                    if (not prop.startswith('_') and 
-                                        not prop.startswith('bl_') and
-                                        prop not in exclude_props and
-                                        not callable(getattr(source_constraint, prop))):
-                                        
-                                        try:
-                                            source_val = getattr(source_constraint, prop)
-                                            target_val = getattr(target_constraint, prop)
-                                            
-                                            # Special treatment: None and empty strings are considered equal
-                                            if source_val is None and target_val is None:
-                                                continue
-                                            if source_val == '' and target_val == '':
-                                                continue
-                                            if source_val == target_val:
-                                                continue
-                                                
-                                            # Values ​​do not match
-                                            properties_match = False
-                                            break
-                                            
-                                        except (AttributeError, TypeError):
-                                            # If an attribute exists in one constraint but not in another, it is considered a mismatch
-                                            properties_match = False
-                                            break
-                                
-                                # If a constraint with an exact matching attribute is found, delete the target constraint
-                                if properties_match:
-                                    target_bone.constraints.remove(target_constraint)
-                                    total_removed += 1
-                                    break  # After deletion, jump out of the inner loop and continue to check the next target constraint.
-        
-        self.report({'INFO'}, f"Removed {total_removed} copied constraints")
-        return {'FINISHED'}
+    def report_result(self, result):
+        self.report({'INFO'}, f"Removed {result.total} copied constraints{format_counts(result.counts)}")
 
-class ANIM_OT_batch_new(Operator):
+class ANIM_OT_batch_new(BatchOperator, Operator):
     """Create new constraints for all bones in selected armatures"""
     bl_idname = "anim.batch_new"
     bl_label = "Batch New Constraints"
     bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'NEW'
     
     constraint_type: EnumProperty(
         name="Constraint Type",
@@ -567,62 +825,604 @@ class ANIM_OT_batch_new(Operator):
     )
     
     @classmethod
-    def poll(cls, context):
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 1
+    
+    def plan_batch(self, context):
         selected_armatures = [obj for obj in context.selected_objects 
                             if obj.type == 'ARMATURE']
-        return len(selected_armatures) >= 1
+        
+        return api.plan('NEW', None, selected_armatures, self.constraint_type,
+                        use_cache=is_repeat(self), scope=self.get_scope())
     
-    def execute(self, context):
+    def report_result(self, result):
+        self.report({'INFO'}, f"Added {result.total} new constraints")
+
+class ANIM_OT_batch_delete(BatchOperator, Operator):
+    """Delete constraints by type from all bones in selected armatures"""
+    bl_idname = "anim.batch_delete"
+    bl_label = "Batch Delete Constraints"
+    bl_options = {'REGISTER', 'UNDO'}
+    batch_operation = 'DELETE'
+    
+    constraint_type: EnumProperty(
+        name="Constraint Type",
+        items=[('ALL', "All", "")] + ALL_CONSTRAINTS,
+        default='ALL'
+    )
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 1
+    
+    def plan_batch(self, context):
         selected_armatures = [obj for obj in context.selected_objects 
                             if obj.type == 'ARMATURE']
         
-        total_added = 0
+        return api.plan('DELETE', None, selected_armatures, self.constraint_type,
+                        use_cache=is_repeat(self), scope=self.get_scope())
+    
+    def report_result(self, result):
+        type_name = "All" if self.constraint_type == 'ALL' else self.constraint_type
+        self.report({'INFO'}, f"Removed {result.total} {type_name} constraints{format_counts(result.counts)}")
+
+SPACES = [
+    ('WORLD', _("World Space"), ""),
+    ('POSE', _("Pose Space"), ""),
+    ('LOCAL_WITH_PARENT', _("Local With Parent"), ""),
+    ('LOCAL', _("Local Space"), ""),
+]
+
+class ANIM_OT_batch_edit(BoneScopeOptions, Operator):
+    """Set influence, mute or spaces on existing constraints by type in selected armatures"""
+    bl_idname = "anim.batch_edit"
+    bl_label = "Batch Edit Constraints"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    constraint_type: EnumProperty(
+        name="Constraint Type",
+        items=[('ALL', "All", "")] + ALL_CONSTRAINTS,
+        default='ALL'
+    )
+    set_influence: BoolProperty(name="Set Influence", default=True)
+    influence: FloatProperty(
+        name="Influence",
+        default=1.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    set_mute: BoolProperty(name="Set Mute", default=False)
+    mute: BoolProperty(
+        name="Mute",
+        description="Disable the constraints",
+        default=False
+    )
+    set_owner_space: BoolProperty(name="Set Owner Space", default=False)
+    owner_space: EnumProperty(
+        name="Owner Space",
+        items=SPACES,
+        default='WORLD'
+    )
+    set_target_space: BoolProperty(name="Set Target Space", default=False)
+    target_space: EnumProperty(
+        name="Target Space",
+        items=SPACES + [('LOCAL_OWNER_ORIENT', _("Local Space (Owner Orientation)"), "")],
+        default='WORLD'
+    )
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 1
+    
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, "constraint_type")
+        for prop in ("influence", "mute", "owner_space", "target_space"):
+            row = layout.row(heading=self.bl_rna.properties[prop].name)
+            row.prop(self, "set_" + prop, text="")
+            sub = row.row()
+            sub.active = getattr(self, "set_" + prop)
+            sub.prop(self, prop, text="")
+        layout.prop(self, "scope")
+        if self.scope == 'COLLECTIONS':
+            layout.prop(self, "bone_collections")
+        elif self.scope == 'PATTERN':
+            layout.prop(self, "bone_pattern")
+    
+    @recorded('EDIT')
+    def execute(self, context):
+        selected_armatures = [obj for obj in context.selected_objects 
+                            if obj.type == 'ARMATURE']
+        values = {prop: getattr(self, prop) for prop in ("influence", "mute", "owner_space", "target_space")
+                  if getattr(self, "set_" + prop)}
+        if not values:
+            self.report({'WARNING'}, "Nothing to set")
+            return {'CANCELLED'}
         
-        for armature in selected_armatures:
-            for bone in armature.pose.bones:
-                # Use Blender's built-in method to create constraints
-                bone.constraints.new(type=self.constraint_type)
-                total_added += 1
+        result = api.edit(selected_armatures, self.constraint_type, self.get_scope(), **values)
         
-        self.report({'INFO'}, f"Added {total_added} new constraints")
+        self.report({'INFO'}, f"Edited {result.total} constraints{format_counts(result.counts)}")
         return {'FINISHED'}
 
-class ANIM_OT_batch_delete(Operator):
-    """Delete constraints by type from all bones in selected armatures"""
-    bl_idname = "anim.batch_delete"
-    bl_label = "Batch Delete Constraints"
-    bl_options = {'REGISTER', 'UNDO'}
+class ANIM_OT_export_constraint_preset(Operator, ExportHelper):
+    """Save the bone constraints of the active armature to a preset file"""
+    bl_idname = "anim.export_constraint_preset"
+    bl_label = "Export Constraint Preset"
+    
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json;*.json.gz", options={'HIDDEN'})
     
     constraint_type: EnumProperty(
         name="Constraint Type",
         items=[('ALL', "All", "")] + ALL_CONSTRAINTS,
         default='ALL'
     )
+    compress: BoolProperty(
+        name="Compress",
+        description="Write the preset gzip-compressed (.json.gz)",
+        default=False
+    )
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        active_obj = context.active_object
+        if not active_obj or active_obj.type != 'ARMATURE':
+            cls.poll_message_set("Active object must be an armature")
+            return False
+        if not state.has_constraints(active_obj):
+            cls.poll_message_set("Active armature has no bone constraints")
+            return False
+        return True
+    
+    @recorded('EXPORT_PRESET')
+    def execute(self, context):
+        filepath = self.filepath
+        if self.compress and not filepath.endswith(".gz"):
+            filepath += ".gz"
+        
+        count = api.export_preset(context.active_object, filepath, self.constraint_type, self.compress)
+        
+        self.report({'INFO'}, f"Exported {count} constraints to {bpy.path.basename(filepath)}")
+        return {'FINISHED'}
+
+class ANIM_OT_apply_constraint_preset(Operator, ImportHelper):
+    """Add the constraints stored in a preset file to bones with same name in selected armatures"""
+    bl_idname = "anim.apply_constraint_preset"
+    bl_label = "Apply Constraint Preset"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    filter_glob: StringProperty(default="*.json;*.json.gz", options={'HIDDEN'})
+    
+    replace: BoolProperty(
+        name="Replace Existing",
+        description="Remove the existing constraints of the bones the preset covers first",
+        default=False
+    )
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 1
+    
+    @recorded('APPLY_PRESET')
+    def execute(self, context):
+        selected_armatures = [obj for obj in context.selected_objects 
+                            if obj.type == 'ARMATURE']
+        
+        try:
+            result = api.apply_preset(self.filepath, selected_armatures, self.replace)
+        except (OSError, ValueError) as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Applied {result.total} constraints{format_counts(result.counts)}")
+        if result.missing:
+            self.report({'WARNING'}, f"Missing referenced data: {', '.join(result.missing)}")
+        if result.unset:
+            self.report({'WARNING'}, f"Properties not set: {format_names(result.unset)}")
+        return {'FINISHED'}
+
+NAME_RULE_KINDS = [
+    ('STRIP_PREFIX', _("Strip Prefix"), _("Ignore this prefix on both armatures")),
+    ('STRIP_SUFFIX', _("Strip Suffix"), _("Ignore this suffix on both armatures")),
+    ('REGEX', _("Regex Rewrite"), _("Rewrite names on both armatures with a regular expression")),
+    ('MIRROR', _("Mirror"), _("Flip the side of target bone names (.L <-> .R), at this position in the list")),
+    ('TABLE', _("Explicit Pair"), _("Pair a target bone with a source bone by name, before the other rules")),
+]
+
+def _on_name_rules_changed(self, context):
+    clear_availability_cache()
+
+class BatchBoneConstraintsNameRule(PropertyGroup):
+    kind: EnumProperty(
+        name="Kind",
+        items=NAME_RULE_KINDS,
+        default='STRIP_PREFIX',
+        update=_on_name_rules_changed
+    )
+    pattern: StringProperty(
+        name="Pattern",
+        description="Prefix, suffix, regular expression or target bone name",
+        update=_on_name_rules_changed
+    )
+    replacement: StringProperty(
+        name="Replacement",
+        description="Regular expression replacement or source bone name",
+        update=_on_name_rules_changed
+    )
+    enabled: BoolProperty(
+        name="Enabled",
+        default=True,
+        update=_on_name_rules_changed
+    )
+
+class BatchBoneConstraintsLink(PropertyGroup):
+    """A copied constraint and the source constraint it is kept in sync with"""
+    bone: StringProperty(name="Bone")
+    constraint: StringProperty(name="Constraint")
+    # Type the constraint was copied as; a same-named constraint of another type isn't the copy
+    constraint_type: StringProperty(name="Constraint Type")
+    source: PointerProperty(name="Source", type=bpy.types.Object)
+    source_bone: StringProperty(name="Source Bone")
+    source_constraint: StringProperty(name="Source Constraint")
+
+class BatchBoneConstraintsSettings(PropertyGroup):
+    use_name_rules: BoolProperty(
+        name="Map Bone Names",
+        description="Pair bones with the mapping rules instead of identical names in every mode",
+        default=False,
+        update=_on_name_rules_changed
+    )
+    name_rules: CollectionProperty(type=BatchBoneConstraintsNameRule)
+    active_rule_index: IntProperty()
+    template_collection: PointerProperty(
+        name="Template Rigs",
+        description="Selected armatures in this collection are the sources of Copy from Templates",
+        type=bpy.types.Collection
+    )
+    use_live_sync: BoolProperty(
+        name="Live Sync",
+        description="Push property changes of source constraints to their linked copies",
+        default=True
+    )
+
+class ANIM_OT_name_rule_add(Operator):
+    """Add a bone name mapping rule"""
+    bl_idname = "anim.batch_name_rule_add"
+    bl_label = "Add Name Rule"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    kind: EnumProperty(
+        name="Kind",
+        items=NAME_RULE_KINDS,
+        default='STRIP_PREFIX'
+    )
+    
+    def execute(self, context):
+        settings = context.scene.batch_bone_constraints
+        rule = settings.name_rules.add()
+        rule.kind = self.kind
+        settings.active_rule_index = len(settings.name_rules) - 1
+        clear_availability_cache()
+        return {'FINISHED'}
+
+class ANIM_OT_name_rule_remove(Operator):
+    """Remove the active bone name mapping rule"""
+    bl_idname = "anim.batch_name_rule_remove"
+    bl_label = "Remove Name Rule"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    @classmethod
+    def poll(cls, context):
+        settings = context.scene.batch_bone_constraints
+        return 0 <= settings.active_rule_index < len(settings.name_rules)
+    
+    def execute(self, context):
+        settings = context.scene.batch_bone_constraints
+        settings.name_rules.remove(settings.active_rule_index)
+        settings.active_rule_index = min(settings.active_rule_index, len(settings.name_rules) - 1)
+        clear_availability_cache()
+        return {'FINISHED'}
+
+class VIEW3D_UL_batch_name_rules(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "enabled", text="")
+        row.prop(item, "kind", text="")
+        if item.kind != 'MIRROR':
+            sub = row.row(align=True)
+            sub.alert = item.kind == 'REGEX' and bool(NameRules([('REGEX', item.pattern, "")]).invalid)
+            sub.prop(item, "pattern", text="")
+        if item.kind in {'REGEX', 'TABLE'}:
+            row.prop(item, "replacement", text="")
+
+class VIEW3D_PT_batch_name_rules(Panel):
+    bl_label = "Bone Name Mapping"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Batch Constraints"
+    
+    def draw_header(self, context):
+        self.layout.prop(context.scene.batch_bone_constraints, "use_name_rules", text="")
+    
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.batch_bone_constraints
+        layout.active = settings.use_name_rules
+        
+        row = layout.row()
+        row.template_list("VIEW3D_UL_batch_name_rules", "", settings, "name_rules", settings, "active_rule_index",
+                          rows=3)
+        col = row.column(align=True)
+        col.operator_menu_enum("anim.batch_name_rule_add", "kind", text="", icon='ADD')
+        col.operator("anim.batch_name_rule_remove", text="", icon='REMOVE')
+
+class VIEW3D_PT_batch_templates(Panel):
+    bl_label = "Template Rigs"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Batch Constraints"
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.batch_bone_constraints, "template_collection", text="")
+        layout.operator("anim.batch_copy_merged", icon='DUPLICATE')
+
+class ANIM_OT_sync_linked_constraints(Operator):
+    """Push the current properties of linked source constraints to their copies"""
+    bl_idname = "anim.sync_linked_constraints"
+    bl_label = "Sync Linked Constraints"
+    bl_options = {'REGISTER', 'UNDO'}
     
     @classmethod
     def poll(cls, context):
+        return bool(api.get_linked_sources())
+    
+    @recorded('SYNC')
+    def execute(self, context):
+        result = api.sync_links()
+        
+        self.report({'INFO'}, f"Updated {result.total} linked constraints{format_counts(result.counts)}")
+        return {'FINISHED'}
+
+class ANIM_OT_unlink_constraints(Operator):
+    """Stop syncing the linked constraints of the selected armatures (the constraints are kept)"""
+    bl_idname = "anim.unlink_constraints"
+    bl_label = "Unlink Selected"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 1
+    
+    def execute(self, context):
         selected_armatures = [obj for obj in context.selected_objects 
                             if obj.type == 'ARMATURE']
-        return len(selected_armatures) >= 1
+        
+        count = api.unlink(selected_armatures)
+        
+        self.report({'INFO'}, f"Unlinked {count} constraints")
+        return {'FINISHED'}
+
+class VIEW3D_PT_batch_linked_sync(Panel):
+    bl_label = "Linked Sync"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Batch Constraints"
+    
+    def draw_header(self, context):
+        self.layout.prop(context.scene.batch_bone_constraints, "use_live_sync", text="")
+    
+    def draw(self, context):
+        layout = self.layout
+        index = api.get_link_index()
+        if not index:
+            layout.label(text="Copy with Link for Sync to link constraints")
+        for source_name, links in sorted(index.items()):
+            copies = sum(len(targets) for targets in links.values())
+            layout.label(text=f"{source_name}: {copies} copies of {len(links)} constraints", icon='LINKED')
+        row = layout.row(align=True)
+        row.operator("anim.sync_linked_constraints", text="Sync Now", icon='FILE_REFRESH')
+        row.operator("anim.unlink_constraints", icon='UNLINKED')
+
+# Report of the last Audit, shown in the sidebar until the next one
+_last_audit = None
+
+class ANIM_OT_audit_constraint_stacks(Operator):
+    """Group the selected armatures by identical constraint setup and find the ones that drifted"""
+    bl_idname = "anim.audit_constraint_stacks"
+    bl_label = "Audit Selected"
+    bl_options = {'REGISTER'}
     
+    @classmethod
+    @cached_poll
+    def poll(cls, context, state):
+        return state.armature_count >= 2
+    
+    @recorded('AUDIT')
     def execute(self, context):
+        global _last_audit
         selected_armatures = [obj for obj in context.selected_objects 
                             if obj.type == 'ARMATURE']
+        _last_audit = api.audit(selected_armatures)
         
-        total_removed = 0
+        outliers = sum(len(cluster.armatures) for cluster in _last_audit.outliers)
+        self.report({'INFO'}, f"{_last_audit.armature_count} armatures in {len(_last_audit.clusters)} setups, "
+                              f"{outliers} differ from the most common one")
+        return {'FINISHED'}
+
+class ANIM_OT_export_audit_report(Operator, ExportHelper):
+    """Save the last audit as JSON: every setup with its armatures and the bones that differ"""
+    bl_idname = "anim.export_audit_report"
+    bl_label = "Export Audit Report"
+    
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+    
+    @classmethod
+    def poll(cls, context):
+        return _last_audit is not None
+    
+    def execute(self, context):
+        try:
+            _last_audit.write_json(self.filepath)
+        except OSError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
         
-        for armature in selected_armatures:
-            for bone in armature.pose.bones:
-                for constraint in list(bone.constraints):
-                    if (self.constraint_type == 'ALL' or 
-                        constraint.type == self.constraint_type):
-                        bone.constraints.remove(constraint)
-                        total_removed += 1
+        self.report({'INFO'}, f"Exported audit of {_last_audit.armature_count} armatures "
+                              f"to {bpy.path.basename(self.filepath)}")
+        return {'FINISHED'}
+
+class VIEW3D_PT_batch_audit(Panel):
+    bl_label = "Audit"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Batch Constraints"
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.operator("anim.audit_constraint_stacks", icon='VIEWZOOM')
         
-        type_name = "All" if self.constraint_type == 'ALL' else self.constraint_type
-        self.report({'INFO'}, f"Removed {total_removed} {type_name} constraints")
+        report = _last_audit
+        if report is None:
+            layout.label(text="Select armatures to compare their constraints")
+            return
+        reference = report.reference
+        if reference is not None:
+            layout.label(text=f"{len(reference.armatures)} of {report.armature_count} share the most common setup",
+                         icon='CHECKMARK')
+        for cluster in report.outliers:
+            box = layout.box()
+            col = box.column(align=True)
+            col.label(text=format_names(cluster.armatures), icon='ERROR')
+            col.label(text=f"Differs on {len(cluster.differing_bones)} bones: {format_names(cluster.differing_bones)}")
+        layout.operator("anim.export_audit_report", text="Export Report...", icon='EXPORT')
+
+class BatchBoneConstraintsPreferences(AddonPreferences):
+    bl_idname = __package__
+    
+    match_tolerance: FloatProperty(
+        name="Match Tolerance",
+        description="Float and vector values closer than this are treated as equal when matching constraints",
+        default=DEFAULT_MATCH_TOLERANCE,
+        min=1e-9,
+        max=1.0,
+        precision=6,
+        update=lambda self, context: clear_availability_cache()
+    )
+    record_stats: BoolProperty(
+        name="Record Statistics",
+        description="Keep phase timings and counters of every batch operation for the sidebar and JSONL export",
+        default=True,
+        update=lambda self, context: sync_recorder(self)
+    )
+    profile_operations: BoolProperty(
+        name="Profile Operations",
+        description="Also run each recorded operation under cProfile (slower, for bug reports about slow rigs)",
+        default=False,
+        update=lambda self, context: sync_recorder(self)
+    )
+    
+    def draw(self, context):
+        self.layout.prop(self, "match_tolerance")
+        row = self.layout.row()
+        row.prop(self, "record_stats")
+        row.prop(self, "profile_operations")
+
+def get_preferences(context):
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+def sync_recorder(preferences):
+    recorder.enabled = preferences.record_stats
+    recorder.profile = preferences.profile_operations
+
+class ANIM_OT_export_batch_stats(Operator, ExportHelper):
+    """Save the recorded batch operation statistics as JSON lines"""
+    bl_idname = "anim.export_batch_stats"
+    bl_label = "Export Statistics"
+    
+    filename_ext = ".jsonl"
+    filter_glob: StringProperty(default="*.jsonl", options={'HIDDEN'})
+    
+    @classmethod
+    def poll(cls, context):
+        return bool(recorder.records)
+    
+    def execute(self, context):
+        try:
+            count = recorder.export_jsonl(self.filepath)
+        except OSError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Exported {count} records to {bpy.path.basename(self.filepath)}")
         return {'FINISHED'}
 
+class ANIM_OT_clear_batch_stats(Operator):
+    """Forget the recorded batch operation statistics"""
+    bl_idname = "anim.clear_batch_stats"
+    bl_label = "Clear Statistics"
+    
+    @classmethod
+    def poll(cls, context):
+        return bool(recorder.records)
+    
+    def execute(self, context):
+        recorder.clear()
+        return {'FINISHED'}
+
+class VIEW3D_PT_batch_stats(Panel):
+    bl_label = "Statistics"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Batch Constraints"
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw_header(self, context):
+        preferences = get_preferences(context)
+        if preferences is not None:
+            self.layout.prop(preferences, "record_stats", text="")
+    
+    def draw(self, context):
+        layout = self.layout
+        preferences = get_preferences(context)
+        if preferences is not None:
+            layout.active = preferences.record_stats
+            layout.prop(preferences, "profile_operations")
+        
+        record = recorder.last
+        if record is None:
+            layout.label(text="No operation recorded yet")
+        else:
+            col = layout.column(align=True)
+            col.label(text=f"{record.operation}: {record.total_time * 1000:.1f} ms")
+            for name, seconds in record.phases.items():
+                row = col.row()
+                row.label(text=name.title())
+                row.label(text=f"{seconds * 1000:.1f} ms")
+            col.separator()
+            for name in COUNTER_NAMES:
+                row = col.row()
+                row.label(text=name.replace("_", " ").capitalize())
+                row.label(text=str(record.counts.get(name, 0)))
+        
+        row = layout.row(align=True)
+        row.operator("anim.export_batch_stats", text=f"Export {len(recorder.records)} Records...", icon='EXPORT')
+        row.operator("anim.clear_batch_stats", text="", icon='TRASH')
+
 # Menu definitions
 class VIEW3D_MT_batch_constraints_menu(Menu):
     bl_label = _("Batch Bone Constraints")
@@ -637,18 +1437,24 @@ class VIEW3D_MT_batch_constraints_menu(Menu):
         if context.active_object and context.active_object.type == 'ARMATURE':
             return True
         # Check if selected objects include armatures
-        selected_armatures = [obj for obj in context.selected_objects 
-                            if obj.type == 'ARMATURE']
-        return len(selected_armatures) >= 1
+        state = poll_state.get(context)
+        if not state.armature_count and not state.fresh:
+            state = poll_state.get(context, refresh=True)
+        return state.armature_count >= 1
     
     def draw(self, context):
         layout = self.layout
         layout.menu("VIEW3D_MT_imitate_menu", icon='CONSTRAINT_BONE')
         layout.menu("VIEW3D_MT_remove_imitate_menu", icon='REMOVE')
         layout.menu("VIEW3D_MT_copy_menu", icon='DUPLICATE')
+        layout.operator("anim.batch_copy_merged", icon='DUPLICATE')
         layout.menu("VIEW3D_MT_remove_copy_menu", icon='REMOVE')
         layout.menu("VIEW3D_MT_new_menu", icon='ADD')
         layout.menu("VIEW3D_MT_delete_menu", icon='TRASH')
+        layout.menu("VIEW3D_MT_edit_menu", icon='PROPERTIES')
+        layout.separator()
+        layout.operator("anim.export_constraint_preset", text="Export Preset...", icon='EXPORT')
+        layout.operator("anim.apply_constraint_preset", text="Apply Preset...", icon='IMPORT')
 
 class VIEW3D_MT_imitate_menu(Menu):
     bl_label = _("Imitate")
@@ -656,7 +1462,7 @@ class VIEW3D_MT_imitate_menu(Menu):
     
     def draw(self, context):
         layout = self.layout
-        available_types = get_available_constraint_types(context, 'IMITATE')
+        available_types = get_cached_constraint_types(context, 'IMITATE')
         
         if not available_types:
             # Show hint when no options available
@@ -674,7 +1480,7 @@ class VIEW3D_MT_remove_imitate_menu(Menu):
     
     def draw(self, context):
         layout = self.layout
-        available_types = get_available_constraint_types(context, 'REMOVE_IMITATE')
+        available_types = get_cached_constraint_types(context, 'REMOVE_IMITATE')
         
         if not available_types:
             # Show hint when no options available
@@ -699,7 +1505,7 @@ class VIEW3D_MT_copy_menu(Menu):
     
     def draw(self, context):
         layout = self.layout
-        available_types = get_available_constraint_types(context, 'COPY')
+        available_types = get_cached_constraint_types(context, 'COPY')
         
         if not available_types:
             # Show hint when no options available
@@ -724,7 +1530,7 @@ class VIEW3D_MT_remove_copy_menu(Menu):
     
     def draw(self, context):
         layout = self.layout
-        available_types = get_available_constraint_types(context, 'REMOVE_COPY')
+        available_types = get_cached_constraint_types(context, 'REMOVE_COPY')
         
         if not available_types:
             # Show hint when no options available
@@ -761,7 +1567,7 @@ class VIEW3D_MT_delete_menu(Menu):
     
     def draw(self, context):
         layout = self.layout
-        available_types = get_available_constraint_types(context, 'DELETE')
+        available_types = get_cached_constraint_types(context, 'DELETE')
         
         if not available_types:
             # Show hint when no options available
@@ -780,19 +1586,59 @@ class VIEW3D_MT_delete_menu(Menu):
                 op = layout.operator("anim.batch_delete", text=constraint_type[1], icon=icon)
                 op.constraint_type = constraint_type[0]
 
+class VIEW3D_MT_edit_menu(Menu):
+    bl_label = _("Edit")
+    bl_idname = "VIEW3D_MT_edit_menu"
+    
+    def draw(self, context):
+        layout = self.layout
+        available_types = get_cached_constraint_types(context, 'DELETE')
+        
+        if not available_types:
+            # Show hint when no options available
+            layout.label(text="No options available", icon='INFO')
+            return
+        
+        layout.operator_context = 'INVOKE_DEFAULT'
+        if len(available_types) >1:
+            op = layout.operator("anim.batch_edit", text="All", icon='PROPERTIES')
+            op.constraint_type = 'ALL'
+            layout.separator()
+        
+        for constraint_type in ALL_CONSTRAINTS:
+            if constraint_type[0] in available_types:
+                icon = get_constraint_icon(constraint_type[0])
+                op = layout.operator("anim.batch_edit", text=constraint_type[1], icon=icon)
+                op.constraint_type = constraint_type[0]
+
 def menu_func(self, context):
-    # Only show menu when active or selected objects include armatures
-    if context.mode == 'OBJECT' and (context.active_object and context.active_object.type == 'ARMATURE') or \
-       any(obj.type == 'ARMATURE' for obj in context.selected_objects):
+    # Only show menu when active or selected objects include armatures (drawn on every header redraw)
+    if VIEW3D_MT_batch_constraints_menu.poll(context):
         self.layout.menu("VIEW3D_MT_batch_constraints_menu")
 
 classes = (
+    BatchBoneConstraintsPreferences,
+    BatchBoneConstraintsNameRule,
+    BatchBoneConstraintsLink,
+    BatchBoneConstraintsSettings,
     ANIM_OT_batch_imitate,
     ANIM_OT_remove_imitate,
     ANIM_OT_batch_copy,
+    ANIM_OT_batch_copy_merged,
     ANIM_OT_remove_copy,
     ANIM_OT_batch_new,
     ANIM_OT_batch_delete,
+    ANIM_OT_batch_edit,
+    ANIM_OT_export_constraint_preset,
+    ANIM_OT_apply_constraint_preset,
+    ANIM_OT_name_rule_add,
+    ANIM_OT_name_rule_remove,
+    ANIM_OT_sync_linked_constraints,
+    ANIM_OT_unlink_constraints,
+    ANIM_OT_export_batch_stats,
+    ANIM_OT_clear_batch_stats,
+    ANIM_OT_audit_constraint_stacks,
+    ANIM_OT_export_audit_report,
     VIEW3D_MT_batch_constraints_menu,
     VIEW3D_MT_imitate_menu,
     VIEW3D_MT_remove_imitate_menu,
@@ -800,14 +1646,44 @@ classes = (
     VIEW3D_MT_remove_copy_menu,
     VIEW3D_MT_new_menu,
     VIEW3D_MT_delete_menu,
+    VIEW3D_MT_edit_menu,
+    VIEW3D_UL_batch_name_rules,
+    VIEW3D_PT_batch_name_rules,
+    VIEW3D_PT_batch_templates,
+    VIEW3D_PT_batch_linked_sync,
+    VIEW3D_PT_batch_stats,
+    VIEW3D_PT_batch_audit,
 )
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.Scene.batch_bone_constraints = PointerProperty(type=BatchBoneConstraintsSettings)
+    bpy.types.Object.batch_constraint_links = CollectionProperty(type=BatchBoneConstraintsLink)
+    preferences = get_preferences(bpy.context)
+    if preferences is not None:
+        sync_recorder(preferences)
     bpy.types.VIEW3D_MT_editor_menus.append(menu_func)
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+    bpy.app.handlers.load_post.append(_on_load_post)
+    bpy.app.handlers.undo_post.append(_on_undo_redo_post)
+    bpy.app.handlers.redo_post.append(_on_undo_redo_post)
+    subscribe_rna_changes()
 
 def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    sync_scheduler.cancel()
+    bpy.app.handlers.redo_post.remove(_on_undo_redo_post)
+    bpy.app.handlers.undo_post.remove(_on_undo_redo_post)
+    bpy.app.handlers.load_post.remove(_on_load_post)
+    bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+    clear_availability_cache()
+    poll_state.clear()
+    api.clear_plan_cache()
+    api.clear_name_maps()
+    api.clear_link_index()
+    del bpy.types.Object.batch_constraint_links
+    del bpy.types.Scene.batch_bone_constraints
     bpy.types.VIEW3D_MT_editor_menus.remove(menu_func)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
@@ -0,0 +1,687 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Scripting API: batch operations on explicit objects, without context or selection
+
+Every function takes objects or object names and returns a BatchResult, e.g.
+
+    from batch_bone_constraints import api
+    api.copy("TemplateRig", ["Crowd.001", "Crowd.002"], 'ALL')
+    api.delete(crowd_rigs, 'IK')
+    api.export_preset("TemplateRig", "//rig.json.gz")
+    api.apply_preset("//rig.json.gz", crowd_rigs)
+
+Each operation is planned first (plan()) and then applied (apply_plan()); the
+operators are thin wrappers around these functions.
+"""
+
+import time
+
+import bpy
+
+from .core import (
+    DEFAULT_MATCH_TOLERANCE,
+    BatchPlan,
+    BatchSession,
+    copy_constraint_properties,
+    get_changed_properties,
+    get_constraint_fingerprint,
+    get_layout_stamp,
+    get_source_name_list,
+    identity_name_map,
+    plan_copy,
+    plan_delete,
+    plan_imitate,
+    plan_merged_copy,
+    plan_new,
+    plan_remove_copy,
+    plan_remove_imitate,
+)
+from . import bulk_edit, mesh_weights, presets
+from .audit import audit_armatures
+from .metrics import recorder
+from .naming import NameMapCache, NameRules
+from .scope import ALL_BONES, scoped_name_map
+from .snapshot import build_snapshot, map_chunks
+
+
+class BatchResult:
+    """Outcome of a batch operation"""
+
+    def __init__(self, operation, counts, missing=(), unset=(), updates_avoided=0):
+        self.operation = operation
+        # Armature name -> number of constraints created or removed on it
+        self.counts = counts
+        # Per-constraint owner updates the batch session replaced with one tag per armature
+        self.updates_avoided = updates_avoided
+        # Names of referenced IDs that couldn't be found (presets)
+        self.missing = sorted(missing)
+        # Properties that couldn't be set, as "TYPE.property" (presets)
+        self.unset = sorted(unset)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def __repr__(self):
+        return f"<BatchResult {self.operation}: {self.total} constraints on {len(self.counts)} armatures>"
+
+
+def get_match_scale(tolerance=None):
+    """Get the quantization scale for float values, by default from the add-on preferences"""
+    if tolerance is None:
+        addon = bpy.context.preferences.addons.get(__package__)
+        tolerance = addon.preferences.match_tolerance if addon else DEFAULT_MATCH_TOLERANCE
+    return 1.0 / tolerance
+
+
+def resolve_object(obj):
+    """Get an object from an object or an object name"""
+    if isinstance(obj, str):
+        found = bpy.data.objects.get(obj)
+        if found is None:
+            raise KeyError(f"No object named '{obj}'")
+        return found
+    return obj
+
+
+def resolve_armatures(objs, exclude=None):
+    """Get armature objects from objects or names, leaving out exclude"""
+    if isinstance(objs, (str, bpy.types.ID)):
+        objs = [objs]
+    armatures = []
+    for obj in objs:
+        obj = resolve_object(obj)
+        if obj.type != 'ARMATURE':
+            raise TypeError(f"'{obj.name}' is not an armature")
+        if obj != exclude:
+            armatures.append(obj)
+    return armatures
+
+
+def resolve_constraint_types(constraint_type):
+    """Get the constraint types of a type name or an iterable of them, without duplicates
+
+    'ALL' stands for every type, so it replaces the others.
+    """
+    if isinstance(constraint_type, str):
+        return (constraint_type,)
+    types = tuple(dict.fromkeys(constraint_type))
+    if not types:
+        raise ValueError("No constraint type given")
+    return ('ALL',) if 'ALL' in types else types
+
+
+def _session_result(operation, session, missing=(), unset=()):
+    return BatchResult(operation, {armature.name: count for armature, count in session.mutations.items()},
+                       missing, unset, session.updates_avoided)
+
+
+# Compiled bone name maps per (source, target) pair
+_name_maps = NameMapCache()
+
+
+def get_scene_name_rules(scene):
+    """Get the enabled bone name mapping rules of a scene's sidebar, () while mapping is off"""
+    settings = getattr(scene, "batch_bone_constraints", None)
+    if settings is None or not settings.use_name_rules:
+        return ()
+    return tuple((rule.kind, rule.pattern, rule.replacement) for rule in settings.name_rules if rule.enabled)
+
+
+def get_name_rules(name_rules=None):
+    """Get compiled bone name mapping rules, by default none (bones pair by identical name)
+
+    name_rules is a sequence of (kind, pattern, replacement) tuples, see naming.py. The
+    API never reads the scene's rules by itself; pass get_scene_name_rules(scene) for those.
+    """
+    return NameRules(name_rules or ())
+
+
+def get_name_map_function(rules):
+    """Get name_map(source, target) for the core planners: target bone name -> source name
+
+    The function is meant for one planning pass: it takes every object's layout stamp once.
+    """
+    if not rules.rules:
+        return identity_name_map
+    
+    # Layout stamps per object name, taken once per planning pass rather than per pair
+    stamps = {}
+    
+    def stamp(obj):
+        obj_stamp = stamps.get(obj.name_full)
+        if obj_stamp is None:
+            obj_stamp = stamps[obj.name_full] = get_layout_stamp(obj)
+        return obj_stamp
+    
+    def name_map(source, target):
+        return _name_maps.get(rules, source.name_full, stamp(source), target.name_full, stamp(target),
+                              lambda: (get_source_name_list(source), tuple(bone.name for bone in target.pose.bones)))
+    return name_map
+
+
+def clear_name_maps():
+    _name_maps.clear()
+
+
+def skip_unweighted_groups(name_map, source, min_weight):
+    """Narrow name_map to the vertex groups of a mesh source weighted at least min_weight"""
+    weighted = frozenset(mesh_weights.get_weighted_group_names(source, min_weight))
+    
+    def weighted_name_map(map_source, target):
+        return {target_name: source_name for target_name, source_name in name_map(map_source, target).items()
+                if source_name in weighted}
+    return weighted_name_map
+
+
+def take_snapshot(objects, tolerance=None):
+    """Read objects (or names) into a snapshot.RigSnapshot for plan(snapshot=...)
+
+    Constraints are fingerprinted at the match scale of tolerance, so plan with the
+    same tolerance. The snapshot doesn't follow later edits of the objects.
+    """
+    if isinstance(objects, (str, bpy.types.ID)):
+        objects = [objects]
+    with recorder.phase('scan'):
+        return build_snapshot([resolve_object(obj) for obj in objects], get_match_scale(tolerance))
+
+
+def _make_plans(operation, source, targets, constraint_type, scale, name_map, scope, workers=None):
+    """_make_plan() over the targets, split among workers threads when given"""
+    result = BatchPlan(operation)
+    for part in map_chunks(
+            lambda chunk: _make_plan(operation, source, chunk, constraint_type, scale, name_map, scope),
+            targets, workers):
+        result.extend(part)
+    return result
+
+
+def _make_plan(operation, source, targets, constraint_type, scale, name_map, scope):
+    if operation == 'IMITATE':
+        return plan_imitate(source, targets, constraint_type, name_map)
+    if operation == 'REMOVE_IMITATE':
+        return plan_remove_imitate(source, targets, constraint_type, name_map)
+    if operation == 'COPY':
+        return plan_copy(source, targets, constraint_type, scale, name_map)
+    if operation == 'REMOVE_COPY':
+        return plan_remove_copy(source, targets, constraint_type, scale, name_map)
+    if operation == 'NEW':
+        return plan_new(targets, constraint_type, scope)
+    if operation == 'DELETE':
+        return plan_delete(targets, constraint_type, scope)
+    raise ValueError(f"Unknown operation: {operation!r}")
+
+
+# Per-target plans: (operation, constraint type, source name, target name, scale, name rules,
+# min weight, scope) -> (source stamp, target stamp, plan). Planning New and Delete costs no more than a stamp.
+_plan_cache = {}
+_PLAN_CACHE_SIZE = 256
+_CACHED_OPERATIONS = {'IMITATE', 'REMOVE_IMITATE', 'COPY', 'REMOVE_COPY'}
+
+
+def clear_plan_cache():
+    _plan_cache.clear()
+
+
+def plan(operation, source, targets, constraint_type='ALL', tolerance=None, use_cache=False, name_rules=None,
+         min_weight=None, scope=None, snapshot=None, workers=None):
+    """Plan an operation without changing anything, return a BatchPlan
+
+    constraint_type is a type name or an iterable of them, planned one after the other
+    into one plan. source is ignored by 'NEW' and 'DELETE'. Bones are paired by name_rules (see
+    get_name_rules), by default by identical names. Plans of the other operations are kept per
+    target armature; with use_cache, a kept plan is reused for each target whose
+    constraint layout (and the source's) hasn't changed since, also narrowing a kept
+    'ALL' plan to constraint_type. Property edits don't change the layout, so only use
+    the cache when nothing can have been edited in between, e.g. for redo.
+    
+    With min_weight and a mesh source, 'IMITATE' and 'REMOVE_IMITATE' skip bones whose
+    vertex group has no vertex weighted at least min_weight (empty groups always).
+    
+    scope (a scope.BoneScope) limits every operation to some bones of each target.
+    
+    With snapshot (see take_snapshot()), planning reads the snapshot instead of the
+    live objects; it must hold the source and the targets. With workers, the targets are
+    planned in that many threads, on a snapshot taken for the purpose if none is given.
+    Planning is pure Python, so threads only run in parallel on a free-threaded build.
+    """
+    source = resolve_object(source) if operation not in {'NEW', 'DELETE'} else None
+    targets = resolve_armatures(targets, exclude=source)
+    scale = get_match_scale(tolerance) if operation in {'COPY', 'REMOVE_COPY'} else None
+    if snapshot is None and workers:
+        # bpy data isn't safe to read from other threads
+        with recorder.phase('scan'):
+            snapshot = build_snapshot(([source] if source is not None else []) + targets, scale)
+    types = resolve_constraint_types(constraint_type)
+    if len(types) > 1:
+        result = BatchPlan(operation)
+        for one_type in types:
+            result.extend(plan(operation, source, targets, one_type, tolerance, use_cache, name_rules,
+                               min_weight, scope, snapshot, workers))
+        return result
+    constraint_type = types[0]
+    rules = get_name_rules(name_rules)
+    name_map = get_name_map_function(rules)
+    if min_weight is not None and source is not None and source.type == 'MESH':
+        with recorder.phase('scan'):
+            name_map = skip_unweighted_groups(name_map, source, min_weight)
+    else:
+        min_weight = None
+    scope = scope or ALL_BONES
+    name_map = scoped_name_map(name_map, scope)
+    if snapshot is not None:
+        # Plans only hold names, so a plan made on the snapshot applies to the live objects
+        source = snapshot[source] if source is not None else None
+        targets = snapshot.get_list(targets)
+    if operation not in _CACHED_OPERATIONS:
+        with recorder.phase('plan'):
+            return _make_plans(operation, source, targets, constraint_type, scale, name_map, scope, workers)
+    
+    settings = (scale, rules.rules, min_weight, scope.key())
+    result = BatchPlan(operation)
+    unplanned = []
+    with recorder.phase('scan'):
+        source_stamp = get_layout_stamp(source)
+        target_stamps = {}
+        for target in targets:
+            cached_plan = None
+            if use_cache:
+                # The bones in scope can change without a layout change (bone selection)
+                target_stamps[target.name] = (get_layout_stamp(target), scope.names(target))
+                for cached_type in dict.fromkeys((constraint_type, 'ALL')):
+                    cached = _plan_cache.get((operation, cached_type, source.name, target.name) + settings)
+                    if cached and cached[0] == source_stamp and cached[1] == target_stamps[target.name]:
+                        cached_plan = cached[2].of_type(constraint_type)
+                        break
+            if cached_plan is None:
+                unplanned.append(target)
+            else:
+                result.extend(cached_plan)
+    
+    if unplanned:
+        with recorder.phase('plan'):
+            fresh = _make_plans(operation, source, unplanned, constraint_type, scale, name_map, scope, workers)
+        result.extend(fresh)
+        if len(_plan_cache) + len(unplanned) > _PLAN_CACHE_SIZE:
+            clear_plan_cache()
+        target_plans = fresh.split()
+        with recorder.phase('scan'):
+            for target in unplanned:
+                target_stamp = target_stamps.get(target.name) or (get_layout_stamp(target), scope.names(target))
+                _plan_cache[(operation, constraint_type, source.name, target.name) + settings] = (
+                    source_stamp, target_stamp, target_plans.get(target.name) or BatchPlan(operation))
+    return result
+
+
+def plan_merged(sources, targets, constraint_type='ALL', tolerance=None, name_rules=None, scope=None,
+                snapshot=None, workers=None):
+    """Plan a Copy from several source armatures merged into one index, return a BatchPlan
+
+    Sources take precedence in the given order: on each bone, a constraint of a later
+    source is left out when an earlier source has an identical one, whatever the names.
+    Sources are never targets. constraint_type, snapshot and workers work as for plan().
+    """
+    sources = resolve_armatures(sources)
+    targets = [target for target in resolve_armatures(targets) if target not in sources]
+    scale = get_match_scale(tolerance)
+    name_map = scoped_name_map(get_name_map_function(get_name_rules(name_rules)), scope or ALL_BONES)
+    if snapshot is None and workers:
+        with recorder.phase('scan'):
+            snapshot = build_snapshot(sources + targets, scale)
+    if snapshot is not None:
+        sources = snapshot.get_list(sources)
+        targets = snapshot.get_list(targets)
+    result = BatchPlan('COPY')
+    with recorder.phase('plan'):
+        for one_type in resolve_constraint_types(constraint_type):
+            for part in map_chunks(lambda chunk: plan_merged_copy(sources, chunk, one_type, scale, name_map),
+                                   targets, workers):
+                result.extend(part)
+    return result
+
+
+def apply_plan(batch_plan, link=False):
+    """Carry out a plan made by plan(), return a BatchResult
+
+    With link, copied constraints are linked to their source constraint for live sync
+    (see sync_links()).
+    """
+    with recorder.phase('mutate'), BatchSession() as session:
+        batch_plan.apply(bpy.data.objects.get, session, on_create=LinkRecorder() if link else None)
+        prune_links(session.mutations)
+    return _session_result(batch_plan.operation, session)
+
+
+# Plan entries applied between two time budget checks of PlanApplier.step()
+_APPLY_SLICE = 64
+
+
+class PlanApplier:
+    """Apply a plan a slice at a time, e.g. from the timer events of a modal operator
+
+    Entries hold names, so the data may change between steps (even through undo).
+    Armatures are tagged for update once, by finish().
+    """
+
+    def __init__(self, batch_plan, link=False):
+        self.batch_plan = batch_plan
+        self.on_create = LinkRecorder() if link else None
+        self.session = BatchSession()
+        # Number of plan entries applied so far
+        self.position = 0
+
+    @property
+    def total(self):
+        return len(self.batch_plan.entries)
+
+    def step(self, budget):
+        """Apply entries for about budget seconds, return whether the plan is done"""
+        deadline = time.perf_counter() + budget
+        with recorder.phase('mutate'):
+            while self.position < self.total:
+                stop = min(self.position + _APPLY_SLICE, self.total)
+                self.batch_plan.apply(bpy.data.objects.get, self.session, self.position, stop, self.on_create)
+                self.position = stop
+                if time.perf_counter() >= deadline:
+                    break
+        return self.position >= self.total
+
+    def finish(self):
+        """Tag the changed armatures and return the BatchResult of the steps taken"""
+        prune_links(self.session.mutations)
+        self.session.tag_updates()
+        return _session_result(self.batch_plan.operation, self.session)
+
+
+def imitate(source, targets, constraint_type='COPY_ROTATION', use_cache=False, min_weight=None, scope=None,
+            name_rules=None):
+    """Add constraint_type constraints to target bones, targeting the same-named source bone
+
+    constraint_type is a type name or an iterable of them, e.g. ('COPY_ROTATION',
+    'COPY_LOCATION') adds one constraint of each. source is an armature or a mesh (whose
+    vertex groups are matched by name). With min_weight, vertex groups without a vertex
+    weighted at least that much are skipped. name_rules pair differently named bones,
+    see get_name_rules(); this holds for all the functions below that pair bones.
+    """
+    return apply_plan(plan('IMITATE', source, targets, constraint_type, use_cache=use_cache, name_rules=name_rules,
+                           min_weight=min_weight, scope=scope))
+
+
+def remove_imitate(source, targets, constraint_type='ALL', use_cache=False, scope=None, name_rules=None):
+    """Remove target constraints of constraint_type (names, or 'ALL') imitating the same-named source bone"""
+    return apply_plan(plan('REMOVE_IMITATE', source, targets, constraint_type, use_cache=use_cache,
+                           name_rules=name_rules, scope=scope))
+
+
+def copy(source, targets, constraint_type='ALL', tolerance=None, use_cache=False, scope=None, name_rules=None):
+    """Copy constraints from source bones to same-named target bones that lack them"""
+    return apply_plan(plan('COPY', source, targets, constraint_type, tolerance, use_cache, name_rules, scope=scope))
+
+
+def copy_merged(sources, targets, constraint_type='ALL', tolerance=None, scope=None, name_rules=None):
+    """Copy constraints from several source armatures in one pass, see plan_merged()"""
+    return apply_plan(plan_merged(sources, targets, constraint_type, tolerance, name_rules, scope=scope))
+
+
+def remove_copy(source, targets, constraint_type='ALL', tolerance=None, use_cache=False, scope=None,
+                name_rules=None):
+    """Remove target constraints identical to one on the same-named source bone"""
+    return apply_plan(plan('REMOVE_COPY', source, targets, constraint_type, tolerance, use_cache, name_rules,
+                           scope=scope))
+
+
+def new(targets, constraint_type, scope=None):
+    """Add a new constraint_type constraint to every bone (in scope) of the targets"""
+    return apply_plan(plan('NEW', None, targets, constraint_type, scope=scope))
+
+
+def delete(targets, constraint_type='ALL', scope=None):
+    """Remove constraints of constraint_type (or all of them) from every bone (in scope) of the targets"""
+    return apply_plan(plan('DELETE', None, targets, constraint_type, scope=scope))
+
+
+def edit(targets, constraint_type='ALL', scope=None, **values):
+    """Set influence, mute, owner_space and/or target_space on existing constraints
+
+    Edits the constraints of constraint_type (a type name or an iterable of them, or
+    'ALL') on the bones in scope of every target, e.g.
+    api.edit(rigs, ('IK', 'DAMPED_TRACK'), influence=0.5, mute=False).
+    """
+    targets = resolve_armatures(targets)
+    scope = scope or ALL_BONES
+    with recorder.phase('mutate'), BatchSession() as session:
+        for one_type in resolve_constraint_types(constraint_type):
+            bulk_edit.edit_armatures(targets, one_type, values, scope.bones, session)
+    return _session_result('EDIT', session)
+
+
+def audit(armatures, tolerance=None, snapshot=None):
+    """Group armatures by identical constraint setup, return an audit.AuditReport
+
+    Constraints match as for Remove Copy (within tolerance). report.outliers lists the
+    clusters that differ from the most common setup, with the differing bones; e.g.
+    api.audit(crowd_rigs).write_json(path). With snapshot (see take_snapshot())
+    nothing is read from the live objects.
+    """
+    armatures = resolve_armatures(armatures)
+    if snapshot is not None:
+        armatures = snapshot.get_list(armatures)
+    with recorder.phase('scan'):
+        return audit_armatures(armatures, get_match_scale(tolerance))
+
+# bpy.data collections holding the ID types constraints can point to
+_ID_COLLECTIONS = {
+    'Object': 'objects',
+    'Action': 'actions',
+    'CacheFile': 'cache_files',
+    'MovieClip': 'movieclips',
+}
+
+
+def _resolve_id(id_type, name):
+    collection = getattr(bpy.data, _ID_COLLECTIONS.get(id_type, ""), None)
+    return None if collection is None else collection.get(name)
+
+
+def export_preset(source, filepath, constraint_type='ALL', compress=None):
+    """Write the constraint stacks of the source armature to a preset file, return the constraint count
+
+    The file is gzip-compressed if compress, by default when filepath ends in .gz.
+    """
+    source = resolve_armatures(source)[0]
+    with recorder.phase('scan'):
+        preset = presets.build_preset(source, constraint_type)
+    presets.write_preset(preset, bpy.path.abspath(filepath), compress)
+    return presets.preset_constraint_count(preset)
+
+
+def apply_preset(preset, targets, replace=False):
+    """Add the constraints of a preset (file path or loaded preset) to same-named target bones
+
+    References to the exported armature itself point to each target. With replace, the
+    existing stacks of the bones the preset covers are removed first.
+    """
+    if isinstance(preset, str):
+        preset = presets.read_preset(bpy.path.abspath(preset))
+    targets = resolve_armatures(targets)
+    with recorder.phase('mutate'), BatchSession() as session:
+        unset = set()
+        missing = presets.apply_preset(preset, targets, _resolve_id, session, replace, unset)
+        prune_links(session.mutations)
+    return _session_result('APPLY_PRESET', session, missing, unset)
+
+
+# Linked sync: every copied constraint made with link=True is recorded on its armature
+# (Object.batch_constraint_links) with the source constraint it came from. Links are
+# indexed per source armature; the index is rebuilt after links change, objects are
+# added or removed, load and undo. A link is dead once its copy is gone or has another
+# type than it was copied as: the index leaves it out and it is removed after any
+# operation on its armature (see prune_links()). Without the add-on registered (e.g.
+# in the headless batch runner) objects have no links: pruning and sync do nothing
+# and linking raises.
+_link_index = None
+_link_index_objects = 0
+# (source name, bone name, constraint name) -> fingerprint last pushed to the targets
+_synced_fingerprints = {}
+
+# Scale of the fingerprints compared by sync: exact up to float noise
+_SYNC_SCALE = 1e9
+
+
+def links_registered():
+    """Whether Object.batch_constraint_links exists, i.e. the add-on is registered"""
+    return hasattr(bpy.types.Object, "batch_constraint_links")
+
+
+class LinkRecorder:
+    """on_create callback of BatchPlan.apply() linking every copied constraint to its source
+
+    There is one link per copy: linking a constraint again replaces the link in place.
+    """
+
+    def __init__(self):
+        if not links_registered():
+            raise RuntimeError("Linking copies needs the add-on registered")
+        # Armature -> {(bone name, constraint name): link index}
+        self.indices = {}
+
+    def __call__(self, armature, bone, constraint, action, spec):
+        if action != 'COPY':
+            return
+        links = armature.batch_constraint_links
+        indices = self.indices.get(armature)
+        if indices is None:
+            indices = self.indices[armature] = {(link.bone, link.constraint): index
+                                                for index, link in enumerate(links)}
+        index = indices.get((bone.name, constraint.name))
+        if index is None:
+            link = links.add()
+            indices[(bone.name, constraint.name)] = len(links) - 1
+        else:
+            link = links[index]
+        link.bone = bone.name
+        link.constraint = constraint.name
+        link.constraint_type = constraint.type
+        link.source = bpy.data.objects.get(spec[1])
+        link.source_bone = spec[2]
+        link.source_constraint = spec[3]
+        clear_link_index()
+
+
+def _get_linked_constraint(armature, link):
+    """Get the copy a link points to, None if it's gone or no longer of the linked type"""
+    bone = armature.pose.bones.get(link.bone)
+    constraint = bone.constraints.get(link.constraint) if bone is not None else None
+    if constraint is None or (link.constraint_type and constraint.type != link.constraint_type):
+        return None
+    return constraint
+
+
+def prune_links(armatures):
+    """Remove the dead links of the armatures (copy or source gone), return how many"""
+    if not links_registered():
+        return 0
+    count = 0
+    for armature in armatures:
+        links = armature.batch_constraint_links
+        for index in reversed(range(len(links))):
+            link = links[index]
+            if link.source is None or _get_linked_constraint(armature, link) is None:
+                links.remove(index)
+                count += 1
+    if count:
+        clear_link_index()
+    return count
+
+
+def clear_link_index():
+    global _link_index
+    _link_index = None
+    _synced_fingerprints.clear()
+
+
+def get_link_index():
+    """Get source armature name -> {(source bone, source constraint): [(target name, bone, constraint)]}"""
+    global _link_index, _link_index_objects
+    if _link_index is None or _link_index_objects != len(bpy.data.objects):
+        _link_index = {}
+        _link_index_objects = len(bpy.data.objects)
+        if not links_registered():
+            return _link_index
+        for obj in bpy.data.objects:
+            if obj.type != 'ARMATURE':
+                continue
+            for link in obj.batch_constraint_links:
+                # Dead links stay out; they are removed the next time the armature is edited
+                if link.source is None or _get_linked_constraint(obj, link) is None:
+                    continue
+                links = _link_index.setdefault(link.source.name_full, {})
+                links.setdefault((link.source_bone, link.source_constraint), []).append(
+                    (obj.name_full, link.bone, link.constraint, link.constraint_type))
+    return _link_index
+
+
+def get_linked_sources():
+    """Get the names of the armatures that have linked copies"""
+    return get_link_index().keys()
+
+
+def unlink(targets):
+    """Forget the links of the target armatures' constraints, return how many were removed"""
+    if not links_registered():
+        return 0
+    count = 0
+    for target in resolve_armatures(targets):
+        count += len(target.batch_constraint_links)
+        target.batch_constraint_links.clear()
+    clear_link_index()
+    return count
+
+
+def sync_links(source_names=None):
+    """Push changed properties of linked source constraints to their copies
+
+    Only source constraints whose fingerprint changed since the last sync are compared
+    with their copies, and only the properties that differ are written. Constraints
+    added to the source afterwards aren't linked; copy them with link=True. Returns a
+    BatchResult counting the updated copies per armature.
+    """
+    index = get_link_index()
+    if source_names is None:
+        source_names = list(index)
+    dead = set()
+    with BatchSession() as session:
+        for source_name in source_names:
+            links = index.get(source_name)
+            source = bpy.data.objects.get(source_name)
+            if not links or source is None:
+                continue
+            source_bones = source.pose.bones
+            for (bone_name, constraint_name), copies in links.items():
+                source_bone = source_bones.get(bone_name)
+                source_constraint = source_bone.constraints.get(constraint_name) if source_bone else None
+                if source_constraint is None:
+                    continue
+                key = (source_name, bone_name, constraint_name)
+                fingerprint = get_constraint_fingerprint(source_constraint, _SYNC_SCALE)
+                if _synced_fingerprints.get(key) == fingerprint:
+                    continue
+                for target_name, target_bone_name, target_constraint_name, constraint_type in copies:
+                    target = bpy.data.objects.get(target_name)
+                    target_bone = target.pose.bones.get(target_bone_name) if target is not None else None
+                    constraint = target_bone.constraints.get(target_constraint_name) if target_bone else None
+                    if constraint is None or (constraint_type and constraint.type != constraint_type):
+                        # The copy is gone or replaced by another constraint of the same name
+                        if target is not None:
+                            dead.add(target)
+                        continue
+                    if constraint.type != source_constraint.type:
+                        continue
+                    changed = get_changed_properties(
+                        constraint, fingerprint, get_constraint_fingerprint(constraint, _SYNC_SCALE))
+                    if changed:
+                        copy_constraint_properties(source_constraint, constraint, changed)
+                        session.record(target)
+                _synced_fingerprints[key] = fingerprint
+        prune_links(dead)
+    return _session_result('SYNC', session)
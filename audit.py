@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Constraint stack audit: which armatures share the same constraint setup
+
+Every bone stack is hashed from the constraint fingerprints the availability scan
+compares by (so the match tolerance applies), in stack order, with ID pointers to the
+audited armature itself made relative (core.get_relative_fingerprint), and every
+armature from the hashes of its bone stacks. Armatures with equal hashes form a
+cluster; the largest cluster is the reference and the armatures of the others are
+outliers, listed with the bones whose stack differs from the reference.
+That's one pass over the armatures instead of comparing every pair.
+
+Hashes are BLAKE2 digests of the fingerprints, so they are stable across sessions
+and can be compared between reports taken at the same tolerance.
+"""
+
+import hashlib
+import json
+
+from .core import counters, get_relative_fingerprint
+
+AUDIT_FORMAT = "batch_bone_constraints.audit"
+AUDIT_VERSION = 1
+
+def _digest(text):
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def get_stack_hashes(armature, scale):
+    """Get bone name -> stack hash of the bones of an armature that have constraints"""
+    hashes = {}
+    for bone in armature.pose.bones:
+        counters['bones_visited'] += 1
+        if bone.constraints:
+            hashes[bone.name] = _digest(repr(tuple(get_relative_fingerprint(constraint, scale, armature)
+                                                   for constraint in bone.constraints)))
+    return hashes
+
+
+def get_armature_hash(stack_hashes):
+    """Get the hash of a whole armature from its stack hashes, independent of bone order"""
+    return _digest(repr(sorted(stack_hashes.items())))
+
+
+class AuditCluster:
+    """Armatures sharing one constraint setup, and the bones where it differs from the reference"""
+    __slots__ = ('hash', 'armatures', 'stacks', 'differing_bones')
+
+    def __init__(self, hash, stacks):
+        self.hash = hash
+        self.armatures = []
+        # Bone name -> stack hash, the same for every armature of the cluster
+        self.stacks = stacks
+        self.differing_bones = ()
+
+    def as_dict(self):
+        return {
+            "hash": self.hash,
+            "armatures": self.armatures,
+            "differing_bones": list(self.differing_bones),
+        }
+
+
+class AuditReport:
+    """Clusters of identical armatures, largest first; the first one is the reference"""
+
+    def __init__(self, clusters, scale):
+        self.clusters = clusters
+        self.scale = scale
+
+    @property
+    def reference(self):
+        return self.clusters[0] if self.clusters else None
+
+    @property
+    def outliers(self):
+        return self.clusters[1:]
+
+    @property
+    def armature_count(self):
+        return sum(len(cluster.armatures) for cluster in self.clusters)
+
+    def as_dict(self):
+        return {
+            "format": AUDIT_FORMAT,
+            "version": AUDIT_VERSION,
+            "tolerance": 1.0 / self.scale,
+            "armature_count": self.armature_count,
+            "clusters": [cluster.as_dict() for cluster in self.clusters],
+        }
+
+    def write_json(self, filepath):
+        with open(filepath, "w", encoding="utf-8") as file:
+            json.dump(self.as_dict(), file, indent=1)
+
+
+def audit_armatures(armatures, scale):
+    """Group armatures by constraint setup, return an AuditReport
+
+    Clusters are ordered by size, ties by the name of their first armature, so the
+    most common setup is the reference. Bones listed as differing for an outlier
+    cluster have another stack, or a stack only on one side.
+    """
+    clusters = {}
+    for armature in armatures:
+        stacks = get_stack_hashes(armature, scale)
+        armature_hash = get_armature_hash(stacks)
+        cluster = clusters.get(armature_hash)
+        if cluster is None:
+            cluster = clusters[armature_hash] = AuditCluster(armature_hash, stacks)
+        cluster.armatures.append(armature.name)
+
+    ordered = sorted(clusters.values(), key=lambda cluster: (-len(cluster.armatures), cluster.armatures[0]))
+    if ordered:
+        reference = ordered[0].stacks
+        for cluster in ordered[1:]:
+            cluster.differing_bones = tuple(sorted(
+                name for name in cluster.stacks.keys() | reference.keys()
+                if cluster.stacks.get(name) != reference.get(name)))
+    return AuditReport(ordered, scale)
@@ -0,0 +1,296 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Apply batch constraint operations to many .blend files with a pool of headless Blenders
+
+Run from a shell (plain Python, Blender not needed to start it):
+
+    python batch_runner.py manifest.json --blender /path/to/blender --workers 8 --summary summary.json
+
+The manifest is JSON:
+
+    {
+        "files": ["shots/*/characters.blend", "extra/hero.blend"],
+        "output_dir": "processed",
+        "operations": [
+            {"mode": "copy", "source": "RIG-template", "source_file": "template.blend",
+             "targets": "CHR-*", "constraint_type": "ALL"},
+            {"mode": "delete", "targets": "CHR-*", "constraint_type": "IK"},
+            {"mode": "apply_preset", "preset": "presets/face.json.gz", "targets": "CHR-*"}
+        ]
+    }
+
+Paths are relative to the manifest. "targets" is an fnmatch pattern on armature object
+names. "source_file" appends the source armature from another file for the duration of
+the job; without it the source must exist in each processed file. "apply_preset" reads a
+preset file written by the Export Preset operator instead of a source armature. Files are saved in place
+unless "output_dir" is given, where each file keeps its path relative to the manifest
+(shots/a/characters.blend -> processed/shots/a/characters.blend). "blender" and "workers" may also be set in the manifest.
+
+Each file is processed by its own `blender --background` process; this same script runs
+inside it as the worker. A JSON summary with per-file timings and failures is written to
+--summary (and printed), and the exit code is non-zero if any file failed.
+"""
+
+import argparse
+import concurrent.futures
+import fnmatch
+import glob
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+ADDON_DIR = pathlib.Path(__file__).resolve().parent
+
+# Mode -> (API function name, whether it takes a source)
+OPERATIONS = {
+    'imitate': ('imitate', True),
+    'remove_imitate': ('remove_imitate', True),
+    'copy': ('copy', True),
+    'remove_copy': ('remove_copy', True),
+    'new': ('new', False),
+    'delete': ('delete', False),
+    'apply_preset': ('apply_preset', False),
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner (plain Python)
+
+def load_manifest(path):
+    manifest = json.loads(path.read_text())
+    base = path.parent
+    files = []
+    for pattern in manifest.get("files", []):
+        matches = sorted(glob.glob(str(base / pattern), recursive=True))
+        if not matches:
+            raise FileNotFoundError(f"No .blend files match '{pattern}'")
+        files.extend(pathlib.Path(match).resolve() for match in matches)
+
+    operations = []
+    for operation in manifest.get("operations", []):
+        if operation.get("mode") not in OPERATIONS:
+            raise ValueError(f"Unknown operation mode: {operation.get('mode')!r}")
+        operation = dict(operation)
+        if "source_file" in operation:
+            operation["source_file"] = str((base / operation["source_file"]).resolve())
+        if "preset" in operation:
+            operation["preset"] = str((base / operation["preset"]).resolve())
+        operations.append(operation)
+
+    # Never process a template file the operations read from
+    templates = {operation["source_file"] for operation in operations if "source_file" in operation}
+    files = [blend_file for blend_file in dict.fromkeys(files) if str(blend_file) not in templates]
+
+    output_dir = manifest.get("output_dir")
+    if output_dir:
+        outputs = get_output_paths(files, base.resolve(), (base / output_dir).resolve())
+    else:
+        outputs = files
+    return manifest, list(zip(files, outputs)), operations
+
+
+def get_output_paths(files, base, output_dir):
+    """Get the output path of every file: its path relative to base, under output_dir
+
+    Files outside base are placed relative to the deepest folder all files share.
+    Raises ValueError when two files would be written to the same path.
+    """
+    if not all(blend_file.is_relative_to(base) for blend_file in files):
+        base = pathlib.Path(os.path.commonpath([blend_file.parent for blend_file in files]))
+    outputs = [output_dir / blend_file.relative_to(base) for blend_file in files]
+    seen = {}
+    for blend_file, output in zip(files, outputs):
+        if output in seen:
+            raise ValueError(f"{blend_file} and {seen[output]} would both be written to {output}")
+        if output == blend_file:
+            raise ValueError(f"output_dir would overwrite {blend_file} in place")
+        seen[output] = blend_file
+    return outputs
+
+
+def run_file(blender, blend_file, operations, output_path, timeout):
+    """Process one .blend file in a headless Blender, return its summary entry"""
+    start = time.perf_counter()
+    entry = {"file": str(blend_file), "output": str(output_path), "status": 'FAILED'}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        job_path = pathlib.Path(temp_dir) / "job.json"
+        result_path = pathlib.Path(temp_dir) / "result.json"
+        job_path.write_text(json.dumps({
+            "operations": operations,
+            "output": str(output_path),
+            "result": str(result_path),
+        }))
+        command = [
+            blender, "--background", "--factory-startup", "--python-exit-code", "1",
+            str(blend_file), "--python", str(pathlib.Path(__file__).resolve()),
+            "--", "--worker", str(job_path),
+        ]
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            entry["error"] = f"Timed out after {timeout} s"
+        else:
+            if result_path.exists():
+                entry.update(json.loads(result_path.read_text()))
+            if process.returncode != 0 or entry["status"] != 'OK':
+                entry["status"] = 'FAILED'
+                output = (process.stderr or process.stdout).strip()
+                entry.setdefault("error", output[-2000:] or f"Exit code {process.returncode}")
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+def run(args):
+    manifest_path = pathlib.Path(args.manifest).resolve()
+    manifest, jobs, operations = load_manifest(manifest_path)
+    blender = args.blender or manifest.get("blender") or "blender"
+    workers = args.workers or manifest.get("workers") or os.cpu_count() or 1
+
+    for _blend_file, output in jobs:
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    entries = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_file, blender, blend_file, operations, output, args.timeout)
+                   for blend_file, output in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            entry = future.result()
+            entries.append(entry)
+            print(f"[{len(entries)}/{len(jobs)}] {entry['status']:<6} {entry['seconds']:8.2f} s  {entry['file']}")
+
+    entries.sort(key=lambda entry: entry["file"])
+    failed = [entry for entry in entries if entry["status"] != 'OK']
+    summary = {
+        "manifest": str(manifest_path),
+        "workers": workers,
+        "total_seconds": time.perf_counter() - start,
+        "file_count": len(entries),
+        "failed_count": len(failed),
+        "files": entries,
+    }
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        pathlib.Path(args.summary).write_text(text)
+    else:
+        print(text)
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------------------------
+# Worker (inside Blender)
+
+def load_api():
+    """Import the add-on's scripting API from this source tree"""
+    import importlib.util
+
+    name = "batch_bone_constraints"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, ADDON_DIR / "__init__.py", submodule_search_locations=[str(ADDON_DIR)])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name].api
+
+
+def append_object(filepath, name):
+    """Append an object from another .blend file"""
+    import bpy
+
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        if name not in data_from.objects:
+            raise KeyError(f"No object named '{name}' in {filepath}")
+        data_to.objects = [name]
+    return data_to.objects[0]
+
+
+def run_operation(api, operation):
+    import bpy
+
+    function_name, takes_source = OPERATIONS[operation["mode"]]
+    function = getattr(api, function_name)
+    pattern = operation.get("targets", "*")
+    appended = None
+    try:
+        if takes_source:
+            if "source_file" in operation:
+                source = appended = append_object(operation["source_file"], operation["source"])
+            else:
+                source = api.resolve_object(operation["source"])
+            targets = [obj for obj in bpy.data.objects
+                       if obj.type == 'ARMATURE' and obj != source and fnmatch.fnmatchcase(obj.name, pattern)]
+            result = function(source, targets, operation.get("constraint_type", 'ALL'))
+        else:
+            targets = [obj for obj in bpy.data.objects
+                       if obj.type == 'ARMATURE' and fnmatch.fnmatchcase(obj.name, pattern)]
+            if operation["mode"] == 'apply_preset':
+                result = function(operation["preset"], targets, operation.get("replace", False))
+            else:
+                result = function(targets, operation.get("constraint_type", 'ALL'))
+    finally:
+        if appended is not None:
+            data = appended.data
+            bpy.data.objects.remove(appended)
+            if data is not None and data.users == 0:
+                bpy.data.armatures.remove(data)
+    summary = {"mode": operation["mode"], "total": result.total, "counts": result.counts}
+    if result.missing:
+        summary["missing"] = result.missing
+    if result.unset:
+        summary["unset"] = result.unset
+    if result.updates_avoided:
+        summary["updates_avoided"] = result.updates_avoided
+    return summary
+
+
+def work(job_path):
+    import bpy
+
+    job = json.loads(pathlib.Path(job_path).read_text())
+    result = {"status": 'FAILED', "operations": []}
+    start = time.perf_counter()
+    try:
+        api = load_api()
+        for operation in job["operations"]:
+            result["operations"].append(run_operation(api, operation))
+        bpy.ops.wm.save_as_mainfile(filepath=job["output"])
+        result["status"] = 'OK'
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        result["worker_seconds"] = time.perf_counter() - start
+        pathlib.Path(job["result"]).write_text(json.dumps(result))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("manifest", nargs="?", help="JSON manifest of files and operations")
+    parser.add_argument("--blender", help="Blender executable (default: manifest 'blender' or 'blender' on PATH)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel Blender processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds allowed per file")
+    parser.add_argument("--summary", help="Write the JSON summary to this file")
+    parser.add_argument("--worker", metavar="JOB", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if not args.worker and not args.manifest:
+        parser.error("the manifest argument is required")
+    return args
+
+
+def main():
+    # Inside Blender the script's own arguments follow "--"
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    args = parse_args(argv)
+    if args.worker:
+        work(args.worker)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Lightweight in-process stand-in for the bpy data the core logic touches
+
+Mimics just enough of armature objects, pose bones (with bone selection), bone
+collections, constraints, vertex groups, bpy_prop_collection and RNA introspection (bl_rna.properties) for core.py to run
+in plain CPython, so matching logic can be benchmarked without launching Blender.
+
+The module-level data, context, types and path mimic the parts of the bpy module
+api.py reads, so the tests can also run the scripting API on these objects, as an
+unregistered add-on like the headless batch runner does.
+"""
+
+import os
+from types import SimpleNamespace
+
+
+class RNAProperty:
+    """Stand-in for bpy.types.Property"""
+
+    def __init__(self, identifier, type, array_length=0, is_readonly=False,
+                 is_enum_flag=False, fixed_type=None, default=None):
+        self.identifier = identifier
+        self.type = type
+        self.array_length = array_length
+        self.is_readonly = is_readonly
+        self.is_enum_flag = is_enum_flag
+        self.fixed_type = fixed_type
+        self.default = default
+
+
+class RNAStruct:
+    """Stand-in for bpy.types.Struct"""
+
+    def __init__(self, identifier, properties=(), base=None):
+        self.identifier = identifier
+        self.properties = list(properties)
+        self.base = base
+
+
+ID_RNA = RNAStruct("ID")
+OBJECT_RNA = RNAStruct("Object", base=ID_RNA)
+ACTION_RNA = RNAStruct("Action", base=ID_RNA)
+
+
+class Collection:
+    """Stand-in for bpy_prop_collection: iterable, indexable by position or name"""
+
+    def __init__(self, items=()):
+        self._items = list(items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return self._items[key]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def get(self, name, default=None):
+        for item in self._items:
+            if item.name == name:
+                return item
+        return default
+
+    def keys(self):
+        return [item.name for item in self._items]
+
+    def foreach_get(self, attr, seq):
+        for index, item in enumerate(self._items):
+            seq[index] = getattr(item, attr)
+
+    def foreach_set(self, attr, seq):
+        # Like Blender, writes the values without per-item updates
+        for item, value in zip(self._items, seq):
+            object.__setattr__(item, attr, type(getattr(item, attr))(value))
+
+
+class Struct:
+    """Stand-in for bpy_struct: attributes initialized from RNA defaults, readonly ones enforced"""
+
+    def __init__(self, bl_rna, **values):
+        object.__setattr__(self, "bl_rna", bl_rna)
+        object.__setattr__(self, "rna_type", bl_rna)
+        for prop in bl_rna.properties:
+            if prop.identifier == "rna_type":
+                continue
+            object.__setattr__(self, prop.identifier, _default_value(prop))
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        if key == 'target_space' and value in ARMATURE_TARGET_SPACES:
+            target = getattr(self, "target", None)
+            if target is None or target.type != 'ARMATURE':
+                raise TypeError(f"bpy_struct: item.attr = val: enum \"{value}\" not found in ('WORLD', 'CUSTOM', 'LOCAL')")
+        for prop in self.bl_rna.properties:
+            if prop.identifier == key:
+                if prop.is_readonly:
+                    raise AttributeError(f"bpy_struct: attribute \"{key}\" is read-only")
+                if prop.type == 'COLLECTION':
+                    raise AttributeError(f"bpy_prop_collection: attribute \"{key}\" is read-only")
+                break
+        object.__setattr__(self, key, value)
+
+
+# Target spaces only available with an armature target
+ARMATURE_TARGET_SPACES = {'POSE', 'LOCAL_WITH_PARENT', 'LOCAL_OWNER_ORIENT'}
+
+
+def _default_value(prop):
+    if prop.type == 'COLLECTION':
+        return TargetCollection()
+    if prop.default is not None:
+        return prop.default
+    if prop.type == 'POINTER':
+        return None
+    if prop.type == 'STRING':
+        return ""
+    if prop.type == 'ENUM':
+        return set() if prop.is_enum_flag else 'NONE'
+    scalar = {'FLOAT': 0.0, 'INT': 0, 'BOOLEAN': False}[prop.type]
+    if prop.array_length:
+        return tuple([scalar] * prop.array_length)
+    return scalar
+
+
+def _prop(identifier, type, **kwargs):
+    return RNAProperty(identifier, type, **kwargs)
+
+
+def _floats(*identifiers):
+    return [_prop(identifier, 'FLOAT') for identifier in identifiers]
+
+
+def _bools(*identifiers):
+    return [_prop(identifier, 'BOOLEAN') for identifier in identifiers]
+
+
+def _axes(template):
+    return [template.format(axis) for axis in "xyz"]
+
+
+ARMATURE_TARGET_RNA = RNAStruct("ConstraintTargetBone", [
+    _prop("rna_type", 'POINTER', is_readonly=True),
+    _prop("target", 'POINTER', fixed_type=OBJECT_RNA),
+    _prop("subtarget", 'STRING'),
+    _prop("weight", 'FLOAT'),
+])
+
+
+class TargetCollection(Collection):
+    """Stand-in for ArmatureConstraintTargets"""
+
+    def new(self):
+        item = Struct(ARMATURE_TARGET_RNA)
+        self._items.append(item)
+        return item
+
+    def remove(self, item):
+        self._items.remove(item)
+
+
+COMMON_PROPERTIES = [
+    _prop("rna_type", 'POINTER', is_readonly=True),
+    _prop("name", 'STRING'),
+    _prop("type", 'ENUM', is_readonly=True),
+    _prop("is_valid", 'BOOLEAN', is_readonly=True, default=True),
+    _prop("mute", 'BOOLEAN'),
+    _prop("enabled", 'BOOLEAN', default=True),
+    _prop("show_expanded", 'BOOLEAN', default=True),
+    _prop("active", 'BOOLEAN'),
+    _prop("is_override_data_local", 'BOOLEAN', is_readonly=True),
+    _prop("owner_space", 'ENUM', default='WORLD'),
+    _prop("target_space", 'ENUM', default='WORLD'),
+    _prop("space_object", 'POINTER', fixed_type=OBJECT_RNA),
+    _prop("space_subtarget", 'STRING'),
+    _prop("influence", 'FLOAT', default=1.0),
+    _prop("error_location", 'FLOAT', is_readonly=True),
+    _prop("error_rotation", 'FLOAT', is_readonly=True),
+]
+
+TARGET_PROPERTIES = [
+    _prop("target", 'POINTER', fixed_type=OBJECT_RNA),
+    _prop("subtarget", 'STRING'),
+    _prop("head_tail", 'FLOAT'),
+    _prop("use_bbone_shape", 'BOOLEAN'),
+]
+
+LIMIT_PROPERTIES = (
+    _floats(*_axes("min_{}"), *_axes("max_{}"))
+    + _bools(*_axes("use_min_{}"), *_axes("use_max_{}"), "use_transform_limit", "use_legacy_behavior")
+)
+
+# Per-type properties on top of COMMON_PROPERTIES; True marks types with a target
+TYPE_PROPERTIES = {
+    'COPY_LOCATION': (True, _bools(*_axes("use_{}"), *_axes("invert_{}"), "use_offset")),
+    'COPY_ROTATION': (True, _bools(*_axes("use_{}"), *_axes("invert_{}"))
+                      + [_prop("mix_mode", 'ENUM', default='REPLACE'), _prop("euler_order", 'ENUM', default='AUTO')]),
+    'COPY_SCALE': (True, _bools(*_axes("use_{}"), "use_offset", "use_add", "use_make_uniform")
+                   + _floats("power")),
+    'COPY_TRANSFORMS': (True, [_prop("mix_mode", 'ENUM', default='REPLACE'), _prop("remove_target_shear", 'BOOLEAN')]),
+    'LIMIT_DISTANCE': (True, _floats("distance") + [_prop("limit_mode", 'ENUM', default='LIMITDIST_INSIDE')]),
+    'LIMIT_LOCATION': (False, LIMIT_PROPERTIES),
+    'LIMIT_ROTATION': (False, LIMIT_PROPERTIES + [_prop("euler_order", 'ENUM', default='AUTO')]),
+    'LIMIT_SCALE': (False, LIMIT_PROPERTIES),
+    'MAINTAIN_VOLUME': (False, _floats("volume") + [_prop("free_axis", 'ENUM', default='SAMEVOL_Y'),
+                                                    _prop("mode", 'ENUM', default='STRICT')]),
+    'TRANSFORMATION': (True, _floats(*_axes("from_min_{}"), *_axes("from_max_{}"), *_axes("to_min_{}"), *_axes("to_max_{}"))
+                       + [_prop("map_from", 'ENUM', default='LOCATION'), _prop("map_to", 'ENUM', default='LOCATION')]),
+    'TRANSFORM_CACHE': (False, [_prop("object_path", 'STRING')]),
+    'CLAMP_TO': (True, [_prop("main_axis", 'ENUM', default='CLAMPTO_AUTO'), _prop("use_cyclic", 'BOOLEAN')]),
+    'DAMPED_TRACK': (True, [_prop("track_axis", 'ENUM', default='TRACK_Y')]),
+    'IK': (True, [_prop("pole_target", 'POINTER', fixed_type=OBJECT_RNA), _prop("pole_subtarget", 'STRING'),
+                  _prop("chain_count", 'INT'), _prop("iterations", 'INT', default=500)]
+           + _floats("pole_angle", "weight") + _bools("use_tail", "use_stretch", "use_rotation")),
+    'LOCKED_TRACK': (True, [_prop("track_axis", 'ENUM', default='TRACK_Y'), _prop("lock_axis", 'ENUM', default='LOCK_Z')]),
+    'SPLINE_IK': (True, [_prop("chain_count", 'INT'), _prop("joint_bindings", 'FLOAT', array_length=2)]),
+    'STRETCH_TO': (True, _floats("rest_length", "bulge") + [_prop("volume", 'ENUM', default='VOLUME_XZX'),
+                                                            _prop("keep_axis", 'ENUM', default='PLANE_X')]),
+    'TRACK_TO': (True, [_prop("track_axis", 'ENUM', default='TRACK_NEGATIVE_Z'), _prop("up_axis", 'ENUM', default='UP_Y')]),
+    'ACTION': (True, [_prop("action", 'POINTER', fixed_type=ACTION_RNA), _prop("frame_start", 'INT'),
+                      _prop("frame_end", 'INT', default=1)] + _floats("min", "max")),
+    'ARMATURE': (False, [_prop("targets", 'COLLECTION', is_readonly=True, fixed_type=ARMATURE_TARGET_RNA)]
+                 + _bools("use_deform_preserve_volume", "use_bone_envelopes", "use_current_location")),
+    'CHILD_OF': (True, [_prop("inverse_matrix", 'FLOAT', array_length=16,
+                              default=((1.0, 0.0, 0.0, 0.0), (0.0, 1.0, 0.0, 0.0),
+                                       (0.0, 0.0, 1.0, 0.0), (0.0, 0.0, 0.0, 1.0)))]
+                 + _bools(*_axes("use_location_{}"), *_axes("use_rotation_{}"), *_axes("use_scale_{}"))),
+    'FLOOR': (True, _floats("offset") + [_prop("floor_location", 'ENUM', default='FLOOR_Z')]),
+    'FOLLOW_PATH': (True, _floats("offset") + [_prop("forward_axis", 'ENUM', default='FORWARD_Y')]),
+    'PIVOT': (True, [_prop("offset", 'FLOAT', array_length=3), _prop("rotation_range", 'ENUM', default='ALWAYS_ACTIVE')]),
+    'SHRINKWRAP': (True, _floats("distance") + [_prop("shrinkwrap_type", 'ENUM', default='NEAREST_SURFACE')]),
+    'CAMERA_SOLVER': (False, [_prop("use_active_clip", 'BOOLEAN', default=True)]),
+    'FOLLOW_TRACK': (False, [_prop("track", 'STRING'), _prop("use_active_clip", 'BOOLEAN', default=True)]),
+    'OBJECT_SOLVER': (False, [_prop("object", 'STRING'), _prop("use_active_clip", 'BOOLEAN', default=True)]),
+}
+
+
+def _constraint_rna(constraint_type):
+    targeted, properties = TYPE_PROPERTIES[constraint_type]
+    identifier = constraint_type.title().replace("_", "") + "Constraint"
+    return RNAStruct(identifier, COMMON_PROPERTIES + (TARGET_PROPERTIES if targeted else []) + properties,
+                     base=RNAStruct("Constraint"))
+
+
+CONSTRAINT_RNA = {constraint_type: _constraint_rna(constraint_type) for constraint_type in TYPE_PROPERTIES}
+
+
+class Constraint(Struct):
+    def __init__(self, constraint_type, name):
+        super().__init__(CONSTRAINT_RNA[constraint_type], type=constraint_type, name=name)
+
+
+class ConstraintCollection(Collection):
+    """Stand-in for PoseBoneConstraints"""
+
+    def new(self, type):
+        base = type.replace("_", " ").title()
+        name = base
+        index = 0
+        while name in self:
+            index += 1
+            name = f"{base}.{index:03d}"
+        constraint = Constraint(type, name)
+        self._items.append(constraint)
+        return constraint
+
+    def remove(self, constraint):
+        self._items.remove(constraint)
+
+
+class Bone:
+    def __init__(self, name):
+        self.name = name
+        self.select = False
+
+
+class PoseBone:
+    def __init__(self, name):
+        self.name = name
+        self.bone = Bone(name)
+        self.constraints = ConstraintCollection()
+
+
+class Pose:
+    def __init__(self, bone_names):
+        self.bones = Collection(PoseBone(name) for name in bone_names)
+
+
+class BoneCollection:
+    def __init__(self, name):
+        self.name = name
+        self.bones = []
+
+    def assign(self, bone):
+        """Assign a pose bone (or bone) to the collection"""
+        bone = getattr(bone, "bone", bone)
+        if bone not in self.bones:
+            self.bones.append(bone)
+
+
+class BoneCollections(Collection):
+    """Stand-in for BoneCollections, flat: collections_all lists the same collections"""
+
+    def new(self, name):
+        collection = BoneCollection(name)
+        self._items.append(collection)
+        return collection
+
+
+class Armature:
+    def __init__(self, name):
+        self.name = name
+        self.collections = BoneCollections()
+
+    @property
+    def collections_all(self):
+        return self.collections
+
+
+class VertexGroup:
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+
+class ID:
+    """Stand-in for bpy.types.ID"""
+
+
+class Object(ID):
+    """Stand-in for an armature or mesh object"""
+
+    def __init__(self, name, type='ARMATURE', bone_names=(), vertex_group_names=()):
+        self.name = name
+        self.name_full = name
+        self.type = type
+        self.bl_rna = OBJECT_RNA
+        self.pose = Pose(bone_names) if type == 'ARMATURE' else None
+        self.data = Armature(name) if type == 'ARMATURE' else None
+        self.vertex_groups = Collection(VertexGroup(name, index) for index, name in enumerate(vertex_group_names))
+        # Number of update_tag() calls, to check batching
+        self.update_count = 0
+
+    @property
+    def original(self):
+        return self
+
+    def update_tag(self, refresh=None):
+        self.update_count += 1
+
+    def __repr__(self):
+        return f"<fake Object {self.name!r}>"
+
+
+class Context:
+    """Stand-in for the parts of bpy.context the operators read"""
+
+    def __init__(self, active_object=None, selected_objects=()):
+        self.active_object = active_object
+        self.selected_objects = list(selected_objects)
+
+
+class BlendData:
+    """Stand-in for bpy.data: objects (and actions) looked up by name"""
+
+    def __init__(self, objects=()):
+        self.objects = Collection(objects)
+        self.actions = Collection()
+
+
+# Module-level stand-ins for bpy.data, bpy.context, bpy.types and bpy.path
+data = BlendData()
+context = SimpleNamespace(preferences=SimpleNamespace(addons={}), scene=SimpleNamespace())
+types = SimpleNamespace(ID=ID, Object=Object)
+path = SimpleNamespace(abspath=os.fspath)
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks of the core matching logic in plain CPython
+
+Run with:
+
+    python benchmarks/micro_core.py --armatures 50 --bones 300 --constraints 4 --output micro.json
+
+Uses the fake_bpy stand-in instead of Blender, so a full run takes seconds.
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+BENCHMARK_DIR = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR))
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+
+import core  # noqa: E402
+import fake_bpy  # noqa: E402
+
+# Same type mix as the Blender suite's rig generator
+MIXED_CONSTRAINTS = (
+    'COPY_ROTATION', 'LIMIT_ROTATION', 'DAMPED_TRACK', 'COPY_LOCATION', 'STRETCH_TO',
+    'TRANSFORMATION', 'LIMIT_SCALE', 'CHILD_OF', 'ARMATURE', 'COPY_SCALE',
+)
+
+
+def add_constraints(obj, per_bone, target=None):
+    """Add per_bone constraints of mixed types to every bone, targeting target (or obj)"""
+    target = target or obj
+    names = [bone.name for bone in obj.pose.bones]
+    for bone_index, bone in enumerate(obj.pose.bones):
+        for index in range(per_bone):
+            constraint_type = MIXED_CONSTRAINTS[(bone_index + index) % len(MIXED_CONSTRAINTS)]
+            constraint = bone.constraints.new(type=constraint_type)
+            constraint.influence = 0.5 + 0.05 * (index % 10)
+            if constraint_type == 'ARMATURE':
+                item = constraint.targets.new()
+                item.target = target
+                item.subtarget = names[(bone_index + 1) % len(names)]
+            elif hasattr(constraint, "target"):
+                constraint.target = target
+                constraint.subtarget = names[(bone_index + 1) % len(names)]
+
+
+def build_scene(armatures, bones, constraints):
+    """Source armature with full stacks, targets carrying the first half of them"""
+    bone_names = [f"bone_{index:04d}" for index in range(bones)]
+    source = fake_bpy.Object("Source", bone_names=bone_names)
+    add_constraints(source, constraints)
+    targets = []
+    for index in range(max(armatures - 1, 1)):
+        target = fake_bpy.Object(f"Target_{index:04d}", bone_names=bone_names)
+        add_constraints(target, max(constraints // 2, 1), target=source)
+        targets.append(target)
+    return source, targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--armatures", type=int, default=20)
+    parser.add_argument("--bones", type=int, default=100)
+    parser.add_argument("--constraints", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    source, targets = build_scene(args.armatures, args.bones, args.constraints)
+    selected = [source] + targets
+    scale = 1.0 / core.DEFAULT_MATCH_TOLERANCE
+    some_constraint = next(iter(source.pose.bones[0].constraints))
+
+    benchmarks = {
+        "fingerprint": lambda: core.get_constraint_fingerprint(some_constraint, scale),
+        "index_armature": lambda: core.index_armature_constraints(source, scale),
+        "plan_copy": lambda: core.plan_copy(source, targets, 'ALL', scale),
+    }
+    for mode in ('IMITATE', 'REMOVE_IMITATE', 'COPY', 'REMOVE_COPY', 'DELETE'):
+        benchmarks[f"available.{mode}"] = (
+            lambda mode=mode: core.available_constraint_types(source, selected, mode, scale))
+
+    results = []
+    for name, function in benchmarks.items():
+        number, _ = timeit.Timer(function).autorange()
+        times = [elapsed / number for elapsed in timeit.Timer(function).repeat(args.repeat, number)]
+        results.append({"name": name, "times": times, "min": min(times), "median": statistics.median(times)})
+        print(f"{name:<24} min {min(times) * 1e6:12.1f} us")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "python_version": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "parameters": vars(args) | {"output": str(args.output)},
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Synthetic rig generator for the benchmark suite (runs inside Blender)"""
+
+import bpy
+
+# Constraint types cycled through when populating bones
+MIXED_CONSTRAINTS = (
+    'COPY_ROTATION',
+    'LIMIT_ROTATION',
+    'DAMPED_TRACK',
+    'COPY_LOCATION',
+    'STRETCH_TO',
+    'TRANSFORMATION',
+    'LIMIT_SCALE',
+    'CHILD_OF',
+    'ARMATURE',
+    'COPY_SCALE',
+)
+
+# Types without a target property
+UNTARGETED_CONSTRAINTS = {'LIMIT_DISTANCE', 'LIMIT_LOCATION', 'LIMIT_ROTATION', 'LIMIT_SCALE', 'MAINTAIN_VOLUME'}
+
+
+def bone_names(count):
+    return [f"bone_{index:04d}" for index in range(count)]
+
+
+def clear_scene():
+    """Remove every object and the data generated for it"""
+    ids = list(bpy.data.objects) + list(bpy.data.armatures) + list(bpy.data.meshes)
+    if ids:
+        bpy.data.batch_remove(ids)
+
+
+def make_armature(name, bone_count):
+    """Create an armature object with a chain of bone_count bones linked to the scene"""
+    data = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, data)
+    bpy.context.scene.collection.objects.link(obj)
+
+    view_layer = bpy.context.view_layer
+    view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    for index, bone_name in enumerate(bone_names(bone_count)):
+        bone = data.edit_bones.new(bone_name)
+        bone.head = (0.0, 0.0, index * 0.1)
+        bone.tail = (0.0, 0.0, index * 0.1 + 0.1)
+        bone.parent = parent
+        parent = bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+
+def duplicate_armature(obj, name):
+    """Copy an armature object, sharing bone layout but with its own pose and constraints"""
+    copy = obj.copy()
+    copy.data = obj.data.copy()
+    copy.name = name
+    bpy.context.scene.collection.objects.link(copy)
+    return copy
+
+
+def add_constraints(obj, per_bone, target=None, offset=0):
+    """Add per_bone constraints of mixed types to every bone, targeting target (or obj)"""
+    target = target or obj
+    names = [bone.name for bone in obj.pose.bones]
+    for bone_index, bone in enumerate(obj.pose.bones):
+        for index in range(per_bone):
+            constraint_type = MIXED_CONSTRAINTS[(bone_index + index + offset) % len(MIXED_CONSTRAINTS)]
+            constraint = bone.constraints.new(type=constraint_type)
+            constraint.influence = 0.5 + 0.05 * (index % 10)
+            if constraint_type == 'ARMATURE':
+                item = constraint.targets.new()
+                item.target = target
+                item.subtarget = names[(bone_index + 1) % len(names)]
+            elif constraint_type not in UNTARGETED_CONSTRAINTS:
+                constraint.target = target
+                constraint.subtarget = names[(bone_index + 1) % len(names)]
+
+
+def make_mesh_source(name, bone_count, verts_per_group=32):
+    """Create a mesh with one weighted vertex group per bone name"""
+    names = bone_names(bone_count)
+    vertices = [(group * 0.1, vert * 0.01, 0.0)
+                for group in range(bone_count) for vert in range(verts_per_group)]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], [])
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    for group, group_name in enumerate(names):
+        vertex_group = obj.vertex_groups.new(name=group_name)
+        start = group * verts_per_group
+        vertex_group.add(list(range(start, start + verts_per_group)), 1.0, 'REPLACE')
+    return obj
+
+
+def build_scene(armatures, bones, constraints, mesh_source=False, populate_targets=False):
+    """Generate a synthetic scene
+
+    Returns (source, targets, mesh): a source armature carrying constraints on every bone,
+    armatures - 1 target armatures with the same bone names, and optionally a mesh with
+    matching vertex groups. With populate_targets, targets already carry the first half
+    of the source constraint stack.
+    """
+    clear_scene()
+    source = make_armature("Source", bones)
+    add_constraints(source, constraints)
+
+    template = make_armature("Target_0000", bones)
+    targets = [template]
+    for index in range(1, max(armatures - 1, 1)):
+        targets.append(duplicate_armature(template, f"Target_{index:04d}"))
+    if populate_targets:
+        for target in targets:
+            add_constraints(target, max(constraints // 2, 1), target=source)
+
+    mesh = make_mesh_source("MeshSource", bones) if mesh_source else None
+    return source, targets, mesh
+
+
+def select(active, others):
+    """Make active the active object and select it together with others"""
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in others:
+        obj.select_set(True)
+    if active is not None:
+        active.select_set(True)
+    view_layer.objects.active = active
@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Headless benchmark suite for Batch Bone Constraints
+
+Run with:
+
+    blender --background --factory-startup --python benchmarks/run_benchmarks.py -- \\
+        --armatures 50 --bones 300 --constraints 4 --output bench.json
+
+Every operator and every menu availability computation is timed on freshly generated
+synthetic scenes and the results are written as JSON. Pass --baseline with an earlier
+result file to compare against it; the exit code is non-zero if any benchmark is slower
+than the baseline by more than --max-regression.
+"""
+
+import argparse
+import importlib.util
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+
+import bpy
+
+BENCHMARK_DIR = pathlib.Path(__file__).resolve().parent
+ADDON_DIR = BENCHMARK_DIR.parent
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+import rig_generator  # noqa: E402
+
+
+def load_addon():
+    """Import and register the add-on from this source tree"""
+    spec = importlib.util.spec_from_file_location(
+        "batch_bone_constraints", ADDON_DIR / "__init__.py",
+        submodule_search_locations=[str(ADDON_DIR)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    module.register()
+    return module
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--armatures", type=int, default=20, help="Armatures per scene, including the source")
+    parser.add_argument("--bones", type=int, default=100, help="Bones per armature")
+    parser.add_argument("--constraints", type=int, default=4, help="Constraints per source bone")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="*", default=None, help="Run only benchmarks with these names")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Write JSON results to this file")
+    parser.add_argument("--baseline", type=pathlib.Path, default=None, help="JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+class Benchmark:
+    """A named measurement: setup builds the scene (untimed), run is timed"""
+
+    def __init__(self, name, kind, setup, run):
+        self.name = name
+        self.kind = kind
+        self.setup = setup
+        self.run = run
+
+
+def operator_benchmarks(addon, args):
+    def scene(**kwargs):
+        return rig_generator.build_scene(args.armatures, args.bones, args.constraints, **kwargs)
+
+    def setup_imitate():
+        source, targets, _mesh = scene()
+        rig_generator.select(source, targets)
+
+    def setup_imitate_mesh():
+        _source, targets, mesh = scene(mesh_source=True)
+        rig_generator.select(mesh, targets)
+
+    def setup_remove_imitate():
+        setup_imitate()
+        bpy.ops.anim.batch_imitate(constraint_type='COPY_ROTATION')
+        bpy.ops.anim.batch_imitate(constraint_type='COPY_LOCATION')
+
+    def setup_copy():
+        source, targets, _mesh = scene(populate_targets=True)
+        rig_generator.select(source, targets)
+
+    def setup_remove_copy():
+        setup_copy()
+        bpy.ops.anim.batch_copy(constraint_type='ALL')
+
+    return [
+        Benchmark("anim.batch_imitate", 'OPERATOR', setup_imitate,
+                  lambda: bpy.ops.anim.batch_imitate(constraint_type='COPY_ROTATION')),
+        Benchmark("anim.batch_imitate[mesh]", 'OPERATOR', setup_imitate_mesh,
+                  lambda: bpy.ops.anim.batch_imitate(constraint_type='COPY_ROTATION')),
+        Benchmark("anim.remove_imitate", 'OPERATOR', setup_remove_imitate,
+                  lambda: bpy.ops.anim.remove_imitate(constraint_type='ALL')),
+        Benchmark("anim.batch_copy", 'OPERATOR', setup_copy,
+                  lambda: bpy.ops.anim.batch_copy(constraint_type='ALL')),
+        Benchmark("anim.remove_copy", 'OPERATOR', setup_remove_copy,
+                  lambda: bpy.ops.anim.remove_copy(constraint_type='ALL')),
+        Benchmark("anim.batch_new", 'OPERATOR', setup_copy,
+                  lambda: bpy.ops.anim.batch_new(constraint_type='COPY_LOCATION')),
+        Benchmark("anim.batch_delete", 'OPERATOR', setup_copy,
+                  lambda: bpy.ops.anim.batch_delete(constraint_type='ALL')),
+    ]
+
+
+def menu_benchmarks(addon, args):
+    def scene(**kwargs):
+        return rig_generator.build_scene(args.armatures, args.bones, args.constraints, **kwargs)
+
+    def setup_imitated():
+        source, targets, _mesh = scene()
+        rig_generator.select(source, targets)
+        bpy.ops.anim.batch_imitate(constraint_type='COPY_ROTATION')
+
+    def setup_copy():
+        source, targets, _mesh = scene(populate_targets=True)
+        rig_generator.select(source, targets)
+
+    def available(mode):
+        return lambda: addon.get_available_constraint_types(bpy.context, mode)
+
+    benchmarks = [
+        Benchmark("menu.IMITATE", 'MENU', setup_copy, available('IMITATE')),
+        Benchmark("menu.REMOVE_IMITATE", 'MENU', setup_imitated, available('REMOVE_IMITATE')),
+        Benchmark("menu.COPY", 'MENU', setup_copy, available('COPY')),
+        Benchmark("menu.REMOVE_COPY", 'MENU', setup_copy, available('REMOVE_COPY')),
+        Benchmark("menu.DELETE", 'MENU', setup_copy, available('DELETE')),
+    ]
+
+    def setup_cached():
+        setup_copy()
+        addon.clear_availability_cache()
+        addon.get_cached_constraint_types(bpy.context, 'COPY')
+
+    benchmarks.append(Benchmark("menu.COPY[cached]", 'MENU', setup_cached,
+                                lambda: addon.get_cached_constraint_types(bpy.context, 'COPY')))
+    return benchmarks
+
+
+def run_benchmark(benchmark, repeat):
+    times = []
+    for _ in range(repeat):
+        benchmark.setup()
+        start = time.perf_counter()
+        benchmark.run()
+        times.append(time.perf_counter() - start)
+    return {
+        "name": benchmark.name,
+        "kind": benchmark.kind,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+    }
+
+
+def compare(results, baseline_path, max_regression):
+    """Print the change against a baseline file, return names of regressed benchmarks"""
+    baseline = {item["name"]: item for item in json.loads(baseline_path.read_text())["results"]}
+    regressed = []
+    for item in results:
+        base = baseline.get(item["name"])
+        if base is None or not base["min"]:
+            continue
+        ratio = item["min"] / base["min"]
+        print(f"{item['name']:<28} {base['min'] * 1000:10.2f} ms -> {item['min'] * 1000:10.2f} ms  x{ratio:.2f}")
+        if ratio > 1.0 + max_regression:
+            regressed.append(item["name"])
+    return regressed
+
+
+def main():
+    args = parse_args()
+    addon = load_addon()
+
+    benchmarks = operator_benchmarks(addon, args) + menu_benchmarks(addon, args)
+    if args.only:
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in args.only]
+
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, args.repeat)
+        print(f"{result['name']:<28} min {result['min'] * 1000:10.2f} ms  median {result['median'] * 1000:10.2f} ms")
+        results.append(result)
+    rig_generator.clear_scene()
+
+    report = {
+        "addon_version": list(addon.bl_info["version"]),
+        "blender_version": bpy.app.version_string,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parameters": {
+            "armatures": args.armatures,
+            "bones": args.bones,
+            "constraints": args.constraints,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    exit_code = 0
+    if args.baseline:
+        regressed = compare(results, args.baseline, args.max_regression)
+        if regressed:
+            print("Regressed: " + ", ".join(regressed))
+            exit_code = 1
+    addon.unregister()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
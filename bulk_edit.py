@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Bulk edit of common properties on existing bone constraints
+
+influence and mute exist on every constraint type, so each bone's stack is read and
+written as a whole with foreach_get / foreach_set through NumPy buffers; a type filter
+only masks the buffer. The space enums can't go through foreach, so they are set per
+constraint.
+"""
+
+import numpy as np
+
+from .core import counters
+
+# Properties read and written with foreach_get / foreach_set, with their buffer type
+FOREACH_PROPERTIES = {
+    'influence': np.float32,
+    'mute': bool,
+}
+
+# Enum properties, set one constraint at a time
+ENUM_PROPERTIES = ('owner_space', 'target_space')
+
+EDITABLE_PROPERTIES = tuple(FOREACH_PROPERTIES) + ENUM_PROPERTIES
+
+
+def edit_stack(constraints, constraint_type, values):
+    """Set values (property -> value) on the constraints of one bone stack
+
+    Returns the number of constraints of constraint_type ('ALL' for any) in the stack.
+    Enum values a constraint doesn't offer are left unchanged on that constraint.
+    """
+    count = len(constraints)
+    if not count:
+        return 0
+    if constraint_type == 'ALL':
+        mask = None
+        matched = count
+    else:
+        mask = np.fromiter((constraint.type == constraint_type for constraint in constraints), bool, count)
+        matched = int(mask.sum())
+        if not matched:
+            return 0
+
+    for prop, dtype in FOREACH_PROPERTIES.items():
+        if prop not in values:
+            continue
+        if mask is None:
+            buffer = np.full(count, values[prop], dtype=dtype)
+        else:
+            buffer = np.empty(count, dtype=dtype)
+            constraints.foreach_get(prop, buffer)
+            buffer[mask] = values[prop]
+        constraints.foreach_set(prop, buffer)
+
+    enum_values = [(prop, values[prop]) for prop in ENUM_PROPERTIES if prop in values]
+    if enum_values:
+        for index, constraint in enumerate(constraints):
+            if mask is not None and not mask[index]:
+                continue
+            for prop, value in enum_values:
+                if not hasattr(constraint, prop):
+                    continue
+                try:
+                    setattr(constraint, prop, value)
+                except TypeError:
+                    # Space not offered by this constraint type
+                    pass
+    counters['edited'] += matched
+    return matched
+
+
+def edit_armatures(armatures, constraint_type, values, bones=None, session=None):
+    """Edit the constraints of every armature, return the number edited per armature name
+
+    bones(armature) returns the pose bones to edit, by default all of them.
+    """
+    unknown = set(values) - set(EDITABLE_PROPERTIES)
+    if unknown:
+        raise TypeError(f"Can't bulk edit {', '.join(sorted(unknown))}")
+    # Writes per edited constraint that go through foreach_set, without an RNA update each
+    foreach_writes = len(set(values) & set(FOREACH_PROPERTIES))
+    counts = {}
+    for armature in armatures:
+        pose_bones = armature.pose.bones if bones is None else bones(armature)
+        counters['bones_visited'] += len(pose_bones)
+        count = sum(edit_stack(bone.constraints, constraint_type, values)
+                    for bone in pose_bones if bone.constraints)
+        if count:
+            counts[armature.name] = count
+            if session is not None:
+                session.record(armature, count, count * foreach_writes)
+    return counts
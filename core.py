@@ -0,0 +1,844 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Constraint matching, availability and planning logic
+
+This module doesn't import bpy: it only works on the objects passed in, so it runs
+both inside Blender and against stand-in objects in plain Python.
+"""
+
+from collections import Counter
+from operator import attrgetter
+
+IMITATE_TYPES = ('COPY_LOCATION', 'COPY_ROTATION', 'COPY_SCALE', 'COPY_TRANSFORMS')
+
+ALL_TYPES = frozenset({
+    'COPY_LOCATION', 'COPY_ROTATION', 'COPY_SCALE', 'COPY_TRANSFORMS',
+    'LIMIT_DISTANCE', 'LIMIT_LOCATION', 'LIMIT_ROTATION', 'LIMIT_SCALE',
+    'MAINTAIN_VOLUME', 'TRANSFORMATION', 'TRANSFORM_CACHE',
+    'CLAMP_TO', 'DAMPED_TRACK', 'IK', 'LOCKED_TRACK', 'SPLINE_IK', 'STRETCH_TO', 'TRACK_TO',
+    'ACTION', 'ARMATURE', 'CHILD_OF', 'FLOOR', 'FOLLOW_PATH', 'PIVOT', 'SHRINKWRAP',
+    'CAMERA_SOLVER', 'FOLLOW_TRACK', 'OBJECT_SOLVER',
+})
+
+# Properties that never take part in constraint comparison or copying
+EXCLUDE_PROPS = {'rna_type', 'type', 'name', 'is_valid', 'error_message'}
+
+# Panel state: copied with the constraint, but never compared
+UI_STATE_PROPS = {'show_expanded', 'active'}
+
+# Stands in for the owner armature in owner-relative fingerprints (ID pointers are names or None)
+SELF_REFERENCE = True
+
+# Default tolerance for matching float and vector property values
+DEFAULT_MATCH_TOLERANCE = 1e-5
+
+# Property schema cache, filled once per constraint type (or nested struct type)
+_constraint_schemas = {}
+
+# Compiled copier cache, filled once per constraint type (or nested struct type)
+_struct_copiers = {}
+
+# Running totals of the work done (bones visited, constraints compared, ...), see metrics.py
+counters = Counter()
+
+
+def _normalize_value(value, scale):
+    return value
+
+
+def _normalize_array(value, scale):
+    return tuple(value)
+
+
+def _normalize_enum_flag(value, scale):
+    return tuple(sorted(value))
+
+
+def _normalize_float(value, scale):
+    return round(value * scale)
+
+
+def _normalize_float_array(value, scale):
+    # Vectors are flat, matrices iterate as rows
+    return tuple(round(v * scale) if isinstance(v, float) else _normalize_float_array(v, scale)
+                 for v in value)
+
+
+def _normalize_id_pointer(value, scale):
+    return None if value is None else value.name_full
+
+
+def _normalize_struct_pointer(value, scale):
+    return None if value is None else get_struct_fingerprint(value, scale)
+
+
+def _normalize_collection(value, scale):
+    return tuple(get_struct_fingerprint(item, scale) for item in value)
+
+
+def _is_id_struct(struct):
+    while struct is not None:
+        if struct.identifier == 'ID':
+            return True
+        struct = struct.base
+    return False
+
+
+def _get_normalizer(prop):
+    """Pick the value normalizer for an RNA property"""
+    if prop.type == 'FLOAT':
+        return _normalize_float_array if prop.array_length else _normalize_float
+    if prop.type in {'BOOLEAN', 'INT'}:
+        return _normalize_array if prop.array_length else _normalize_value
+    if prop.type == 'ENUM':
+        return _normalize_enum_flag if prop.is_enum_flag else _normalize_value
+    if prop.type == 'POINTER':
+        return _normalize_id_pointer if _is_id_struct(prop.fixed_type) else _normalize_struct_pointer
+    if prop.type == 'COLLECTION':
+        return _normalize_collection
+    return _normalize_value
+
+
+class ConstraintSchema:
+    """Compared properties of one constraint type, read from RNA
+
+    Only settings are compared: panel state (UI_STATE_PROPS) and read-only values, such
+    as the evaluated error_location, are left out. Owned nested structs and collections
+    are read-only pointers themselves but compared by content.
+    """
+    __slots__ = ('fields', 'targeted', 'id_positions', 'nested')
+
+    def __init__(self, bl_rna):
+        fields = []
+        identifiers = set()
+        # Positions of ID pointers, and of nested structs with their schema, in fields
+        id_positions = []
+        nested = []
+        for prop in bl_rna.properties:
+            identifiers.add(prop.identifier)
+            if prop.identifier in EXCLUDE_PROPS or prop.identifier in UI_STATE_PROPS:
+                continue
+            if prop.is_readonly and prop.type not in {'POINTER', 'COLLECTION'}:
+                continue
+            # (identifier, normalizer) pairs used for fingerprinting
+            normalize = _get_normalizer(prop)
+            if normalize is _normalize_id_pointer:
+                id_positions.append(len(fields))
+            elif normalize in {_normalize_struct_pointer, _normalize_collection} and prop.fixed_type is not None:
+                nested.append((len(fields), get_struct_schema(prop.fixed_type), normalize is _normalize_collection))
+            fields.append((prop.identifier, normalize))
+        self.fields = tuple(fields)
+        # Whether the type has a target object and subtarget (bone / vertex group) name
+        self.targeted = 'target' in identifiers and 'subtarget' in identifiers
+        self.id_positions = tuple(id_positions)
+        self.nested = tuple(nested)
+
+
+def get_constraint_schema(constraint):
+    """Get property schema of the constraint type, building it on first use"""
+    schema = _constraint_schemas.get(constraint.type)
+    if schema is None:
+        schema = _constraint_schemas[constraint.type] = ConstraintSchema(constraint.bl_rna)
+    return schema
+
+
+def get_struct_schema(bl_rna):
+    """Get property schema of a nested struct type, building it on first use"""
+    schema = _constraint_schemas.get(bl_rna.identifier)
+    if schema is None:
+        schema = _constraint_schemas[bl_rna.identifier] = ConstraintSchema(bl_rna)
+    return schema
+
+
+def get_struct_fingerprint(struct, scale):
+    """Get normalized property values of a nested struct (e.g. an Armature constraint target)"""
+    schema = get_struct_schema(struct.bl_rna)
+    return tuple(normalize(getattr(struct, prop), scale) for prop, normalize in schema.fields)
+
+
+def _make_owner_relative(values, schema, owner_name, offset):
+    if not schema.id_positions and not schema.nested:
+        return values
+    values = list(values)
+    for position in schema.id_positions:
+        if values[position + offset] == owner_name:
+            values[position + offset] = SELF_REFERENCE
+    for position, nested_schema, is_collection in schema.nested:
+        value = values[position + offset]
+        if value is None:
+            continue
+        if is_collection:
+            values[position + offset] = tuple(_make_owner_relative(item, nested_schema, owner_name, 0)
+                                              for item in value)
+        else:
+            values[position + offset] = _make_owner_relative(value, nested_schema, owner_name, 0)
+    return tuple(values)
+
+
+def get_relative_fingerprint(constraint, scale, owner):
+    """Get the fingerprint of a constraint with ID pointers to owner replaced by SELF_REFERENCE
+
+    Constraints of two armatures that each point to their own armature then compare
+    equal. Only ID pointer fields are replaced, never other values equal to the name.
+    """
+    return _make_owner_relative(get_constraint_fingerprint(constraint, scale),
+                                get_constraint_schema(constraint), owner.name_full, 1)
+
+
+class ConstraintSnapshot:
+    """A constraint as read into a snapshot (see snapshot.py), fingerprinted at scale"""
+    __slots__ = ('name', 'type', 'target', 'subtarget', 'scale', 'fingerprint')
+
+    def __init__(self, name, type, target, subtarget, scale, fingerprint):
+        self.name = name
+        self.type = type
+        self.target = target
+        self.subtarget = subtarget
+        self.scale = scale
+        self.fingerprint = fingerprint
+
+
+def get_constraint_fingerprint(constraint, scale):
+    """Get the canonical fingerprint of a constraint: type plus normalized property values
+
+    Float values are quantized by scale (1 / tolerance), pointers are reduced to ID names
+    and nested collections are fingerprinted item by item, so two constraints are
+    considered the same exactly when their fingerprints are equal.
+    """
+    if constraint.__class__ is ConstraintSnapshot:
+        if constraint.scale != scale:
+            raise ValueError(f"Snapshot taken at match scale {constraint.scale}, not {scale}")
+        return constraint.fingerprint
+    fields = get_constraint_schema(constraint).fields
+    counters['constraints_compared'] += 1
+    counters['properties_compared'] += len(fields)
+    return (constraint.type,) + tuple(normalize(getattr(constraint, prop), scale) for prop, normalize in fields)
+
+
+def index_bone_constraints(bone, scale):
+    """Get the multiset of constraint fingerprints on a pose bone"""
+    return Counter(get_constraint_fingerprint(constraint, scale) for constraint in bone.constraints)
+
+
+def index_armature_constraints(armature, scale):
+    """Index constraint stacks of an armature as bone name -> fingerprint multiset"""
+    return {bone.name: index_bone_constraints(bone, scale)
+            for bone in armature.pose.bones if bone.constraints}
+
+
+def index_bone_constraints_of_types(bone, scale, types):
+    """Get the multiset of fingerprints of the bone constraints whose type is in types"""
+    return Counter(get_constraint_fingerprint(constraint, scale)
+                   for constraint in bone.constraints if constraint.type in types)
+
+
+def available_constraint_types(active_obj, selected_objs, mode, scale, name_map=None):
+    """Get the constraint types a menu mode can offer for the given objects
+
+    selected_objs are the selected armatures (the active one may be among them) and
+    name_map(source, target) pairs their bones (identical names by default).
+    Each candidate type is dropped as soon as it is confirmed and the scan stops once
+    no candidates are left. Type checks come before any property comparison.
+    """
+    name_map = name_map or identity_name_map
+    available_types = set()
+    
+    if not selected_objs:
+        return available_types
+    
+    if mode == 'IMITATE':
+        # Imitate mode: Check if active and selected items have bones/vertex groups with same names
+        if active_obj:
+            for target_obj in selected_objs:
+                if target_obj == active_obj:
+                    continue
+                if name_map(active_obj, target_obj):  # 有交集 Has intersection
+                    # Always show 4 transform constraints
+                    available_types.update(IMITATE_TYPES)
+                    break
+    
+    elif mode == 'REMOVE_IMITATE':
+        # Remove imitate mode: Check for existing constraints targeting active object in selected items
+        if active_obj:
+            # Only check four transform constraints
+            candidates = set(IMITATE_TYPES)
+            for target_obj in selected_objs:
+                if target_obj == active_obj:
+                    continue
+                bone_map = name_map(active_obj, target_obj)
+                for bone in target_obj.pose.bones:
+                    source_name = bone_map.get(bone.name)
+                    if source_name is None:
+                        continue
+                    counters['bones_visited'] += 1
+                    for constraint in bone.constraints:
+                        if constraint.type not in candidates:
+                            continue
+                        # Check if constraint targets active object and subtarget is the paired bone/vertex group
+                        if constraint.target == active_obj and constraint.subtarget == source_name:
+                            available_types.add(constraint.type)
+                            candidates.discard(constraint.type)
+                            if not candidates:
+                                return available_types
+    
+    elif mode in {'COPY', 'REMOVE_COPY'}:
+        # Copy mode: Check for constraints in active object that are missing in selected objects (for bones with same names)
+        # Remove copy mode: Check for same constraints in both active and selected objects (for bones with same names)
+        if active_obj and active_obj.type == 'ARMATURE':
+            # Cheapest evidence first: only types present on the active armature can be available
+            active_stacks = {}
+            candidates = set()
+            for bone in active_obj.pose.bones:
+                if bone.constraints:
+                    types = {constraint.type for constraint in bone.constraints}
+                    active_stacks[bone.name] = (bone, types)
+                    candidates |= types
+            # Active bone fingerprints, computed on first need for the types still in question
+            active_counts = {}
+            copy = mode == 'COPY'
+            
+            for target_obj in selected_objs:
+                if target_obj == active_obj:
+                    continue
+                target_bones = target_obj.pose.bones
+                for target_name, bone_name in name_map(active_obj, target_obj).items():
+                    active_stack = active_stacks.get(bone_name)
+                    if active_stack is None:
+                        continue
+                    active_bone, active_types = active_stack
+                    counters['bones_visited'] += 1
+                    types = active_types & candidates
+                    if not types:
+                        continue
+                    target_bone = target_bones[target_name]
+                    target_types = {constraint.type for constraint in target_bone.constraints}
+                    if copy:
+                        # A type missing on the target bone is confirmed without comparing properties
+                        confirmed = types - target_types
+                    else:
+                        confirmed = set()
+                    types &= target_types
+                    if types:
+                        counts = active_counts.get(bone_name)
+                        if counts is None:
+                            # Candidates only shrink, so counts for today's candidates stay valid
+                            counts = active_counts[bone_name] = index_bone_constraints_of_types(
+                                active_bone, scale, candidates)
+                        target_counts = index_bone_constraints_of_types(target_bone, scale, types)
+                        for fingerprint, count in counts.items():
+                            if fingerprint[0] not in types:
+                                continue
+                            if copy:
+                                # Target bone doesn't have (enough of) the same constraint yet
+                                if target_counts[fingerprint] < count:
+                                    confirmed.add(fingerprint[0])
+                            elif fingerprint in target_counts:
+                                # Target bone has the same constraint
+                                confirmed.add(fingerprint[0])
+                    if confirmed:
+                        available_types |= confirmed
+                        candidates -= confirmed
+                        if not candidates:
+                            return available_types
+    
+    elif mode == 'DELETE':
+        # Delete mode: Check constraints in all selected armatures (including active object)
+        for obj in selected_objs:
+            for bone in obj.pose.bones:
+                counters['bones_visited'] += 1
+                for constraint in bone.constraints:
+                    available_types.add(constraint.type)
+                # Every known type seen, nothing left to find
+                if ALL_TYPES <= available_types:
+                    return available_types
+    
+    return available_types
+
+
+class BatchSession:
+    """Collect the armatures an operation mutates and tag each for update at the end
+
+    Use as a context manager around the mutations and record() every constraint created,
+    removed or edited. On exit every affected armature is tagged once, which also covers
+    edits that don't tag their owner themselves (foreach_set in bulk_edit.py).
+
+    constraints.new() and remove() still tag their owner each time, so only writes
+    recorded as untagged count towards updates_avoided: each of them would have run
+    its own update when set per constraint, against the one tag per armature here.
+    """
+
+    def __init__(self):
+        # Armature -> number of mutations recorded for it
+        self.mutations = {}
+        # Armature -> number of property writes made without an RNA update
+        self.untagged = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tag_updates()
+        return False
+
+    def tag_updates(self):
+        for armature in self.mutations:
+            armature.update_tag(refresh={'OBJECT', 'DATA'})
+
+    def record(self, armature, count=1, untagged=0):
+        self.mutations[armature] = self.mutations.get(armature, 0) + count
+        if untagged:
+            self.untagged[armature] = self.untagged.get(armature, 0) + untagged
+
+    @property
+    def mutation_count(self):
+        return sum(self.mutations.values())
+
+    @property
+    def updates_avoided(self):
+        """Owner updates the untagged writes would have run, minus the tags issued for them"""
+        return sum(writes - 1 for writes in self.untagged.values())
+
+
+def get_source_names(source):
+    """Get the names Imitate can target: bones of an armature, vertex groups of a mesh"""
+    return set(get_source_name_list(source))
+
+
+def get_source_name_list(source):
+    """Get the bone names of an armature or the vertex group names of a mesh, in order"""
+    if source.type == 'ARMATURE':
+        return tuple(bone.name for bone in source.pose.bones)
+    if source.type == 'MESH':
+        return tuple(vertex_group.name for vertex_group in source.vertex_groups)
+    return ()
+
+
+def identity_name_map(source, target):
+    """Pair target bones with the same-named source bone (or vertex group)"""
+    source_names = get_source_names(source)
+    return {bone.name: bone.name for bone in target.pose.bones if bone.name in source_names}
+
+
+def index_imitate_constraints(bone):
+    """Get (type, target, subtarget) of every constraint with a target on a pose bone"""
+    return {(constraint.type, constraint.target, constraint.subtarget)
+            for constraint in bone.constraints if get_constraint_schema(constraint).targeted}
+
+
+def plan_imitate(source, targets, constraint_type, name_map=identity_name_map):
+    """Plan an Imitate: a constraint_type constraint imitating source on every bone that lacks one
+
+    Only bones paired with a source bone (or vertex group) by name_map are considered,
+    and each of them is checked against a one-pass index of its existing constraints.
+    """
+    plan = BatchPlan('IMITATE')
+    for target in targets:
+        target_bones = target.pose.bones
+        bone_map = name_map(source, target)
+        counters['bones_visited'] += len(bone_map)
+        for target_name, source_name in bone_map.items():
+            bone = target_bones[target_name]
+            if (constraint_type, source, source_name) not in index_imitate_constraints(bone):
+                plan.add(target, bone, 'IMITATE', (constraint_type, source.name, source_name))
+    return plan
+
+
+class BatchPlan:
+    """Explicit plan of an operation, made before anything is changed
+
+    Entries are (armature name, bone name, action, spec):
+
+        'IMITATE'  (constraint type, source object name, source bone / vertex group name)
+        'COPY'     (constraint type, source armature name, source bone name, source constraint name)
+        'NEW'      (constraint type,)
+        'REMOVE'   ((constraint name, constraint type), ...) in stack order
+
+    Entries only hold names, so a plan survives undo (which reallocates the data it was
+    made from) and can be kept and applied again while the constraint stacks are unchanged.
+    """
+
+    def __init__(self, operation=None):
+        self.operation = operation
+        self.entries = []
+
+    def add(self, armature, bone, action, spec):
+        self.entries.append((armature.name, bone.name, action, spec))
+
+    def add_removal(self, armature, bone, constraints):
+        if constraints:
+            self.add(armature, bone, 'REMOVE',
+                     tuple((constraint.name, constraint.type) for constraint in constraints))
+
+    def add_whole_stack(self, armature, bone):
+        self.add_removal(armature, bone, bone.constraints)
+
+    def extend(self, plan):
+        self.entries.extend(plan.entries)
+
+    def of_type(self, constraint_type):
+        """Get the part of the plan that concerns constraint_type constraints"""
+        plan = BatchPlan(self.operation)
+        if constraint_type == 'ALL':
+            plan.extend(self)
+            return plan
+        for armature_name, bone_name, action, spec in self.entries:
+            if action == 'REMOVE':
+                spec = tuple(item for item in spec if item[1] == constraint_type)
+                if spec:
+                    plan.entries.append((armature_name, bone_name, action, spec))
+            elif spec[0] == constraint_type:
+                plan.entries.append((armature_name, bone_name, action, spec))
+        return plan
+
+    def split(self):
+        """Get the plan per armature name"""
+        plans = {}
+        for entry in self.entries:
+            plan = plans.get(entry[0])
+            if plan is None:
+                plan = plans[entry[0]] = BatchPlan(self.operation)
+            plan.entries.append(entry)
+        return plans
+
+    def counts(self):
+        """Get the number of planned creations and removals per armature name"""
+        counts = {}
+        for armature_name, bone_name, action, spec in self.entries:
+            count = len(spec) if action == 'REMOVE' else 1
+            counts[armature_name] = counts.get(armature_name, 0) + count
+        return counts
+
+    def __len__(self):
+        return sum(self.counts().values())
+
+    def apply(self, resolve_object, session=None, start=0, stop=None, on_create=None):
+        """Carry out the plan and return the number of constraints changed per armature name
+
+        resolve_object(name) returns the object of that name (or None). Entries whose
+        armature, bone or source constraint no longer exists are skipped. start and stop
+        limit it to a slice of the entries, so a plan can be applied a part at a time.
+        on_create(armature, bone, constraint, action, spec) is called for every new constraint.
+        """
+        counts = {}
+        source_constraints = {}
+        for armature_name, bone_name, action, spec in self.entries[start:stop]:
+            armature = resolve_object(armature_name)
+            bone = armature.pose.bones.get(bone_name) if armature is not None else None
+            if bone is None:
+                continue
+            stack = bone.constraints
+            if action == 'REMOVE':
+                # Stack order is the cheapest: the collection looks each constraint up
+                # from its head, where the next one to remove always sits
+                count = 0
+                for name, _constraint_type in spec:
+                    constraint = stack.get(name)
+                    if constraint is not None:
+                        stack.remove(constraint)
+                        count += 1
+                counters['removed'] += count
+            else:
+                if action == 'COPY':
+                    source_constraint = source_constraints.get(spec)
+                    if source_constraint is None:
+                        source = resolve_object(spec[1])
+                        source_bone = source.pose.bones.get(spec[2]) if source is not None else None
+                        if source_bone is None or source_bone.constraints.get(spec[3]) is None:
+                            continue
+                        source_constraint = source_constraints[spec] = source_bone.constraints[spec[3]]
+                # Use Blender's built-in method to create constraints
+                constraint = stack.new(type=spec[0])
+                if action == 'IMITATE':
+                    constraint.target = resolve_object(spec[1])
+                    constraint.subtarget = spec[2]
+                elif action == 'COPY':
+                    copy_constraint_properties(source_constraint, constraint)
+                if on_create is not None:
+                    on_create(armature, bone, constraint, action, spec)
+                counters['created'] += 1
+                count = 1
+            if count:
+                counts[armature_name] = counts.get(armature_name, 0) + count
+                if session is not None:
+                    session.record(armature, count)
+        return counts
+
+
+def get_layout_stamp(obj):
+    """Get a cheap stamp of the names plans are made from
+
+    Covers bone names and the names and types of their constraints (vertex group names
+    for a mesh), not property values: a plan kept with the stamp stays valid while the
+    stamp is unchanged and no constraint properties were edited in between.
+    """
+    if obj.type == 'ARMATURE':
+        return tuple((bone.name, tuple((constraint.name, constraint.type) for constraint in bone.constraints))
+                     for bone in obj.pose.bones)
+    if obj.type == 'MESH':
+        return tuple(vertex_group.name for vertex_group in obj.vertex_groups)
+    return ()
+
+
+def plan_new(armatures, constraint_type, scope=None):
+    """Plan a New: a constraint_type constraint on every bone (in scope, see scope.py)"""
+    plan = BatchPlan('NEW')
+    for armature in armatures:
+        bones = armature.pose.bones if scope is None else scope.bones(armature)
+        counters['bones_visited'] += len(bones)
+        for bone in bones:
+            plan.add(armature, bone, 'NEW', (constraint_type,))
+    return plan
+
+
+def plan_delete(armatures, constraint_type, scope=None):
+    """Plan a Delete: constraints of constraint_type (or whole stacks for 'ALL') on bones in scope"""
+    plan = BatchPlan('DELETE')
+    for armature in armatures:
+        bones = armature.pose.bones if scope is None else scope.bones(armature)
+        counters['bones_visited'] += len(bones)
+        for bone in bones:
+            if constraint_type == 'ALL':
+                plan.add_whole_stack(armature, bone)
+            else:
+                plan.add_removal(armature, bone, [constraint for constraint in bone.constraints
+                                                  if constraint.type == constraint_type])
+    return plan
+
+
+def plan_remove_imitate(source, targets, constraint_type, name_map=identity_name_map):
+    """Plan a Remove Imitate: constraints imitating the paired source bone"""
+    plan = BatchPlan('REMOVE_IMITATE')
+    for target in targets:
+        target_bones = target.pose.bones
+        bone_map = name_map(source, target)
+        counters['bones_visited'] += len(bone_map)
+        for target_name, source_name in bone_map.items():
+            bone = target_bones[target_name]
+            # Types without a target can't imitate anything
+            plan.add_removal(target, bone, [
+                constraint for constraint in bone.constraints
+                if (constraint_type == 'ALL' or constraint.type == constraint_type) and
+                get_constraint_schema(constraint).targeted and
+                constraint.target == source and constraint.subtarget == source_name])
+    return plan
+
+
+def plan_remove_copy(source, targets, constraint_type, scale, name_map=identity_name_map):
+    """Plan a Remove Copy: target constraints identical to one on the paired source bone"""
+    source_index = index_armature_constraints(source, scale)
+    plan = BatchPlan('REMOVE_COPY')
+    for target in targets:
+        target_bones = target.pose.bones
+        for target_name, bone_name in name_map(source, target).items():
+            source_counts = source_index.get(bone_name)
+            if source_counts is None:
+                continue
+            counters['bones_visited'] += 1
+            bone = target_bones[target_name]
+            plan.add_removal(target, bone, [
+                constraint for constraint in bone.constraints
+                if (constraint_type == 'ALL' or constraint.type == constraint_type) and
+                get_constraint_fingerprint(constraint, scale) in source_counts])
+    return plan
+
+
+def index_copy_stacks(source, constraint_type, scale):
+    """Fingerprint the source stacks a Copy draws from: bone name -> [(fingerprint, spec)]"""
+    source_stacks = {}
+    for source_bone in source.pose.bones:
+        stack = [(get_constraint_fingerprint(constraint, scale),
+                  (constraint.type, source.name, source_bone.name, constraint.name))
+                 for constraint in source_bone.constraints
+                 if constraint_type == 'ALL' or constraint.type == constraint_type]
+        if stack:
+            source_stacks[source_bone.name] = stack
+    return source_stacks
+
+
+def merge_copy_stacks(stacks):
+    """Merge the stacks of several sources for one bone, in precedence order
+
+    A later source's constraint is left out when an earlier source has an identical one
+    (counted, so two identical constraints after one on an earlier source add one).
+    Names don't decide anything: templates often give different constraints Blender's
+    default names. Only constraints of one type can be identical, so merging stacks
+    filtered by type gives the same as filtering the merged stack.
+    """
+    merged = []
+    earlier = Counter()
+    for stack in stacks:
+        seen = Counter()
+        for fingerprint, spec in stack:
+            seen[fingerprint] += 1
+            if seen[fingerprint] > earlier[fingerprint]:
+                merged.append((fingerprint, spec))
+        earlier |= seen
+    return merged
+
+
+def plan_copy(source, targets, constraint_type, scale, name_map=identity_name_map):
+    """Plan a Copy: source constraints to create on the paired (by default same-named) target bones
+
+    Each existing target constraint accounts for one identical source constraint, so a
+    source constraint is only planned when the target bone lacks (enough of) it.
+    """
+    return plan_merged_copy([source], targets, constraint_type, scale, name_map)
+
+
+def plan_merged_copy(sources, targets, constraint_type, scale, name_map=identity_name_map):
+    """Plan a Copy from several sources at once, merged by merge_copy_stacks in list order
+
+    The sources are fingerprinted once and each merged bone stack is built once per
+    combination of paired source bones (once per bone name without mapping rules), so
+    every target is scanned a single time however many sources there are.
+    """
+    # Fingerprint the source stacks once for all targets
+    source_stacks = [index_copy_stacks(source, constraint_type, scale) for source in sources]
+    merged_stacks = {}
+    
+    plan = BatchPlan('COPY')
+    for target in targets:
+        target_bones = target.pose.bones
+        bone_maps = [name_map(source, target) for source in sources]
+        for target_name in dict.fromkeys(name for bone_map in bone_maps for name in bone_map):
+            key = tuple(bone_map.get(target_name) for bone_map in bone_maps)
+            stack = merged_stacks.get(key)
+            if stack is None:
+                stack = merged_stacks[key] = merge_copy_stacks(
+                    stacks[bone_name] for stacks, bone_name in zip(source_stacks, key) if bone_name in stacks)
+            if not stack:
+                continue
+            counters['bones_visited'] += 1
+            target_bone = target_bones[target_name]
+            existing = index_bone_constraints(target_bone, scale)
+            for fingerprint, spec in stack:
+                if existing[fingerprint] > 0:
+                    existing[fingerprint] -= 1
+                else:
+                    plan.add(target, target_bone, 'COPY', spec)
+    return plan
+
+
+def get_changed_properties(constraint, fingerprint, other_fingerprint):
+    """Get the properties of constraint whose values differ between two of its type's fingerprints"""
+    return [prop for (prop, _normalize), value, other_value in
+            zip(get_constraint_schema(constraint).fields, fingerprint[1:], other_fingerprint[1:])
+            if value != other_value]
+
+
+def _copy_struct(source_struct, struct, copier):
+    if source_struct is not None and struct is not None:
+        copier.copy(source_struct, struct)
+
+
+def _copy_collection(source_items, items, copier):
+    # Rebuilt rather than matched item by item, so surplus items go as well
+    for item in list(items):
+        items.remove(item)
+    for source_item in source_items:
+        copier.copy(source_item, items.new())
+
+
+def _sets_context(prop):
+    """Whether other values of the struct may depend on prop: ID pointers and subtargets"""
+    return (prop.type == 'POINTER' and _is_id_struct(prop.fixed_type)) or prop.identifier.endswith("subtarget")
+
+
+def in_assignment_order(properties):
+    """Order RNA properties for assignment: ID pointers and subtargets first, then RNA order
+
+    The values some enums take depend on the target, e.g. target_space 'POSE' needs an
+    armature target, so the target has to be set before them.
+    """
+    return sorted(properties, key=lambda prop: not _sets_context(prop))
+
+
+class StructCopier:
+    """Copies one constraint type (or nested struct type) in full, laid out once from RNA
+
+    Writable values (scalars, vectors, enums, ID pointers) are read in a single
+    attrgetter call and assigned targets first (see in_assignment_order()); nested
+    struct pointers and collections (e.g. the Armature constraint targets) are copied
+    by the copier of their own type.
+    """
+    __slots__ = ('assigned', 'first', 'structs', 'collections', '_get')
+
+    def __init__(self, bl_rna):
+        assigned = []
+        self.structs = {}
+        self.collections = {}
+        for prop in in_assignment_order(bl_rna.properties):
+            if prop.identifier in EXCLUDE_PROPS:
+                continue
+            if prop.type == 'COLLECTION':
+                if prop.fixed_type is not None:
+                    self.collections[prop.identifier] = get_struct_copier(prop.fixed_type)
+            elif prop.type == 'POINTER' and prop.is_readonly and not _is_id_struct(prop.fixed_type):
+                # Owned nested structs are edited in place, not assigned
+                if prop.fixed_type is not None:
+                    self.structs[prop.identifier] = get_struct_copier(prop.fixed_type)
+            elif not prop.is_readonly:
+                assigned.append(prop.identifier)
+        self.assigned = tuple(assigned)
+        # Assigned before the others when copying some properties only
+        self.first = frozenset(prop.identifier for prop in bl_rna.properties if _sets_context(prop))
+        getter = attrgetter(*assigned) if assigned else (lambda struct: ())
+        # attrgetter of a single name returns the bare value
+        self._get = (lambda struct: (getter(struct),)) if len(assigned) == 1 else getter
+
+    def copy(self, source, struct, props=None):
+        """Copy all properties of source (or those among props) to struct"""
+        if props is not None:
+            self._copy_props(source, struct, sorted(props, key=lambda prop: prop not in self.first))
+            return
+        try:
+            for prop, value in zip(self.assigned, self._get(source)):
+                setattr(struct, prop, value)
+        except (AttributeError, TypeError, ValueError):
+            # A value this struct won't take (e.g. out of a dynamic range): redo the
+            # copy property by property, keeping whatever can be set
+            self._copy_props(source, struct, self.assigned, skip_invalid=True)
+        for prop, copier in self.structs.items():
+            _copy_struct(getattr(source, prop), getattr(struct, prop), copier)
+        for prop, copier in self.collections.items():
+            _copy_collection(getattr(source, prop), getattr(struct, prop), copier)
+
+    def _copy_props(self, source, struct, props, skip_invalid=False):
+        for prop in props:
+            if prop in self.structs:
+                _copy_struct(getattr(source, prop), getattr(struct, prop), self.structs[prop])
+            elif prop in self.collections:
+                _copy_collection(getattr(source, prop), getattr(struct, prop), self.collections[prop])
+            elif skip_invalid:
+                try:
+                    setattr(struct, prop, getattr(source, prop))
+                except (AttributeError, TypeError, ValueError):
+                    pass
+            elif prop in self.assigned:
+                setattr(struct, prop, getattr(source, prop))
+
+
+def get_struct_copier(bl_rna):
+    """Get the copier of a struct type, laying it out on first use"""
+    copier = _struct_copiers.get(bl_rna.identifier)
+    if copier is None:
+        # Cached before it's filled in, so self-referencing types terminate
+        copier = _struct_copiers[bl_rna.identifier] = StructCopier.__new__(StructCopier)
+        copier.__init__(bl_rna)
+    return copier
+
+
+def get_constraint_copier(constraint):
+    """Get the copier of the constraint type, laying it out on first use"""
+    copier = _struct_copiers.get(constraint.type)
+    if copier is None:
+        copier = _struct_copiers[constraint.type] = get_struct_copier(constraint.bl_rna)
+    return copier
+
+
+def copy_constraint_properties(source_constraint, constraint, props=None):
+    """Copy all properties of source_constraint (or those among props) to constraint
+
+    Includes nested structs and collections, such as the targets of an Armature constraint.
+    """
+    get_constraint_copier(source_constraint).copy(source_constraint, constraint, props)
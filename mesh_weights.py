@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Per vertex group statistics of a mesh, aggregated with NumPy
+
+Used by Imitate with a mesh as source to skip bones whose vertex group carries no
+weights. Coordinates are read with foreach_get; deform weights have no bulk accessor,
+so they are gathered in a single pass over the vertices and everything else (counts,
+weight sums and maxima, weighted centroids) is one vectorized pass over that.
+"""
+
+import numpy as np
+
+
+class VertexGroupStats:
+    """Weights of one vertex group; centroid is in object space (None without weights)"""
+    __slots__ = ('name', 'vertex_count', 'weight_sum', 'max_weight', 'centroid')
+
+    def __init__(self, name, vertex_count, weight_sum, max_weight, centroid):
+        self.name = name
+        self.vertex_count = vertex_count
+        self.weight_sum = weight_sum
+        self.max_weight = max_weight
+        self.centroid = centroid
+
+
+def get_vertex_group_stats(obj):
+    """Get VertexGroupStats per vertex group name of a mesh object"""
+    group_names = [vertex_group.name for vertex_group in obj.vertex_groups]
+    group_count = len(group_names)
+    if not group_count:
+        return {}
+
+    vertices = obj.data.vertices
+    co = np.empty(len(vertices) * 3, dtype=np.float64)
+    vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+
+    # The only per-vertex Python loop: flatten (vertex, group, weight) memberships
+    memberships = [(vertex.index, element.group, element.weight)
+                   for vertex in vertices for element in vertex.groups]
+    if memberships:
+        vertex_index, group_index, weight = (np.array(column) for column in zip(*memberships))
+        # Zero weights don't count, stale group indices can't be named
+        mask = (weight > 0.0) & (group_index < group_count)
+        vertex_index = vertex_index[mask]
+        group_index = group_index[mask]
+        weight = weight[mask]
+    else:
+        vertex_index = group_index = np.empty(0, dtype=np.intp)
+        weight = np.empty(0, dtype=np.float64)
+
+    counts = np.bincount(group_index, minlength=group_count)
+    sums = np.bincount(group_index, weights=weight, minlength=group_count)
+    maxima = np.zeros(group_count)
+    np.maximum.at(maxima, group_index, weight)
+    weighted_co = np.stack([np.bincount(group_index, weights=weight * co[vertex_index, axis], minlength=group_count)
+                            for axis in range(3)], axis=1)
+
+    stats = {}
+    for index, name in enumerate(group_names):
+        centroid = tuple(weighted_co[index] / sums[index]) if sums[index] > 0.0 else None
+        stats[name] = VertexGroupStats(name, int(counts[index]), float(sums[index]), float(maxima[index]), centroid)
+    return stats
+
+
+def get_weighted_group_names(obj, min_weight=0.0):
+    """Get names of the vertex groups with a vertex weighted at least min_weight (and above 0)"""
+    return {name for name, stats in get_vertex_group_stats(obj).items()
+            if stats.vertex_count and stats.max_weight >= min_weight}
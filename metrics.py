@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Timing and counters of batch operations
+
+core.py increments the running totals in core.counters unconditionally (a dict update
+per bone or constraint, not per property); an operation recorded with
+recorder.operation() keeps the difference over its run, plus the wall time of each
+phase:
+
+    'scan'      availability scan, layout stamps and name maps
+    'plan'      planning what to create and remove
+    'mutate'    creating and removing constraints
+    'depsgraph' evaluating the tagged armatures afterwards (only timed with profile)
+
+An operation that runs in steps (the modal operators) is recorded in bounded blocks:
+recorder.operation() around its first step, recorder.resume() around each later one,
+so no record stays open between steps.
+
+Records are kept in memory (the last RECORD_LIMIT) and can be written as JSONL, one
+record per line. With profile, each recorded operation also runs under cProfile and
+keeps the top of its cumulative-time listing.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from .core import counters
+
+COUNTER_NAMES = ('bones_visited', 'constraints_compared', 'properties_compared', 'created', 'removed', 'edited')
+
+RECORD_LIMIT = 50
+
+# Number of functions kept from a profile, by cumulative time
+PROFILE_LINES = 30
+
+
+class OperationRecord:
+    """Phase timings (seconds) and counter differences of one recorded operation"""
+    __slots__ = ('operation', 'started', 'phases', 'counts', 'profile')
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = time.time()
+        self.phases = {}
+        self.counts = {}
+        self.profile = None
+
+    @property
+    def total_time(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {
+            "operation": self.operation,
+            "started": self.started,
+            "phases": self.phases,
+            "counts": self.counts,
+            "profile": self.profile,
+        }
+
+
+class Recorder:
+    """Records operations while enabled; phases outside a recorded operation cost one check"""
+
+    def __init__(self, size=RECORD_LIMIT):
+        self.enabled = True
+        self.profile = False
+        self.records = deque(maxlen=size)
+        self.current = None
+
+    @contextmanager
+    def operation(self, name, profile=None):
+        """Record the operation run inside the block, yield its OperationRecord
+
+        Yields None while disabled. A nested operation is folded into the one already
+        being recorded.
+        """
+        if self.current is not None or not self.enabled:
+            yield self.current
+            return
+        record = self.current = OperationRecord(name)
+        profiler = cProfile.Profile() if (self.profile if profile is None else profile) else None
+        start_counts = counters.copy()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                record.profile = format_profile(profiler)
+            record.counts = {name: counters[name] - start_counts[name] for name in COUNTER_NAMES}
+            self.current = None
+            self.records.append(record)
+
+    @contextmanager
+    def resume(self, record):
+        """Add the block to a record finished by operation(), e.g. a later step of it
+
+        Counter differences and phase times are added to the record; it isn't profiled
+        again. Does nothing for None or inside another recorded operation.
+        """
+        if record is None or self.current is not None:
+            yield
+            return
+        self.current = record
+        start_counts = counters.copy()
+        try:
+            yield
+        finally:
+            for name in COUNTER_NAMES:
+                record.counts[name] = record.counts.get(name, 0) + counters[name] - start_counts[name]
+            self.current = None
+
+    @contextmanager
+    def phase(self, name):
+        """Add the wall time of the block to phase name of the current record, if any"""
+        record = self.current
+        if record is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.phases[name] = record.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def last(self):
+        return self.records[-1] if self.records else None
+
+    def export_jsonl(self, filepath):
+        """Write the kept records to filepath, one JSON object per line; return the count"""
+        with open(filepath, "w", encoding="utf-8") as file:
+            for record in self.records:
+                file.write(json.dumps(record.as_dict(), separators=(",", ":")) + "\n")
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+
+def format_profile(profiler, limit=PROFILE_LINES):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
+
+
+recorder = Recorder()
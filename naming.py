@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Bone name mapping between armatures with different naming conventions
+
+Rules are (kind, pattern, replacement) tuples; all but 'TABLE' rewrite names, in
+list order:
+
+    'STRIP_PREFIX'  remove pattern from the start of both names
+    'STRIP_SUFFIX'  remove pattern from the end of both names
+    'REGEX'         re.sub(pattern, replacement) on both names
+    'MIRROR'        flip the side of target names only (hand.L -> hand.R)
+    'TABLE'         pair target bone pattern with source bone replacement explicitly
+
+A source and a target name are paired when they rewrite to the same key; explicit
+'TABLE' pairs are looked up first, on the unrewritten target name. The rules are
+compiled into a target name -> source name dict once per armature pair and kept until
+the rules or the layout of either armature change, so no rule runs per bone while
+planning.
+"""
+
+import re
+
+RULE_KINDS = ('STRIP_PREFIX', 'STRIP_SUFFIX', 'REGEX', 'MIRROR', 'TABLE')
+
+_SIDES = {
+    'L': 'R', 'R': 'L', 'l': 'r', 'r': 'l',
+    'Left': 'Right', 'Right': 'Left', 'left': 'right', 'right': 'left', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT',
+}
+_SIDE_WORDS = "|".join(sorted(_SIDES, key=len, reverse=True))
+# Side at the end (hand.L, hand_left.001) or at the start (L_hand, Left-hand)
+_SIDE_SUFFIX = re.compile(rf"(?<=[._\- ])({_SIDE_WORDS})(?=(\.\d+)?$)")
+_SIDE_PREFIX = re.compile(rf"^({_SIDE_WORDS})(?=[._\- ])")
+
+
+def flip_side(name):
+    """Get the name of the opposite side, or the name itself if it has no side"""
+    flipped, count = _SIDE_SUFFIX.subn(lambda match: _SIDES[match.group(1)], name, count=1)
+    if count:
+        return flipped
+    return _SIDE_PREFIX.sub(lambda match: _SIDES[match.group(1)], name, count=1)
+
+
+class NameRules:
+    """Compiled mapping rules; rules with an invalid regular expression are left out"""
+
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)
+        # (compiled pattern, replacement) pairs applied in order to every name; a None
+        # pattern is a MIRROR step, applied to target names only
+        self.rewrites = []
+        # Explicit target name -> source name pairs
+        self.table = {}
+        self.invalid = []
+        for kind, pattern, replacement in self.rules:
+            if kind == 'MIRROR':
+                self.rewrites.append((None, None))
+            elif not pattern:
+                continue
+            elif kind == 'TABLE':
+                self.table[pattern] = replacement
+            elif kind == 'STRIP_PREFIX':
+                self.rewrites.append((re.compile("^" + re.escape(pattern)), ""))
+            elif kind == 'STRIP_SUFFIX':
+                self.rewrites.append((re.compile(re.escape(pattern) + "$"), ""))
+            elif kind == 'REGEX':
+                try:
+                    self.rewrites.append((re.compile(pattern), replacement))
+                except re.error:
+                    self.invalid.append(pattern)
+
+    def key(self, name, target=False):
+        for pattern, replacement in self.rewrites:
+            if pattern is not None:
+                name = pattern.sub(replacement, name)
+            elif target:
+                name = flip_side(name)
+        return name
+
+    def compile(self, source_names, target_names):
+        """Get the target name -> source name dict for two name lists"""
+        if not self.rules:
+            source_set = set(source_names)
+            return {name: name for name in target_names if name in source_set}
+        source_keys = {}
+        for name in source_names:
+            # The first source name wins when several rewrite to the same key
+            source_keys.setdefault(self.key(name), name)
+        source_set = set(source_names)
+        name_map = {}
+        for name in target_names:
+            source_name = self.table.get(name)
+            if source_name is None:
+                source_name = source_keys.get(self.key(name, target=True))
+            if source_name in source_set:
+                name_map[name] = source_name
+        return name_map
+
+
+class NameMapCache:
+    """Compiled name maps per (source, target) pair, kept until the rules or a layout stamp change"""
+
+    def __init__(self, size=64):
+        self.size = size
+        # (source key, target key) -> (rules, source stamp, target stamp, name map)
+        self.entries = {}
+
+    def get(self, rules, source_key, source_stamp, target_key, target_stamp, get_names):
+        """Get the name map for the pair
+
+        The stamps (core.get_layout_stamp) change with the names; get_names() returns the
+        source and target name tuples in order, and is only called to compile a new map.
+        """
+        key = (source_key, target_key)
+        entry = self.entries.get(key)
+        if (entry is not None and entry[0] == rules.rules and
+                entry[1] == source_stamp and entry[2] == target_stamp):
+            return entry[3]
+        if len(self.entries) >= self.size:
+            self.entries.clear()
+        name_map = rules.compile(*get_names())
+        self.entries[key] = (rules.rules, source_stamp, target_stamp, name_map)
+        return name_map
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,300 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Constraint presets: armature constraint stacks stored in a compact versioned file
+
+A preset is a JSON document (optionally gzip-compressed) with the constraints grouped
+by type and stored column by column:
+
+    {
+        "format": "batch_bone_constraints.preset",
+        "version": 1,
+        "source": "Rig",
+        "bones": ["root", "spine", ...],
+        "groups": [
+            {
+                "type": "COPY_ROTATION",
+                "fields": ["mute", "influence", "target", "subtarget", ...],
+                "ids": {"target": "Object"},
+                "flags": [],
+                "collections": {},
+                "bone": [1, 4, ...],
+                "order": [0, 7, ...],
+                "columns": [[false, false, ...], [1.0, 0.5, ...], [true, "Other", ...], ...],
+                "items": {}
+            },
+            ...
+        ]
+    }
+
+Each group row is one constraint: "bone" indexes the bone name table and "order" is
+the constraint's position in the export, which restores stack order on apply. ID
+pointer fields hold names, or true for the exported armature itself, which maps to
+the armature the preset is applied to. Collections (the Armature constraint targets)
+store one list of item rows per constraint in "items".
+"""
+
+import gzip
+import json
+
+from .core import EXCLUDE_PROPS, BatchPlan, _is_id_struct, counters
+
+PRESET_FORMAT = "batch_bone_constraints.preset"
+PRESET_VERSION = 1
+
+# Stored in an ID pointer column for a reference to the exported armature itself
+SELF_REFERENCE = True
+
+# Preset field layout cache, filled once per constraint type (or nested struct type)
+_preset_schemas = {}
+
+
+class PresetSchema:
+    """Stored fields of one constraint type (or collection item type), read from RNA"""
+    __slots__ = ('fields', 'ids', 'flags', 'collections')
+
+    def __init__(self, bl_rna):
+        fields = []
+        ids = {}
+        flags = []
+        collections = {}
+        for prop in bl_rna.properties:
+            if prop.identifier in EXCLUDE_PROPS:
+                continue
+            if prop.type == 'COLLECTION':
+                collections[prop.identifier] = get_preset_schema(prop.fixed_type)
+                continue
+            if prop.is_readonly:
+                continue
+            if prop.type == 'POINTER':
+                # Only ID pointers can be stored, by name
+                if not _is_id_struct(prop.fixed_type):
+                    continue
+                ids[prop.identifier] = prop.fixed_type.identifier
+            elif prop.type == 'ENUM' and prop.is_enum_flag:
+                flags.append(prop.identifier)
+            fields.append(prop.identifier)
+        self.fields = tuple(fields)
+        self.ids = ids
+        self.flags = tuple(flags)
+        self.collections = collections
+
+    def header(self):
+        return {
+            "fields": list(self.fields),
+            "ids": self.ids,
+            "flags": list(self.flags),
+            "collections": {name: schema.header() for name, schema in self.collections.items()},
+        }
+
+
+def get_preset_schema(bl_rna):
+    schema = _preset_schemas.get(bl_rna.identifier)
+    if schema is None:
+        schema = _preset_schemas[bl_rna.identifier] = PresetSchema(bl_rna)
+    return schema
+
+
+def _encode_array(value):
+    # Vectors are flat, matrices iterate as rows
+    return [v if isinstance(v, (bool, int, float)) else _encode_array(v) for v in value]
+
+
+def _encode_row(struct, schema, source):
+    row = []
+    for field in schema.fields:
+        value = getattr(struct, field)
+        if field in schema.ids:
+            if value is not None:
+                value = SELF_REFERENCE if value == source else value.name
+        elif field in schema.flags:
+            value = sorted(value)
+        elif not isinstance(value, (bool, int, float, str)):
+            value = _encode_array(value)
+        row.append(value)
+    return row
+
+
+def build_preset(source, constraint_type='ALL'):
+    """Serialize the constraint stacks of the source armature into a preset document"""
+    bone_names = []
+    groups = {}
+    order = 0
+    for bone in source.pose.bones:
+        constraints = [constraint for constraint in bone.constraints
+                       if constraint_type == 'ALL' or constraint.type == constraint_type]
+        if not constraints:
+            continue
+        bone_index = len(bone_names)
+        bone_names.append(bone.name)
+        for constraint in constraints:
+            group = groups.get(constraint.type)
+            if group is None:
+                schema = get_preset_schema(constraint.bl_rna)
+                group = groups[constraint.type] = {
+                    "type": constraint.type,
+                    **schema.header(),
+                    "bone": [],
+                    "order": [],
+                    "columns": [[] for _field in schema.fields],
+                    "items": {name: [] for name in schema.collections},
+                }
+            else:
+                schema = get_preset_schema(constraint.bl_rna)
+            group["bone"].append(bone_index)
+            group["order"].append(order)
+            order += 1
+            for column, value in zip(group["columns"], _encode_row(constraint, schema, source)):
+                column.append(value)
+            for name, item_schema in schema.collections.items():
+                group["items"][name].append([_encode_row(item, item_schema, source)
+                                             for item in getattr(constraint, name)])
+    return {
+        "format": PRESET_FORMAT,
+        "version": PRESET_VERSION,
+        "source": source.name,
+        "bones": bone_names,
+        "groups": list(groups.values()),
+    }
+
+
+def preset_constraint_count(preset):
+    return sum(len(group["order"]) for group in preset["groups"])
+
+
+def write_preset(preset, filepath, compress=None):
+    """Write a preset as compact JSON, gzip-compressed if compress (default: by .gz suffix)"""
+    if compress is None:
+        compress = str(filepath).endswith(".gz")
+    data = json.dumps(preset, separators=(",", ":")).encode("utf-8")
+    if compress:
+        data = gzip.compress(data)
+    with open(filepath, "wb") as file:
+        file.write(data)
+
+
+def read_preset(filepath):
+    """Read a preset written by write_preset, compressed or not"""
+    with open(filepath, "rb") as file:
+        data = file.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    preset = json.loads(data)
+    if not isinstance(preset, dict) or preset.get("format") != PRESET_FORMAT:
+        raise ValueError(f"{filepath} is not a constraint preset")
+    if preset.get("version", 0) > PRESET_VERSION:
+        raise ValueError(f"{filepath} uses preset version {preset['version']}, "
+                         f"newer than the supported version {PRESET_VERSION}")
+    return preset
+
+
+class _IdColumn:
+    """Decodes an ID pointer column, resolving each distinct name once"""
+
+    def __init__(self, id_type, resolve_id, missing):
+        self.id_type = id_type
+        self.resolve_id = resolve_id
+        self.missing = missing
+        self.resolved = {}
+
+    def decode(self, value, target):
+        if value is None:
+            return None
+        if value is SELF_REFERENCE:
+            return target
+        if value not in self.resolved:
+            found = self.resolved[value] = self.resolve_id(self.id_type, value)
+            if found is None:
+                self.missing.add(value)
+        return self.resolved[value]
+
+
+def _compile_setters(header, resolve_id, missing):
+    """Get (field, column position, decode) triples for a group or collection header
+
+    ID pointers and subtargets come first, whatever the order in the file: the values
+    some enums take depend on the target (target_space 'POSE' needs an armature).
+    """
+    setters = []
+    for position, field in enumerate(header["fields"]):
+        if field in header["ids"]:
+            decode = _IdColumn(header["ids"][field], resolve_id, missing).decode
+        elif field in header["flags"]:
+            decode = lambda value, target: set(value)
+        else:
+            decode = None
+        setters.append((field, position, decode))
+    setters.sort(key=lambda setter: not (setter[0] in header["ids"] or setter[0].endswith("subtarget")))
+    return setters
+
+
+def _set_fields(struct, setters, values, target, unset, label):
+    for field, position, decode in setters:
+        value = values[position]
+        if decode is not None:
+            value = decode(value, target)
+        try:
+            setattr(struct, field, value)
+        except (AttributeError, TypeError, ValueError):
+            # E.g. a property changed between versions: report it, keep the others
+            unset.add(f"{label}.{field}")
+
+
+def apply_preset(preset, targets, resolve_id, session=None, replace=False, unset=None):
+    """Add the preset's constraints to same-named bones of every target armature
+
+    resolve_id(id_type, name) returns the ID a stored pointer refers to, or None.
+    Columns are read in place by row index, so no per-constraint structures are built
+    between the file and the new constraints. With replace, the existing stacks of the
+    bones the preset covers are removed first (tagged in session, not counted). Returns
+    the names that didn't resolve; unset (a set), if given, collects the properties that
+    couldn't be set, as "TYPE.property".
+    """
+    missing = set()
+    if unset is None:
+        unset = set()
+    groups = preset["groups"]
+    # Constraint setters per group, and rows per (name, collection) item layout
+    compiled = []
+    for group in groups:
+        columns = group["columns"]
+        setters = _compile_setters(group, resolve_id, missing)
+        collections = [(name, _compile_setters(header, resolve_id, missing), group["items"][name])
+                       for name, header in group["collections"].items()]
+        compiled.append((group["type"], group["bone"], columns, setters, collections))
+
+    # Stack order across all groups: export position -> (group, row)
+    sequence = [None] * preset_constraint_count(preset)
+    for group_index, group in enumerate(groups):
+        for row, order in enumerate(group["order"]):
+            sequence[order] = (group_index, row)
+
+    bone_names = preset["bones"]
+    for target in targets:
+        target_bones = target.pose.bones
+        bones = [target_bones.get(name) for name in bone_names]
+
+        if replace:
+            plan = BatchPlan()
+            for bone in bones:
+                if bone is not None:
+                    plan.add_whole_stack(target, bone)
+            # Tag the armature without counting the removals as applied constraints
+            if plan.apply({target.name: target}.get) and session is not None:
+                session.record(target, 0)
+
+        for group_index, row in sequence:
+            constraint_type, bone_column, columns, setters, collections = compiled[group_index]
+            bone = bones[bone_column[row]]
+            if bone is None:
+                continue
+            constraint = bone.constraints.new(type=constraint_type)
+            counters['created'] += 1
+            values = [column[row] for column in columns]
+            _set_fields(constraint, setters, values, target, unset, constraint_type)
+            for name, item_setters, item_rows in collections:
+                items = getattr(constraint, name)
+                for item_values in item_rows[row]:
+                    _set_fields(items.new(), item_setters, item_values, target, unset, f"{constraint_type}.{name}")
+            if session is not None:
+                session.record(target)
+    return missing
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Bone scopes: which bones of each target armature an operation touches
+
+A scope is one of
+
+    'ALL'          every bone
+    'SELECTED'     the selected bones
+    'COLLECTIONS'  bones assigned to one of the named bone collections
+    'PATTERN'      bones whose name matches one of the wildcard patterns (e.g. DEF-*, *.L)
+
+and is resolved once per armature into the names of the bones in scope, so the
+planners only visit those bones.
+"""
+
+from fnmatch import fnmatchcase
+
+SCOPE_MODES = ('ALL', 'SELECTED', 'COLLECTIONS', 'PATTERN')
+
+
+def split_names(text):
+    """Split a comma-separated list of names or patterns, dropping empty entries"""
+    return tuple(name.strip() for name in text.split(",") if name.strip())
+
+
+class BoneScope:
+    """A scope plus the bone names it resolved to, per armature"""
+
+    def __init__(self, mode='ALL', collections=(), patterns=()):
+        self.mode = mode
+        self.collections = frozenset(collections)
+        self.patterns = tuple(patterns)
+        # Armature name -> names of the bones in scope, in pose order
+        self.resolved = {}
+
+    @property
+    def is_all(self):
+        return self.mode == 'ALL'
+
+    def key(self):
+        return (self.mode, tuple(sorted(self.collections)), self.patterns)
+
+    def names(self, armature):
+        """Get the names of the bones in scope, in pose order (None for every bone)"""
+        if self.is_all:
+            return None
+        names = self.resolved.get(armature.name_full)
+        if names is None:
+            names = self.resolved[armature.name_full] = self._resolve(armature)
+        return names
+
+    def name_set(self, armature):
+        names = self.names(armature)
+        return None if names is None else frozenset(names)
+
+    def bones(self, armature):
+        """Get the pose bones in scope"""
+        names = self.names(armature)
+        if names is None:
+            return armature.pose.bones
+        pose_bones = armature.pose.bones
+        return [pose_bones[name] for name in names]
+
+    def _resolve(self, armature):
+        pose_bones = armature.pose.bones
+        if self.mode == 'SELECTED':
+            return tuple(bone.name for bone in pose_bones if bone.bone.select)
+        if self.mode == 'COLLECTIONS':
+            in_scope = {bone.name for collection in armature.data.collections_all
+                        if collection.name in self.collections for bone in collection.bones}
+        elif self.mode == 'PATTERN':
+            in_scope = {bone.name for bone in pose_bones
+                        if any(fnmatchcase(bone.name, pattern) for pattern in self.patterns)}
+        else:
+            raise ValueError(f"Unknown bone scope '{self.mode}'")
+        return tuple(bone.name for bone in pose_bones if bone.name in in_scope)
+
+
+ALL_BONES = BoneScope()
+
+
+def scoped_name_map(name_map, scope):
+    """Narrow name_map(source, target) to the target bones in scope"""
+    if scope.is_all:
+        return name_map
+
+    def name_map_in_scope(source, target):
+        in_scope = scope.name_set(target)
+        return {target_name: source_name for target_name, source_name in name_map(source, target).items()
+                if target_name in in_scope}
+    return name_map_in_scope
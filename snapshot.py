@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Read-only snapshots of objects for analysis off the live data
+
+build_snapshot() reads bone names, selection, bone collections and constraint stacks
+of some objects in one pass, and fingerprints every constraint once, into plain Python
+objects with the same attribute paths core.py reads (obj.pose.bones, bone.constraints,
+constraint.type, ...). The availability scan, the planners and the audit run on a
+snapshot unchanged, as often as needed and from worker threads; plans hold names, so
+only BatchPlan.apply() touches the live data.
+
+A snapshot doesn't follow later edits: take a new one after changing the objects.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .core import ConstraintSnapshot, counters, get_constraint_fingerprint, get_constraint_schema
+
+
+class SnapshotCollection:
+    """Read-only stand-in for bpy_prop_collection: iterable, indexable by position or name"""
+    __slots__ = ('items', 'by_name')
+
+    def __init__(self, items):
+        self.items = tuple(items)
+        self.by_name = {item.name: item for item in self.items}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.by_name[key]
+        return self.items[key]
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def get(self, name, default=None):
+        return self.by_name.get(name, default)
+
+    def keys(self):
+        return list(self.by_name)
+
+
+class BoneSnapshot:
+    """A pose bone and its bone in one: name, selection and constraint stack"""
+    __slots__ = ('name', 'select', 'constraints')
+
+    def __init__(self, name, select, constraints):
+        self.name = name
+        self.select = select
+        self.constraints = constraints
+
+    @property
+    def bone(self):
+        return self
+
+
+class NameSnapshot:
+    """A bone of a bone collection, or a vertex group: only the name is kept"""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class BoneCollectionSnapshot:
+    __slots__ = ('name', 'bones')
+
+    def __init__(self, name, bones):
+        self.name = name
+        self.bones = bones
+
+
+class PoseSnapshot:
+    __slots__ = ('bones',)
+
+    def __init__(self, bones):
+        self.bones = bones
+
+
+class ArmatureDataSnapshot:
+    __slots__ = ('collections_all',)
+
+    def __init__(self, collections_all):
+        self.collections_all = collections_all
+
+
+class ObjectSnapshot:
+    """An object of a snapshot; pose and data are None for objects other than armatures
+
+    Constraint targets outside the snapshot are kept as ObjectSnapshots without any
+    content, so they compare unequal to every object in it, like the live objects would.
+    """
+    __slots__ = ('name', 'name_full', 'type', 'pose', 'data', 'vertex_groups')
+
+    def __init__(self, obj):
+        self.name = obj.name
+        self.name_full = obj.name_full
+        self.type = obj.type
+        self.pose = None
+        self.data = None
+        self.vertex_groups = SnapshotCollection(())
+
+    def __repr__(self):
+        return f"<ObjectSnapshot {self.name_full!r}>"
+
+
+class RigSnapshot:
+    """Snapshots of some objects, plus the match scale their constraints were fingerprinted at"""
+
+    def __init__(self, scale):
+        self.scale = scale
+        # Live object -> its ObjectSnapshot, including empty ones for outside targets
+        self.objects = {}
+        # Live objects read with add()
+        self.read = set()
+
+    def __contains__(self, obj):
+        return obj in self.read
+
+    def __getitem__(self, obj):
+        """Get the snapshot of a live object read into it"""
+        if obj not in self.read:
+            raise KeyError(f"'{obj.name_full}' is not in the snapshot")
+        return self.objects[obj]
+
+    def get_list(self, objects):
+        return [self[obj] for obj in objects]
+
+    def _object(self, obj):
+        snapshot = self.objects.get(obj)
+        if snapshot is None:
+            snapshot = self.objects[obj] = ObjectSnapshot(obj)
+        return snapshot
+
+    def _target(self, obj):
+        return None if obj is None else self._object(obj)
+
+    def add(self, obj):
+        """Read obj into the snapshot, in one pass over its bones and constraints"""
+        snapshot = self._object(obj)
+        self.read.add(obj)
+        if obj.type == 'MESH':
+            snapshot.vertex_groups = SnapshotCollection(NameSnapshot(vertex_group.name)
+                                                        for vertex_group in obj.vertex_groups)
+        if obj.type != 'ARMATURE':
+            return snapshot
+        scale = self.scale
+        bones = []
+        for bone in obj.pose.bones:
+            counters['bones_visited'] += 1
+            constraints = []
+            for constraint in bone.constraints:
+                targeted = get_constraint_schema(constraint).targeted
+                constraints.append(ConstraintSnapshot(
+                    constraint.name, constraint.type,
+                    self._target(constraint.target) if targeted else None,
+                    constraint.subtarget if targeted else None,
+                    scale, get_constraint_fingerprint(constraint, scale) if scale is not None else None))
+            bones.append(BoneSnapshot(bone.name, bone.bone.select, SnapshotCollection(constraints)))
+        snapshot.pose = PoseSnapshot(SnapshotCollection(bones))
+        snapshot.data = ArmatureDataSnapshot(tuple(
+            BoneCollectionSnapshot(collection.name, tuple(NameSnapshot(bone.name) for bone in collection.bones))
+            for collection in obj.data.collections_all))
+        return snapshot
+
+
+def build_snapshot(objects, scale):
+    """Read objects (armatures, or a mesh source for Imitate) into a new RigSnapshot
+
+    scale is the match scale constraints are fingerprinted at; with None nothing is
+    fingerprinted, which is enough for Imitate, Remove Imitate, New and Delete.
+    """
+    snapshot = RigSnapshot(scale)
+    for obj in objects:
+        snapshot.add(obj)
+    return snapshot
+
+
+def map_chunks(function, items, workers=None):
+    """Call function(chunk) on workers roughly equal chunks of items, return the results in order
+
+    Without workers (or with one), function runs once on all items in this thread.
+    Snapshots are read-only, so any number of threads can share one.
+    """
+    items = list(items)
+    if not workers or workers < 2 or len(items) < 2:
+        return [function(items)]
+    size = -(-len(items) // workers)
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        return list(executor.map(function, chunks))
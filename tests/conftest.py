@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+"""Test setup: the bpy-free modules on the benchmarks' fake_bpy stand-in
+
+Run from the repository root with:
+
+    python -m pytest tests
+
+The package __init__ registers the add-on and needs bpy, so the bpy-free modules are
+imported as submodules of a bare package pointing at the repository instead. The
+helpers below are imported by the test modules (from conftest import ...).
+"""
+
+import pathlib
+import sys
+import types
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+PACKAGE = "batch_bone_constraints"
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+if PACKAGE not in sys.modules:
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT)]
+    sys.modules[PACKAGE] = package
+
+import fake_bpy  # noqa: E402
+from batch_bone_constraints import core  # noqa: E402
+
+BONE_NAMES = ("root", "spine", "hand.L", "hand.R")
+SCALE = 1.0 / core.DEFAULT_MATCH_TOLERANCE
+
+
+def add_constraint(bone, constraint_type, target=None, subtarget="", **values):
+    """Add a constraint to a fake pose bone, with target and property values"""
+    constraint = bone.constraints.new(type=constraint_type)
+    if target is not None:
+        if constraint_type == 'ARMATURE':
+            item = constraint.targets.new()
+            item.target = target
+            item.subtarget = subtarget
+        else:
+            constraint.target = target
+            constraint.subtarget = subtarget
+    for key, value in values.items():
+        setattr(constraint, key, value)
+    return constraint
+
+
+def make_rig(name, bone_names=BONE_NAMES):
+    """Get a fake armature with a small mixed constraint setup, targeting itself"""
+    rig = fake_bpy.Object(name, bone_names=bone_names)
+    bones = rig.pose.bones
+    add_constraint(bones["spine"], 'COPY_ROTATION', rig, "root", influence=0.5)
+    add_constraint(bones["spine"], 'LIMIT_ROTATION', use_limit_x=True, max_x=1.0)
+    add_constraint(bones["hand.L"], 'DAMPED_TRACK', rig, "spine")
+    add_constraint(bones["hand.R"], 'ARMATURE', rig, "spine")
+    return rig
+
+
+def get_resolver(*objects):
+    """Get resolve_object(name) for BatchPlan.apply over some fake objects"""
+    by_name = {obj.name: obj for obj in objects}
+    return by_name.get
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import fake_bpy
+from conftest import BONE_NAMES, add_constraint, make_rig
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """The scripting API on fake_bpy, with the add-on not registered (as in the batch runner)"""
+    monkeypatch.setitem(sys.modules, "bpy", fake_bpy)
+    module = importlib.import_module("batch_bone_constraints.api")
+    monkeypatch.setattr(module, "bpy", fake_bpy)
+    monkeypatch.setattr(fake_bpy, "data", fake_bpy.BlendData())
+    return module
+
+
+def add_objects(*objects):
+    for obj in objects:
+        fake_bpy.data.objects._items.append(obj)
+    return objects
+
+
+def test_copy_without_registration(api):
+    source, target = add_objects(make_rig("Source"), fake_bpy.Object("Target", bone_names=BONE_NAMES))
+    result = api.copy("Source", ["Target"])
+    assert result.counts == {"Target": 4}
+    assert target.update_count == 1
+    assert api.copy(source, [target]).total == 0
+    assert api.get_link_index() == {}
+    with pytest.raises(RuntimeError):
+        api.apply_plan(api.plan('COPY', source, [target]), link=True)
+
+
+def test_delete_and_new_without_registration(api):
+    rig, = add_objects(make_rig("Rig"))
+    assert api.delete(rig, ['LIMIT_ROTATION', 'DAMPED_TRACK']).total == 2
+    assert api.new([rig], 'LIMIT_SCALE').total == len(BONE_NAMES)
+
+
+def test_name_rules_are_explicit(api, monkeypatch):
+    source, target = add_objects(fake_bpy.Object("Source", bone_names=["DEF-spine"]),
+                                 fake_bpy.Object("Target", bone_names=["spine"]))
+    add_constraint(source.pose.bones["DEF-spine"], 'LIMIT_ROTATION', max_x=1.0)
+    rule = SimpleNamespace(kind='STRIP_PREFIX', pattern="DEF-", replacement="", enabled=True)
+    settings = SimpleNamespace(use_name_rules=True, name_rules=[rule])
+    monkeypatch.setattr(fake_bpy.context.scene, "batch_bone_constraints", settings, raising=False)
+    scene_rules = api.get_scene_name_rules(fake_bpy.context.scene)
+    assert scene_rules == (('STRIP_PREFIX', "DEF-", ""),)
+
+    # The scene's rules don't apply unless passed
+    assert api.copy(source, [target]).total == 0
+    assert api.copy(source, [target], name_rules=scene_rules).total == 1
+    assert api.remove_copy(source, [target], name_rules=[('STRIP_PREFIX', "DEF-", "")]).total == 1
+
+
+def test_edit_counts_updates_avoided(api):
+    rig, = add_objects(make_rig("Rig"))
+    result = api.edit(rig, influence=0.5, mute=True)
+    # Four constraints, two foreach writes each, one tag for the armature
+    assert result.counts == {"Rig": 4}
+    assert result.updates_avoided == 4 * 2 - 1
+    assert rig.update_count == 1
+    assert {(constraint.influence, constraint.mute) for bone in rig.pose.bones for constraint in bone.constraints} == {
+        (0.5, True)}
+    assert api.edit(rig, target_space='LOCAL').updates_avoided == 0
+    assert api.delete(rig).updates_avoided == 0
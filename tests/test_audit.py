@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import json
+
+import fake_bpy
+from batch_bone_constraints.audit import audit_armatures
+from conftest import SCALE, make_rig
+
+
+def test_identical_rigs_form_one_cluster():
+    # Each rig targets itself, which the audit treats as the same setup
+    report = audit_armatures([make_rig(f"Rig.{index:03d}") for index in range(3)], SCALE)
+    assert [cluster.armatures for cluster in report.clusters] == [["Rig.000", "Rig.001", "Rig.002"]]
+    assert report.outliers == []
+
+
+def test_outliers_list_differing_bones():
+    rigs = [make_rig(f"Rig.{index:03d}") for index in range(4)]
+    rigs[2].pose.bones["spine"].constraints[0].influence = 0.75
+    rigs[3].pose.bones["root"].constraints.new(type='LIMIT_SCALE')
+    report = audit_armatures(rigs, SCALE)
+    assert report.reference.armatures == ["Rig.000", "Rig.001"]
+    assert [(cluster.armatures, cluster.differing_bones) for cluster in report.outliers] == [
+        (["Rig.002"], ("spine",)), (["Rig.003"], ("root",))]
+    assert report.armature_count == 4
+
+
+def test_tolerance_applies():
+    rigs = [make_rig("A"), make_rig("B")]
+    rigs[1].pose.bones["spine"].constraints[0].influence += 0.1 / SCALE
+    assert len(audit_armatures(rigs, SCALE).clusters) == 1
+    assert len(audit_armatures(rigs, SCALE * 100).clusters) == 2
+
+
+def test_names_equal_to_the_rig_name_stay_distinct():
+    # A subtarget named like the rig is not a reference to the rig itself
+    a = fake_bpy.Object("Rig", bone_names=["Rig", "bone"])
+    b = fake_bpy.Object("Other", bone_names=["Rig", "bone"])
+    for rig, subtarget in ((a, "Rig"), (b, "bone")):
+        rig.pose.bones["bone"].constraints.new(type='DAMPED_TRACK').subtarget = subtarget
+    assert len(audit_armatures([a, b], SCALE).clusters) == 2
+
+
+def test_report_json(tmp_path):
+    rigs = [make_rig("A"), make_rig("B")]
+    rigs[1].pose.bones["root"].constraints.new(type='LIMIT_SCALE')
+    filepath = tmp_path / "audit.json"
+    audit_armatures(rigs, SCALE).write_json(filepath)
+    data = json.loads(filepath.read_text(encoding="utf-8"))
+    assert data["armature_count"] == 2
+    assert [cluster["differing_bones"] for cluster in data["clusters"]] == [[], ["root"]]
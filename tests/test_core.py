@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import fake_bpy
+from batch_bone_constraints import core
+from conftest import SCALE, add_constraint, get_resolver, make_rig
+
+
+def test_fingerprint_within_tolerance_matches():
+    bone = fake_bpy.PoseBone("bone")
+    tolerance = core.DEFAULT_MATCH_TOLERANCE
+    a = add_constraint(bone, 'COPY_ROTATION', influence=0.5)
+    b = add_constraint(bone, 'COPY_ROTATION', influence=0.5 + tolerance / 10)
+    c = add_constraint(bone, 'COPY_ROTATION', influence=0.5 + tolerance * 10)
+    assert core.get_constraint_fingerprint(a, SCALE) == core.get_constraint_fingerprint(b, SCALE)
+    assert core.get_constraint_fingerprint(a, SCALE) != core.get_constraint_fingerprint(c, SCALE)
+
+
+def test_fingerprint_ignores_name_and_compares_targets():
+    rig = fake_bpy.Object("Rig", bone_names=["bone"])
+    other = fake_bpy.Object("Other", bone_names=["bone"])
+    bone = rig.pose.bones["bone"]
+    a = add_constraint(bone, 'DAMPED_TRACK', rig, "bone")
+    b = add_constraint(bone, 'DAMPED_TRACK', rig, "bone")
+    c = add_constraint(bone, 'DAMPED_TRACK', other, "bone")
+    assert a.name != b.name
+    assert core.get_constraint_fingerprint(a, SCALE) == core.get_constraint_fingerprint(b, SCALE)
+    assert core.get_constraint_fingerprint(a, SCALE) != core.get_constraint_fingerprint(c, SCALE)
+
+
+def test_fingerprint_ignores_panel_state_and_evaluated_values():
+    bone = fake_bpy.PoseBone("bone")
+    a = add_constraint(bone, 'LIMIT_ROTATION', max_x=1.0)
+    b = add_constraint(bone, 'LIMIT_ROTATION', max_x=1.0, show_expanded=False, active=True)
+    object.__setattr__(b, "error_rotation", 0.25)
+    assert core.get_constraint_fingerprint(a, SCALE) == core.get_constraint_fingerprint(b, SCALE)
+
+
+def test_copy_keeps_matching_a_collapsed_copy():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=source.pose.bones.keys())
+    core.plan_copy(source, [target], 'ALL', SCALE).apply(get_resolver(source, target))
+    copy = target.pose.bones["spine"].constraints[0]
+    assert copy.show_expanded
+    copy.show_expanded = False
+    copy.active = True
+    assert len(core.plan_copy(source, [target], 'ALL', SCALE)) == 0
+    assert core.plan_remove_copy(source, [target], 'ALL', SCALE).counts() == {"Target": 4}
+
+
+def test_fingerprint_covers_armature_targets():
+    rig = fake_bpy.Object("Rig", bone_names=["a", "b"])
+    a = add_constraint(rig.pose.bones["a"], 'ARMATURE', rig, "a")
+    b = add_constraint(rig.pose.bones["a"], 'ARMATURE', rig, "b")
+    assert core.get_constraint_fingerprint(a, SCALE) != core.get_constraint_fingerprint(b, SCALE)
+
+
+def test_plan_copy_plans_only_missing_constraints():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=["root", "spine"])
+    add_constraint(target.pose.bones["spine"], 'COPY_ROTATION', source, "root", influence=0.5)
+
+    plan = core.plan_copy(source, [target], 'ALL', SCALE)
+    assert [(entry[1], entry[3][0]) for entry in plan.entries] == [("spine", 'LIMIT_ROTATION')]
+
+    assert plan.apply(get_resolver(source, target)) == {"Target": 1}
+    assert [constraint.type for constraint in target.pose.bones["spine"].constraints] == [
+        'COPY_ROTATION', 'LIMIT_ROTATION']
+    assert target.pose.bones["spine"].constraints[1].max_x == 1.0
+    assert len(core.plan_copy(source, [target], 'ALL', SCALE)) == 0
+
+
+def test_plan_copy_counts_identical_constraints():
+    source = fake_bpy.Object("Source", bone_names=["bone"])
+    target = fake_bpy.Object("Target", bone_names=["bone"])
+    for _index in range(2):
+        add_constraint(source.pose.bones["bone"], 'LIMIT_SCALE', max_x=2.0)
+    add_constraint(target.pose.bones["bone"], 'LIMIT_SCALE', max_x=2.0)
+    assert len(core.plan_copy(source, [target], 'ALL', SCALE)) == 1
+
+
+def test_plan_copy_of_one_type():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=source.pose.bones.keys())
+    plan = core.plan_copy(source, [target], 'DAMPED_TRACK', SCALE)
+    assert [(entry[1], entry[3][0]) for entry in plan.entries] == [("hand.L", 'DAMPED_TRACK')]
+
+
+def test_plan_remove_copy_removes_only_identical_constraints():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=["spine"])
+    spine = target.pose.bones["spine"]
+    add_constraint(spine, 'COPY_ROTATION', source, "root", influence=0.5)
+    add_constraint(spine, 'COPY_ROTATION', source, "root", influence=0.25)
+
+    plan = core.plan_remove_copy(source, [target], 'ALL', SCALE)
+    assert plan.counts() == {"Target": 1}
+    plan.apply(get_resolver(source, target))
+    assert [constraint.influence for constraint in spine.constraints] == [0.25]
+
+
+def test_plan_delete_in_scope_of_type():
+    rig = make_rig("Rig")
+    plan = core.plan_delete([rig], 'LIMIT_ROTATION')
+    assert plan.counts() == {"Rig": 1}
+    plan.apply(get_resolver(rig))
+    assert [constraint.type for constraint in rig.pose.bones["spine"].constraints] == ['COPY_ROTATION']
+
+
+def test_batch_plan_of_type():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=source.pose.bones.keys())
+    plan = core.plan_copy(source, [target], 'ALL', SCALE)
+    assert len(plan.of_type('ALL')) == len(plan) == 4
+    assert len(plan.of_type('ARMATURE')) == 1
+
+
+def test_copy_sets_target_before_target_space():
+    source = fake_bpy.Object("Source", bone_names=["bone"])
+    target = fake_bpy.Object("Target", bone_names=["bone"])
+    add_constraint(source.pose.bones["bone"], 'COPY_ROTATION', source, "bone",
+                   target_space='POSE', owner_space='LOCAL')
+
+    core.plan_copy(source, [target], 'ALL', SCALE).apply(get_resolver(source, target))
+    constraint = target.pose.bones["bone"].constraints[0]
+    assert (constraint.target, constraint.target_space, constraint.owner_space) == (source, 'POSE', 'LOCAL')
+    assert len(core.plan_copy(source, [target], 'ALL', SCALE)) == 0
+
+    # Copying only the changed properties keeps the order too
+    copy = target.pose.bones["bone"].constraints.new(type='COPY_ROTATION')
+    core.copy_constraint_properties(source.pose.bones["bone"].constraints[0], copy, ["target_space", "target"])
+    assert (copy.target, copy.target_space) == (source, 'POSE')
+
+
+def test_merged_copy_with_default_names():
+    # Both templates name their constraints "Copy Rotation", "Limit Scale", ...
+    ik = fake_bpy.Object("IK", bone_names=["bone"])
+    limits = fake_bpy.Object("Limits", bone_names=["bone"])
+    add_constraint(ik.pose.bones["bone"], 'COPY_ROTATION', ik, "bone", influence=0.5)
+    add_constraint(ik.pose.bones["bone"], 'LIMIT_SCALE', max_x=2.0)
+    add_constraint(limits.pose.bones["bone"], 'COPY_ROTATION', limits, "bone")
+    add_constraint(limits.pose.bones["bone"], 'LIMIT_SCALE', max_x=2.0)
+    add_constraint(limits.pose.bones["bone"], 'LIMIT_SCALE', max_x=3.0)
+    assert ik.pose.bones["bone"].constraints.keys() == ["Copy Rotation", "Limit Scale"]
+    target = fake_bpy.Object("Target", bone_names=["bone"])
+
+    plan = core.plan_merged_copy([ik, limits], [target], 'ALL', SCALE)
+    # Only the identical Limit Scale of the second template is left out
+    assert [entry[3][1:] for entry in plan.entries] == [
+        ("IK", "bone", "Copy Rotation"), ("IK", "bone", "Limit Scale"),
+        ("Limits", "bone", "Copy Rotation"), ("Limits", "bone", "Limit Scale.001")]
+    by_type = [entry for constraint_type in ('COPY_ROTATION', 'LIMIT_SCALE')
+               for entry in core.plan_merged_copy([ik, limits], [target], constraint_type, SCALE).entries]
+    assert sorted(by_type) == sorted(plan.entries)
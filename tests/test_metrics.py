@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from batch_bone_constraints.core import counters
+from batch_bone_constraints.metrics import Recorder
+
+
+def test_steps_add_to_a_finished_record():
+    recorder = Recorder()
+    with recorder.operation('COPY') as record:
+        with recorder.phase('plan'):
+            counters['bones_visited'] += 3
+    assert recorder.current is None
+
+    for _step in range(2):
+        with recorder.resume(record):
+            with recorder.phase('mutate'):
+                counters['created'] += 2
+    assert recorder.current is None
+    assert (record.counts['bones_visited'], record.counts['created']) == (3, 4)
+    assert set(record.phases) == {'plan', 'mutate'}
+    assert list(recorder.records) == [record]
+
+
+def test_failed_step_leaves_no_record_open():
+    recorder = Recorder()
+    with recorder.operation('DELETE') as record:
+        pass
+    with pytest.raises(RuntimeError):
+        with recorder.resume(record):
+            raise RuntimeError
+    assert recorder.current is None
+    with recorder.operation('NEW') as other:
+        pass
+    assert other is not record
+    assert [item.operation for item in recorder.records] == ['DELETE', 'NEW']
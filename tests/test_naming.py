@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+from batch_bone_constraints.naming import NameMapCache, NameRules, flip_side
+
+
+def test_flip_side():
+    assert flip_side("hand.L") == "hand.R"
+    assert flip_side("hand_left.001") == "hand_right.001"
+    assert flip_side("Left-hand") == "Right-hand"
+    assert flip_side("spine") == "spine"
+
+
+def test_no_rules_pairs_identical_names():
+    assert NameRules().compile(("root", "spine"), ("spine", "tail")) == {"spine": "spine"}
+
+
+def test_strip_prefix_and_suffix():
+    rules = NameRules([('STRIP_PREFIX', "DEF-", ""), ('STRIP_SUFFIX', "_jnt", "")])
+    assert rules.compile(("DEF-spine", "DEF-hand"), ("spine_jnt", "hand", "tail")) == {
+        "spine_jnt": "DEF-spine", "hand": "DEF-hand"}
+
+
+def test_regex_rewrite_and_invalid_pattern():
+    rules = NameRules([('REGEX', r"^mixamorig:(\w+)$", r"\1"), ('REGEX', "(", "")])
+    assert rules.invalid == ["("]
+    assert rules.compile(("Hips",), ("mixamorig:Hips",)) == {"mixamorig:Hips": "Hips"}
+
+
+def test_mirror_applies_at_its_position():
+    before = NameRules([('MIRROR', "", ""), ('REGEX', r"\.L$", "_left")])
+    after = NameRules([('REGEX', r"\.L$", "_left"), ('MIRROR', "", "")])
+    sources = ("hand_left", "hand.R")
+    # hand.R flips to hand.L, which the rewrite then turns into hand_left
+    assert before.compile(sources, ("hand.R",)) == {"hand.R": "hand_left"}
+    # hand.L is rewritten to hand_left first, which flips to hand_right
+    assert after.compile(sources, ("hand.L",)) == {}
+
+
+def test_mirror_only_flips_targets():
+    rules = NameRules([('STRIP_PREFIX', "DEF-", ""), ('MIRROR', "", "")])
+    assert rules.compile(("DEF-hand.R", "DEF-hand.L"), ("DEF-hand.L", "DEF-spine")) == {
+        "DEF-hand.L": "DEF-hand.R"}
+
+
+def test_table_pairs_before_the_other_rules():
+    rules = NameRules([('MIRROR', "", ""), ('TABLE', "hand.L", "hand.L"), ('TABLE', "head", "missing")])
+    assert rules.compile(("hand.L", "hand.R"), ("hand.L", "hand.R", "head")) == {
+        "hand.L": "hand.L", "hand.R": "hand.L"}
+
+
+def test_first_source_wins_on_equal_keys():
+    rules = NameRules([('STRIP_PREFIX', "ORG-", "")])
+    assert rules.compile(("spine", "ORG-spine"), ("spine",)) == {"spine": "spine"}
+
+
+def test_name_map_cache_follows_stamps_and_rules():
+    cache = NameMapCache()
+    compiled = []
+
+    def get_names():
+        compiled.append(True)
+        return ("hand.R",), ("hand.L",)
+
+    mirror = NameRules([('MIRROR', "", "")])
+    assert cache.get(mirror, "Source", 1, "Target", 1, get_names) == {"hand.L": "hand.R"}
+    cache.get(mirror, "Source", 1, "Target", 1, get_names)
+    assert len(compiled) == 1
+    cache.get(mirror, "Source", 1, "Target", 2, get_names)
+    assert len(compiled) == 2
+    cache.get(NameRules([('MIRROR', "", ""), ('STRIP_PREFIX', "X", "")]), "Source", 1, "Target", 2, get_names)
+    assert len(compiled) == 3
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import fake_bpy
+from batch_bone_constraints import core, presets
+from conftest import BONE_NAMES, SCALE, make_rig
+
+
+def get_stacks(rig):
+    """Get the owner-relative fingerprints of every bone stack"""
+    return {bone.name: [core.get_relative_fingerprint(constraint, SCALE, rig) for constraint in bone.constraints]
+            for bone in rig.pose.bones}
+
+
+def test_preset_round_trip(tmp_path):
+    source = make_rig("Source")
+    other = fake_bpy.Object("Other")
+    source.pose.bones["root"].constraints.new(type='CHILD_OF').target = other
+    filepath = tmp_path / "rig.json.gz"
+    presets.write_preset(presets.build_preset(source), filepath)
+    preset = presets.read_preset(filepath)
+    assert presets.preset_constraint_count(preset) == 5
+
+    target = fake_bpy.Object("Target", bone_names=BONE_NAMES)
+    ids = {("Object", "Other"): other}
+    missing = presets.apply_preset(preset, [target], lambda id_type, name: ids.get((id_type, name)))
+    assert not missing
+    # Pointers to the source itself now point to the target
+    assert target.pose.bones["spine"].constraints[0].target is target
+    assert target.pose.bones["hand.R"].constraints[0].targets[0].target is target
+    assert target.pose.bones["root"].constraints[0].target is other
+    assert get_stacks(target) == get_stacks(source)
+
+
+def test_preset_of_one_type_and_missing_ids():
+    source = make_rig("Source")
+    source.pose.bones["root"].constraints.new(type='DAMPED_TRACK').target = fake_bpy.Object("Gone")
+    preset = presets.build_preset(source, 'DAMPED_TRACK')
+    assert [group["type"] for group in preset["groups"]] == ['DAMPED_TRACK']
+
+    target = fake_bpy.Object("Target", bone_names=BONE_NAMES)
+    missing = presets.apply_preset(preset, [target], lambda id_type, name: None)
+    assert missing == {"Gone"}
+    assert [bone.name for bone in target.pose.bones if bone.constraints] == ["root", "hand.L"]
+
+
+def test_preset_replace():
+    source = make_rig("Source")
+    target = make_rig("Target")
+    preset = presets.build_preset(source)
+    presets.apply_preset(preset, [target], lambda id_type, name: None)
+    assert len(target.pose.bones["spine"].constraints) == 4
+    presets.apply_preset(preset, [target], lambda id_type, name: None, replace=True)
+    assert get_stacks(target) == get_stacks(source)
+
+
+def test_preset_sets_target_before_target_space():
+    source = fake_bpy.Object("Source", bone_names=BONE_NAMES)
+    mesh = fake_bpy.Object("Mesh", type='MESH')
+    bones = source.pose.bones
+    bones["spine"].constraints.new(type='COPY_ROTATION').target = source
+    bones["spine"].constraints[0].target_space = 'POSE'
+    bones["root"].constraints.new(type='COPY_ROTATION').target = mesh
+    preset = presets.build_preset(source)
+    # A value the root constraint can't take with its mesh target
+    group = preset["groups"][0]
+    group["columns"][group["fields"].index("target_space")][0] = 'POSE'
+
+    target = fake_bpy.Object("Target", bone_names=BONE_NAMES)
+    unset = set()
+    presets.apply_preset(preset, [target], lambda id_type, name: mesh if name == "Mesh" else None, unset=unset)
+    assert target.pose.bones["spine"].constraints[0].target_space == 'POSE'
+    assert target.pose.bones["root"].constraints[0].target_space == 'WORLD'
+    assert unset == {"COPY_ROTATION.target_space"}
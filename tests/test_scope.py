@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import fake_bpy
+from batch_bone_constraints import core
+from batch_bone_constraints.scope import ALL_BONES, BoneScope, scoped_name_map, split_names
+from conftest import BONE_NAMES, make_rig
+
+
+def test_split_names():
+    assert split_names(" DEF-*, *.L,, ") == ("DEF-*", "*.L")
+
+
+def test_all_bones():
+    rig = fake_bpy.Object("Rig", bone_names=BONE_NAMES)
+    assert ALL_BONES.names(rig) is None
+    assert ALL_BONES.bones(rig) is rig.pose.bones
+
+
+def test_selected_bones():
+    rig = fake_bpy.Object("Rig", bone_names=BONE_NAMES)
+    rig.pose.bones["hand.R"].bone.select = True
+    rig.pose.bones["spine"].bone.select = True
+    scope = BoneScope('SELECTED')
+    assert scope.names(rig) == ("spine", "hand.R")
+    assert [bone.name for bone in scope.bones(rig)] == ["spine", "hand.R"]
+
+
+def test_collection_bones_in_pose_order():
+    rig = fake_bpy.Object("Rig", bone_names=BONE_NAMES)
+    arms = rig.data.collections.new("Arms")
+    arms.assign(rig.pose.bones["hand.R"])
+    arms.assign(rig.pose.bones["hand.L"])
+    rig.data.collections.new("Torso").assign(rig.pose.bones["spine"])
+    assert BoneScope('COLLECTIONS', ["Arms"]).names(rig) == ("hand.L", "hand.R")
+    assert BoneScope('COLLECTIONS', ["Arms", "Torso"]).names(rig) == ("spine", "hand.L", "hand.R")
+    assert BoneScope('COLLECTIONS', ["Legs"]).names(rig) == ()
+
+
+def test_pattern_bones():
+    rig = fake_bpy.Object("Rig", bone_names=BONE_NAMES)
+    assert BoneScope('PATTERN', patterns=["*.L", "ro*"]).names(rig) == ("root", "hand.L")
+
+
+def test_scope_is_resolved_once_per_armature():
+    rig = fake_bpy.Object("Rig", bone_names=BONE_NAMES)
+    scope = BoneScope('SELECTED')
+    assert scope.names(rig) == ()
+    rig.pose.bones["root"].bone.select = True
+    assert scope.names(rig) == ()
+    assert BoneScope('SELECTED').names(rig) == ("root",)
+
+
+def test_scoped_name_map_limits_planning():
+    source = make_rig("Source")
+    target = fake_bpy.Object("Target", bone_names=BONE_NAMES)
+    scope = BoneScope('PATTERN', patterns=["hand.*"])
+    name_map = scoped_name_map(core.identity_name_map, scope)
+    plan = core.plan_copy(source, [target], 'ALL', 1.0 / core.DEFAULT_MATCH_TOLERANCE, name_map)
+    assert sorted(entry[1] for entry in plan.entries) == ["hand.L", "hand.R"]
+    assert core.plan_delete([source], 'ALL', scope).counts() == {"Source": 2}
@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import fake_bpy
+from batch_bone_constraints import core
+from batch_bone_constraints.audit import audit_armatures
+from batch_bone_constraints.scope import BoneScope, scoped_name_map
+from batch_bone_constraints.snapshot import build_snapshot, map_chunks
+from conftest import BONE_NAMES, SCALE, add_constraint, make_rig
+
+
+def make_scene():
+    source = make_rig("Source")
+    targets = []
+    for index in range(3):
+        target = fake_bpy.Object(f"Target.{index:03d}", bone_names=BONE_NAMES)
+        add_constraint(target.pose.bones["spine"], 'COPY_ROTATION', source, "root", influence=0.5)
+        add_constraint(target.pose.bones["hand.L"], 'COPY_ROTATION', source, "hand.L")
+        target.pose.bones["hand.L"].bone.select = True
+        target.data.collections.new("Spine").assign(target.pose.bones["spine"])
+        targets.append(target)
+    return source, targets
+
+
+def plan_all(source, targets, name_map=core.identity_name_map):
+    return [
+        core.plan_copy(source, targets, 'ALL', SCALE, name_map).entries,
+        core.plan_remove_copy(source, targets, 'ALL', SCALE, name_map).entries,
+        core.plan_imitate(source, targets, 'COPY_ROTATION', name_map).entries,
+        core.plan_remove_imitate(source, targets, 'ALL', name_map).entries,
+    ]
+
+
+@pytest.mark.parametrize("scope", [None, BoneScope('SELECTED'), BoneScope('COLLECTIONS', ["Spine"]),
+                                   BoneScope('PATTERN', patterns=["hand.*"])])
+def test_snapshot_plans_equal_live_plans(scope):
+    source, targets = make_scene()
+    snapshot = build_snapshot([source] + targets, SCALE)
+    snapshot_targets = snapshot.get_list(targets)
+    if scope is None:
+        live, snap = plan_all(source, targets), plan_all(snapshot[source], snapshot_targets)
+    else:
+        live = plan_all(source, targets, scoped_name_map(core.identity_name_map, scope))
+        scope = BoneScope(scope.mode, scope.collections, scope.patterns)
+        snap = plan_all(snapshot[source], snapshot_targets, scoped_name_map(core.identity_name_map, scope))
+    assert snap == live
+    assert any(live)
+
+
+def test_snapshot_audit_equals_live_audit():
+    source, targets = make_scene()
+    rigs = [source] + targets
+    snapshot = build_snapshot(rigs, SCALE)
+    live = audit_armatures(rigs, SCALE).as_dict()
+    assert audit_armatures(snapshot.get_list(rigs), SCALE).as_dict() == live
+
+
+def test_snapshot_scale_mismatch():
+    source, _targets = make_scene()
+    snapshot = build_snapshot([source], SCALE)
+    constraint = snapshot[source].pose.bones["spine"].constraints[0]
+    with pytest.raises(ValueError):
+        core.get_constraint_fingerprint(constraint, SCALE * 10)
+
+
+def test_snapshot_only_holds_added_objects():
+    source, targets = make_scene()
+    snapshot = build_snapshot(targets, SCALE)
+    assert source not in snapshot
+    with pytest.raises(KeyError):
+        snapshot[source]
+    # The source is still there as a bare constraint target
+    assert snapshot[targets[0]].pose.bones["spine"].constraints[0].target.name == "Source"
+
+
+def test_map_chunks_keeps_order():
+    items = list(range(10))
+    assert map_chunks(list, items) == [items]
+    chunks = map_chunks(list, items, workers=3)
+    assert len(chunks) == 3
+    assert [item for chunk in chunks for item in chunk] == items